@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+from benchmarks.scripted_llm import Step, done, scripted_llm
+from benchmarks.site_server import VALET_PATH, WCB_CASES
+from tests.test_suite_2.boc_api_2 import TestBankOfCanadaFXAPI
+from tests.test_suite_2.data_privacy import TestLogin
+from tests.test_suite_2.wcb_multiple_data import TestWcbPremium
+
+
+class StandInFlow:
+    """Points a suite test at the stand-in sites; the benchmark sets ``base_url`` once they are up"""
+
+    base_url: str = ''
+
+
+class ScriptedFlow(StandInFlow, ABC):
+    """Stand-in flow whose agent is answered from a script.
+
+    The benchmark sets ``llm_latency`` to simulate the time a real model
+    takes per step.
+    """
+
+    llm_latency: float = 0.0
+
+    # Always drive the agent, so every run exercises the same path
+    execution_mode = 'agent'
+
+    @abstractmethod
+    def script(self) -> List[Step]:
+        """The agent steps that complete the test"""
+        pass
+
+    def _initialize_llm(self):
+        return scripted_llm(self.script(), latency=self.llm_latency)
+
+
+class LoginFlow(ScriptedFlow, TestLogin):
+    def __init__(self):
+        super().__init__()
+        # Logged in by _perform_secure_login before the agent starts, like the live suite
+        self._login_url = f"{self.base_url}/practice-test-login/"
+        self._post_login_url = f"{self.base_url}/logged-in-successfully/"
+
+    def script(self) -> List[Step]:
+        return [
+            [{'assert_text_present': {'text': 'You successfully logged in'}}],
+            done({
+                'success_message': 'Congratulations student. You successfully logged in!',
+                'page_title': 'Logged In Successfully | Practice Test Automation',
+            }),
+        ]
+
+
+class WcbFlow(ScriptedFlow, TestWcbPremium):
+    data_file = str(WCB_CASES)
+
+    def script(self) -> List[Step]:
+        path = [self.params['SearchItem'], self.params['SubItem'], self.params['SubSubItem']]
+        return [
+            [{'go_to_url': {'url': f"{self.base_url}/wcb/"}}],
+            [{'navigate_menu_path': {'path': path}}],
+            [{'assert_text_present': {'text': '2025 Premium Rate'}},
+             {'extract_table': {'selector': '#rates'}}],
+            done({
+                'premium_rate': self.params['ExpectedPremiumRate'],
+                'industry_code': self.params['ExpectedIndustryCode'],
+            }),
+        ]
+
+
+class ValetFlow(StandInFlow, TestBankOfCanadaFXAPI):
+    async def fetch(self) -> Any:
+        params = {"start_date": "2023-01-23", "end_date": "2023-07-19", "order_dir": "asc"}
+        return await self.stream_json(f"{self.base_url}{VALET_PATH}", params=params)
+
+
+FLOWS = {'login': LoginFlow, 'wcb': WcbFlow, 'valet': ValetFlow}
@@ -0,0 +1,67 @@
+"""Startup latency guard for the framework's entry points.
+
+Imports each entry point in a fresh interpreter, takes the best of several
+runs, and fails if it exceeds its budget or pulls in a heavy dependency
+that should only load once an agent-driven test starts.
+
+Usage: python -m benchmarks.import_time [--repeat N] [--budget-ms MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+ENTRY_POINTS = ['run_all', 'core.test_runner', 'core.test_discover', 'core.base_test']
+
+# Packages that must stay out of the import graph until a test actually runs
+FORBIDDEN_MODULES = ['browser_use', 'langchain_google_genai', 'langchain_core', 'playwright']
+
+
+def measure(module: str) -> dict:
+    """Import a module with -X importtime and return total time and loaded packages"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    total_us = 0
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        total_us += int(self_us)
+        loaded.add(name.split('.')[0])
+    return {'ms': total_us / 1000, 'loaded': loaded}
+
+
+def main(argv=None) -> bool:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per entry point (default: 3)")
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_BUDGET_MS', '1000')),
+                        help="Maximum import time per entry point (default: $IMPORT_BUDGET_MS or 1000)")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for module in ENTRY_POINTS:
+        runs = [measure(module) for _ in range(args.repeat)]
+        best = min(run['ms'] for run in runs)
+        heavy = sorted(set(FORBIDDEN_MODULES) & runs[0]['loaded'])
+
+        status = '✅'
+        if best > args.budget_ms or heavy:
+            status = '❌'
+            ok = False
+        print(f"{status} {module}: {best:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        if heavy:
+            print(f"   eagerly imports: {', '.join(heavy)}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
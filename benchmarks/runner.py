@@ -0,0 +1,243 @@
+"""Offline throughput benchmark for TestRunner.
+
+Runs the login, WCB rate-manual and Valet FX flows against local stand-in
+sites, with a scripted LLM in place of Gemini, at each requested worker
+count. Reports tests per minute, per-phase and per-step latency, report
+generation time and peak RSS (including browser processes), so regressions
+in the runner, reporting or browser handling show up as numbers.
+
+Browser flows need Playwright browsers installed; ``--flows valet`` runs
+without one.
+
+Usage: python -m benchmarks.runner [--workers 1 2 4] [--flows login wcb valet]
+                                   [--copies N] [--llm-latency SECONDS] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import psutil
+
+# Stand-in credentials for the login flow; the stand-in site accepts whatever is configured
+os.environ.setdefault('TEST_USERNAME', 'student')
+os.environ.setdefault('TEST_PASSWORD', 'Password123')
+os.environ.setdefault('ANONYMIZED_TELEMETRY', 'false')
+
+from core import session_cache  # noqa: E402
+from core.config import Config  # noqa: E402
+from core.metrics import percentile  # noqa: E402
+from core.test_item import TestItem, expand_tests  # noqa: E402
+
+# Config path helpers redirected into the benchmark's work directory, relative to it
+OUTPUT_PATHS = {
+    'get_report_dir': 'reports',
+    'get_journal_path': 'reports/journal.jsonl',
+    'get_run_index_path': 'reports/history.db',
+    'get_history_dir': 'histories',
+    'get_artifact_dir': 'artifacts',
+    'get_session_dir': 'sessions',
+    'get_screenshot_dir': 'screenshots',
+}
+
+# Per-step timings broken out next to the phases
+STEP_PARTS = ['llm', 'browser_state', 'action_exec', 'overhead']
+
+
+class PeakMemory:
+    """Samples the RSS of this process and its children on a thread and keeps the peak"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / (1024 * 1024), 1)
+
+    def sample(self) -> int:
+        process = psutil.Process(os.getpid())
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+
+    def start(self):
+        self.peak_bytes = self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.sample())
+
+
+@contextmanager
+def isolated_output(workdir: Path) -> Iterator[None]:
+    """Write reports, histories, sessions and screenshots under ``workdir`` instead of the repo"""
+    originals = {name: Config.__dict__[name] for name in OUTPUT_PATHS}
+    for name, relative in OUTPUT_PATHS.items():
+        setattr(Config, name, staticmethod(lambda path=workdir / relative: path))
+    # Every worker count starts from a cold session cache in its own directory
+    session_cache._session_cache = None
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(Config, name, original)
+        session_cache._session_cache = None
+
+
+def benchmark_items(flows: Sequence[str], copies: int) -> List[TestItem]:
+    """One item per flow (or data row), repeated ``copies`` times under distinct names"""
+    from benchmarks.flows import FLOWS
+
+    items = []
+    for item in expand_tests(FLOWS[name] for name in flows):
+        items.append(item)
+        for copy in range(2, copies + 1):
+            param_id = f"{item.param_id}-{copy}" if item.param_id else f"copy{copy}"
+            items.append(TestItem(item.test_class, dict(item.params or {}), param_id))
+    return items
+
+
+def latency_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 1),
+        'p95_ms': round(percentile(values, 95) * 1000, 1),
+        'mean_ms': round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+    }
+
+
+def summarize(details: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Latency of every phase across tests, and of each part of an agent step across steps"""
+    phases: Dict[str, List[float]] = {}
+    steps: Dict[str, List[float]] = {part: [] for part in STEP_PARTS}
+    for detail in details:
+        metrics = detail.get('metrics') or {}
+        for name, seconds in metrics.get('phases', {}).items():
+            phases.setdefault(name, []).append(seconds)
+        for step in metrics.get('steps', []):
+            for part in STEP_PARTS:
+                steps[part].append(step.get(part, 0.0))
+    return {
+        'phases': {name: latency_stats(values) for name, values in phases.items()},
+        'step_count': len(steps['llm']),
+        'steps': {part: latency_stats(values) for part, values in steps.items() if values},
+    }
+
+
+async def run_once(items: List[TestItem], workers: int) -> Dict[str, Any]:
+    """Run ``items`` on a fresh TestRunner pinned to ``workers`` browser slots"""
+    from core.test_runner import TestRunner, publish_report
+
+    runner = TestRunner(max_workers=workers, min_workers=workers)
+    memory = PeakMemory()
+    memory.start()
+    try:
+        started = time.perf_counter()
+        await runner.run_tests_parallel(items, final_report=False)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        publish_report(runner.report, runner.durations)
+        report_seconds = time.perf_counter() - started
+    finally:
+        memory.stop()
+
+    details = list(runner.report.iter_details())
+    summary = runner.report.results['summary']
+    return {
+        'workers': workers,
+        'tests': len(details),
+        'passed': summary['passed'],
+        'failed': summary['failed'],
+        'seconds': round(elapsed, 3),
+        'tests_per_min': round(len(details) / elapsed * 60, 1) if elapsed else 0.0,
+        'report_seconds': round(report_seconds, 3),
+        'peak_rss_mb': memory.peak_mb,
+        **summarize(details),
+        'errors': sorted({detail['error'] for detail in details if detail.get('error')})[:5],
+    }
+
+
+async def run_benchmark(worker_counts: Sequence[int], flows: Sequence[str], copies: int,
+                        llm_latency: float, observations: int) -> List[Dict[str, Any]]:
+    from benchmarks.flows import ScriptedFlow, StandInFlow
+    from benchmarks.site_server import StandInSites
+
+    sites = StandInSites(observations=observations)
+    StandInFlow.base_url = await sites.start()
+    ScriptedFlow.llm_latency = llm_latency
+    print(f"🛰️ Stand-in sites on {StandInFlow.base_url}")
+    results = []
+    try:
+        for workers in worker_counts:
+            items = benchmark_items(flows, copies)
+            print(f"\n📦 {len(items)} tests with {workers} workers")
+            with tempfile.TemporaryDirectory(prefix='runner_bench_') as workdir, isolated_output(Path(workdir)):
+                results.append(await run_once(items, workers))
+    finally:
+        await sites.stop()
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print("\n📊 Runner benchmark")
+    print(f"{'workers':>8} {'tests':>6} {'failed':>6} {'seconds':>8} {'tests/min':>10} {'report s':>9} {'peak RSS MB':>12}")
+    for result in results:
+        print(f"{result['workers']:>8} {result['tests']:>6} {result['failed']:>6} {result['seconds']:>8.2f} "
+              f"{result['tests_per_min']:>10.1f} {result['report_seconds']:>9.2f} {result['peak_rss_mb']:>12.1f}")
+
+    for result in results:
+        print(f"\n⏱️ {result['workers']} workers: latency p50 / p95 ms")
+        rows = [(name, stats) for name, stats in result['phases'].items()]
+        rows += [(f"step.{part}", stats) for part, stats in result['steps'].items()]
+        for name, stats in rows:
+            print(f"   {name:<20} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}")
+        for error in result['errors']:
+            print(f"   ❌ {error[:200]}")
+
+
+def main(argv=None) -> bool:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="Browser worker counts to measure (default: 1 2 4)")
+    parser.add_argument('--flows', nargs='+', choices=['login', 'wcb', 'valet'], default=['login', 'wcb', 'valet'],
+                        help="Flows to run (default: all)")
+    parser.add_argument('--copies', type=int, default=2, help="Times each flow or data row runs per worker count")
+    parser.add_argument('--llm-latency', type=float, default=0.5,
+                        help="Seconds the scripted LLM takes per call (default: 0.5)")
+    parser.add_argument('--observations', type=int, default=2000, help="Observations in the Valet response")
+    parser.add_argument('--output', type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_benchmark(args.workers, args.flows, args.copies, args.llm_latency, args.observations))
+    print_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"\n📄 Results written to {args.output}")
+    return all(result['failed'] == 0 for result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
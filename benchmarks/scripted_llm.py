@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from core.llm_registry import RateLimitedLLM, estimate_tokens
+
+# One agent step: the actions the model "decides" on, e.g. [{'go_to_url': {'url': ...}}]
+Step = List[Dict[str, Any]]
+
+
+class ScriptedLLM(BaseChatModel):
+    """Chat model stand-in that answers each agent step from a fixed action sequence.
+
+    Every structured-output call returns the next step of ``steps`` after
+    ``latency`` seconds; once the script runs out the last step repeats, so
+    scripts should end with ``done``. Plain completions (page extraction)
+    return ``completion``. Responses carry token usage estimated from the
+    prompt, so rate limiting and token budgets see realistic numbers.
+    """
+
+    steps: List[Step]
+    latency: float = 0.0
+    completion: str = ''
+    model_name: str = 'scripted'
+    position: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return 'scripted'
+
+    def with_structured_output(self, schema: Type, *, include_raw: bool = False, **options):
+        return ScriptedStructuredOutput(self, schema, include_raw)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self.message(messages, self.completion))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self.message(messages, self.completion))])
+
+    def next_step(self) -> Step:
+        step = self.steps[min(self.position, len(self.steps) - 1)]
+        self.position += 1
+        return step
+
+    @staticmethod
+    def message(messages, content: str) -> AIMessage:
+        input_tokens = estimate_tokens(messages)
+        output_tokens = max(1, len(content) // 4)
+        return AIMessage(content=content, usage_metadata={
+            'input_tokens': input_tokens, 'output_tokens': output_tokens,
+            'total_tokens': input_tokens + output_tokens,
+        })
+
+
+class ScriptedStructuredOutput:
+    """Structured-output runnable bound to a ScriptedLLM"""
+
+    def __init__(self, llm: ScriptedLLM, schema: Type, include_raw: bool):
+        self.llm = llm
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def invoke(self, messages, **kwargs):
+        time.sleep(self.llm.latency)
+        return self._respond(messages)
+
+    async def ainvoke(self, messages, **kwargs):
+        await asyncio.sleep(self.llm.latency)
+        return self._respond(messages)
+
+    def _respond(self, messages) -> Any:
+        number = self.llm.position + 1
+        output = {
+            'current_state': {
+                'page_summary': '',
+                'evaluation_previous_goal': 'Success' if number > 1 else 'Unknown',
+                'memory': f"Scripted step {number} of {len(self.llm.steps)}",
+                'next_goal': f"Run scripted step {number}",
+            },
+            'action': self.llm.next_step(),
+        }
+        parsed = self.schema.model_validate(output)
+        if not self.include_raw:
+            return parsed
+        raw = self.llm.message(messages, json.dumps(output))
+        return {'raw': raw, 'parsed': parsed, 'parsing_error': None}
+
+
+def done(result: Dict[str, Any]) -> Step:
+    """Final step returning ``result`` as the test's output model"""
+    return [{'done': result}]
+
+
+def scripted_llm(steps: Sequence[Step], latency: float = 0.0, completion: Optional[str] = None) -> RateLimitedLLM:
+    """A ScriptedLLM behind the same rate-limiting proxy as the live model, with no quota"""
+    llm = ScriptedLLM(steps=list(steps), latency=latency, completion=completion or '')
+    return RateLimitedLLM(llm, requests_per_minute=0, tokens_per_minute=0, max_retries=0)
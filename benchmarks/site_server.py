@@ -0,0 +1,197 @@
+"""Local stand-ins for the sites the test suites run against.
+
+Serves a copy of the practice login page, a WCB rate-manual tree built from
+the premium test-case CSV and a Bank of Canada Valet observations endpoint,
+so benchmarks measure the framework rather than the network.
+
+Usage: python -m benchmarks.site_server [--port PORT] [--observations N]
+"""
+import argparse
+import asyncio
+import html
+import json
+import math
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from string import Template
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from utilities.data_loader import iter_csv_rows, param_id
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+ROOT = Path(__file__).parent.parent
+SITES_DIR = Path(__file__).parent / 'sites'
+WCB_CASES = ROOT / 'test_cases' / 'wcb_premium_test_cases.csv'
+
+VALET_PATH = '/valet/observations/group/FX_RATES_DAILY/json'
+# Series in the stand-in FX group and the CAD rate they oscillate around
+FX_SERIES = {'FXUSDCAD': 1.35, 'FXEURCAD': 1.46, 'FXCNYCAD': 0.194, 'FXJPYCAD': 0.0098, 'FXGBPCAD': 1.67}
+
+
+def slug(value: str) -> str:
+    return param_id(value).lower()
+
+
+class StandInSites:
+    """aiohttp server for the stand-in sites; ``start`` returns its base URL"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, observations: int = 2000,
+                 credentials: Optional[Tuple[str, str]] = None):
+        self.host = host
+        self.port = port
+        self.credentials = credentials or (os.getenv('TEST_USERNAME', 'student'),
+                                           os.getenv('TEST_PASSWORD', 'Password123'))
+        self.base_url = ''
+        self._valet = json.dumps(valet_document(observations)).encode('utf-8')
+        self._wcb = wcb_tree()
+        self._page = Template((SITES_DIR / 'wcb' / 'page.html').read_text(encoding='utf-8'))
+        self._runner: Optional['web.AppRunner'] = None
+
+    async def start(self) -> str:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get('/practice-test-login/', self._static('practice-test-login'))
+        app.router.add_post('/practice-test-login/', self._login)
+        app.router.add_get('/logged-in-successfully/', self._static('logged-in-successfully'))
+        app.router.add_get('/wcb/', self._wcb_page)
+        app.router.add_get('/wcb/{path:.+}', self._wcb_page)
+        app.router.add_get(VALET_PATH, self._valet_observations)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.base_url = f"http://{self.host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _static(self, page: str):
+        from aiohttp import web
+
+        path = SITES_DIR / page / 'index.html'
+
+        async def handler(request):
+            return web.FileResponse(path)
+        return handler
+
+    async def _login(self, request):
+        from aiohttp import web
+
+        form = await request.post()
+        if (form.get('username'), form.get('password')) == self.credentials:
+            raise web.HTTPFound('/logged-in-successfully/')
+        page = (SITES_DIR / 'practice-test-login' / 'index.html').read_text(encoding='utf-8')
+        return web.Response(text=page.replace(' hidden>', '>'), content_type='text/html')
+
+    async def _wcb_page(self, request):
+        from aiohttp import web
+
+        trail = [part for part in request.match_info.get('path', '').split('/') if part]
+        node = self._wcb
+        crumbs = [('Rate Manual', '/wcb/')]
+        for part in trail:
+            if part not in node['children']:
+                raise web.HTTPNotFound()
+            node = node['children'][part]
+            crumbs.append((node['label'], f"{crumbs[-1][1]}{part}/"))
+
+        if node['children']:
+            links = ''.join(f'<li><a href="{crumbs[-1][1]}{key}/">{html.escape(child["label"])}</a></li>'
+                            for key, child in node['children'].items())
+            content = f'<ul class="tree">{links}</ul>'
+        else:
+            content = rate_table(node['label'], node['code'], node['rate'])
+        page = self._page.substitute(
+            title=html.escape(crumbs[-1][0]),
+            breadcrumb=' &gt; '.join(f'<a href="{href}">{html.escape(label)}</a>' for label, href in crumbs[:-1]),
+            content=content,
+        )
+        return web.Response(text=page, content_type='text/html')
+
+    async def _valet_observations(self, request):
+        from aiohttp import web
+
+        return web.Response(body=self._valet, content_type='application/json')
+
+
+def wcb_tree() -> Dict:
+    """Industry > sub-industry > rate group tree from the WCB premium test cases"""
+    root: Dict = {'label': 'Rate Manual', 'children': {}}
+    for _, row in iter_csv_rows(str(WCB_CASES)):
+        node = root
+        for label in (row['SearchItem'], row['SubItem'], row['SubSubItem']):
+            node = node['children'].setdefault(slug(label), {'label': label, 'children': {}})
+        node.update(code=row['ExpectedIndustryCode'], rate=row['ExpectedPremiumRate'])
+    return root
+
+
+def rate_table(label: str, code: str, rate: str) -> str:
+    return (
+        f'<p>Industry {html.escape(code)}: {html.escape(label)}</p>'
+        '<table id="rates"><thead><tr><th>Industry Code</th><th>Rate Year</th><th>Premium Rate</th></tr></thead>'
+        f'<tbody><tr><td>{html.escape(code)}</td><td>2025 Premium Rate</td><td>{html.escape(rate)}</td></tr>'
+        f'<tr><td>{html.escape(code)}</td><td>2024 Premium Rate</td><td>{html.escape(rate)}</td></tr></tbody></table>'
+    )
+
+
+def valet_document(observations: int) -> Dict:
+    """Response shaped like the Valet FX_RATES_DAILY group, one observation per weekday"""
+    rows: List[Dict] = []
+    day = date(2023, 1, 23)
+    while len(rows) < observations:
+        if day.weekday() < 5:
+            n = len(rows)
+            row = {'d': day.isoformat()}
+            for series, rate in FX_SERIES.items():
+                row[series] = {'v': f"{rate * (1 + 0.02 * math.sin(n / 7)):.4f}"}
+            rows.append(row)
+        day += timedelta(days=1)
+    return {
+        'terms': {'url': 'https://www.bankofcanada.ca/terms/'},
+        'groupDetail': {'label': 'Daily exchange rates', 'description': 'Daily average exchange rates'},
+        'seriesDetail': {
+            series: {
+                'label': f"{series[2:5]}/CAD",
+                'description': f"{series[2:5]} to Canadian dollar daily exchange rate",
+                'dimension': {'key': 'd', 'name': 'date'},
+            }
+            for series in FX_SERIES
+        },
+        'observations': rows,
+    }
+
+
+async def serve(port: int, observations: int):
+    sites = StandInSites(port=port, observations=observations)
+    base_url = await sites.start()
+    print(f"🛰️ Stand-in sites on {base_url}")
+    print(f"   {base_url}/practice-test-login/")
+    print(f"   {base_url}/wcb/")
+    print(f"   {base_url}{VALET_PATH}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sites.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--observations', type=int, default=2000, help="Observations in the Valet response")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.port, args.observations))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel, Field
+
+# Playwright selectors are told apart from visible labels by their first character
+SELECTOR_PREFIXES = ('#', '.', '[', '/', 'css=', 'xpath=', 'text=')
+
+
+class ControllerAction:
+    """A deterministic, Playwright-backed action the agent can call in a single step.
+
+    ``function(params, page)`` does the work and returns the text the agent
+    sees. ``steps_saved(params)`` estimates how many agent steps the same
+    work would have taken with built-in actions, and is added to the
+    test's metrics each time the action succeeds.
+    """
+
+    def __init__(self, name: str, description: str, param_model: Type[BaseModel],
+                 function: Callable[[Any, Any], Awaitable[str]], steps_saved: Callable[[Any], int]):
+        self.name = name
+        self.description = description
+        self.param_model = param_model
+        self.function = function
+        self.steps_saved = steps_saved
+
+    def register(self, controller, metrics=None):
+        """Register on a browser_use Controller, counting saved steps in ``metrics``"""
+        from browser_use.agent.views import ActionResult
+
+        async def run(params, browser):
+            page = await browser.get_current_page()
+            content = await self.function(params, page)
+            if metrics is not None:
+                metrics.note_custom_action(self.name, self.steps_saved(params))
+            return ActionResult(extracted_content=content, include_in_memory=True)
+
+        run.__name__ = self.name
+        # The registry passes a validated model when the first parameter is annotated with one
+        run.__annotations__ = {'params': self.param_model}
+        controller.registry.action(self.description, param_model=self.param_model)(run)
+
+
+def controller_action(description: str, param_model: Type[BaseModel], steps_saved: Callable[[Any], int] = lambda _: 1):
+    """Declare a ControllerAction from ``async def name(params, page) -> str``"""
+    def decorator(function: Callable[[Any, Any], Awaitable[str]]) -> ControllerAction:
+        return ControllerAction(function.__name__, description, param_model, function, steps_saved)
+    return decorator
+
+
+def _locator(page, target: str, role: Optional[str] = None):
+    """Locate by selector, by form label or placeholder, or by visible text"""
+    if target.startswith(SELECTOR_PREFIXES):
+        return page.locator(target).first
+    if role is not None:
+        return page.get_by_role(role, name=target).or_(page.get_by_text(target, exact=True)).first
+    return page.get_by_label(target).or_(page.get_by_placeholder(target)).first
+
+
+class FillFormParams(BaseModel):
+    fields: Dict[str, str] = Field(description="Field label, placeholder or CSS selector -> value to type")
+    submit: Optional[str] = Field(None, description="Text or CSS selector of the button to click afterwards")
+
+
+@controller_action(
+    "Fill several form fields at once from a mapping of field label (or CSS selector) to value, "
+    "optionally clicking a submit button afterwards",
+    FillFormParams,
+    steps_saved=lambda params: len(params.fields) + bool(params.submit) - 1,
+)
+async def fill_form(params: FillFormParams, page) -> str:
+    for field, value in params.fields.items():
+        await _locator(page, field).fill(value)
+    if params.submit:
+        await _locator(page, params.submit, role='button').click()
+        await page.wait_for_load_state()
+    submitted = f" and clicked {params.submit!r}" if params.submit else ""
+    return f"Filled {len(params.fields)} fields: {', '.join(params.fields)}{submitted}"
+
+
+class ExtractTableParams(BaseModel):
+    selector: str = Field('table', description="CSS selector of the table")
+    index: int = Field(0, description="Which matching table to read, from 0")
+    max_rows: int = Field(200, description="Maximum number of body rows to return")
+
+
+TABLE_SCRIPT = """(table, maxRows) => {
+    const text = cell => cell.innerText.trim();
+    const rows = Array.from(table.rows);
+    const headerRow = table.tHead ? table.tHead.rows[0] : rows[0];
+    const headers = headerRow ? Array.from(headerRow.cells).map(text) : [];
+    const body = rows.filter(row => row !== headerRow).slice(0, maxRows);
+    return {headers, rows: body.map(row => Array.from(row.cells).map(text)), total: rows.length - (headerRow ? 1 : 0)};
+}"""
+
+
+@controller_action(
+    "Read an HTML table on the current page and return its rows as JSON objects keyed by column header",
+    ExtractTableParams,
+    steps_saved=lambda params: 2,
+)
+async def extract_table(params: ExtractTableParams, page) -> str:
+    table = page.locator(params.selector).nth(params.index)
+    data = await table.evaluate(TABLE_SCRIPT, params.max_rows)
+    headers = data['headers']
+    rows = [dict(zip(headers, cells)) if len(cells) == len(headers) else cells for cells in data['rows']]
+    return json.dumps({'rows': rows, 'total_rows': data['total']})
+
+
+class NavigateMenuParams(BaseModel):
+    path: List[str] = Field(
+        description="Visible link or button texts to click in order, e.g. ['Agriculture', 'Crop Production']"
+    )
+
+
+@controller_action(
+    "Click through a sequence of menu items, links or tree nodes by their visible text in one go",
+    NavigateMenuParams,
+    steps_saved=lambda params: len(params.path) - 1,
+)
+async def navigate_menu_path(params: NavigateMenuParams, page) -> str:
+    for position, label in enumerate(params.path, start=1):
+        try:
+            await _locator(page, label, role='link').click()
+        except Exception as e:
+            raise RuntimeError(f"Menu item {position} of {len(params.path)} ({label!r}) not clickable: {e}") from e
+        await page.wait_for_load_state()
+    return f"Navigated {' > '.join(params.path)}; now on {page.url}"
+
+
+class AssertTextParams(BaseModel):
+    text: str = Field(description="Text that must be visible")
+    selector: Optional[str] = Field(None, description="CSS selector of the element to search in; whole page if omitted")
+
+
+@controller_action(
+    "Check that a text is visible on the current page (optionally inside an element) "
+    "and report its surrounding content",
+    AssertTextParams,
+    steps_saved=lambda params: 1,
+)
+async def assert_text_present(params: AssertTextParams, page) -> str:
+    scope = page.locator(params.selector).first if params.selector else page
+    match = scope.get_by_text(params.text).first
+    await match.wait_for(state='visible')
+    context = await match.evaluate("node => (node.closest('tr, li, p, div') || node).innerText")
+    return f"Found {params.text!r}: {context.strip()[:500]}"
+
+
+# Registered on every agent's controller unless a test overrides BaseTest.actions
+SHARED_ACTIONS: Sequence[ControllerAction] = (fill_form, extract_table, navigate_menu_path, assert_text_present)
+SHARED_ACTIONS_BY_NAME: Dict[str, ControllerAction] = {action.name: action for action in SHARED_ACTIONS}
+
+
+async def run_shared_action(page, name: str, params: Dict[str, Any]) -> str:
+    """Run a shared action outside the agent, as compiled fast-path scripts do"""
+    action = SHARED_ACTIONS_BY_NAME[name]
+    return await action.function(action.param_model.model_validate(params), page)
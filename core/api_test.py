@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+from core.config import Config
+from core.json_stream import iter_json_members
+from core.metrics import TestMetrics
+from core.test_item import ParametrizedTest
+
+if TYPE_CHECKING:
+    import aiohttp
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def create_http_session() -> 'aiohttp.ClientSession':
+    """Keep-alive HTTP session with a bounded connection pool, shared by API tests"""
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=Config.HTTP_MAX_CONNECTIONS,
+        limit_per_host=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=Config.HTTP_TIMEOUT))
+
+
+class ApiTest(ParametrizedTest, ABC):
+    """Test that calls HTTP APIs directly.
+
+    Setup creates no browser, controller or LLM client and needs no login
+    credentials. TestRunner hands every API test the same pooled
+    ``aiohttp`` session and runs them under their own concurrency limit,
+    separate from browser slots.
+
+    Large top-level arrays can be listed in ``stream_items``; ``stream_json``
+    then validates each element against its model and passes it to
+    ``validate_item`` as the body downloads, instead of holding the array.
+    """
+
+    # Top-level array members streamed item by item: {member name: item model}
+    stream_items: Dict[str, Type[BaseModel]] = {}
+
+    # Hard limit on the whole test, enforced by TestRunner
+    timeout: int = Config.TEST_TIMEOUT
+
+    def __init__(self):
+        # Assigned by TestRunner; tests run standalone open their own session
+        self.http: Optional['aiohttp.ClientSession'] = None
+
+        # Phase timings, read by TestRunner for the report
+        self.metrics = TestMetrics()
+
+        # The data row this instance runs, bound by TestItem for parametrized tests
+        self.params: Dict[str, str] = {}
+        self.param_id: Optional[str] = None
+
+        # Elements seen per streamed array member
+        self.item_counts: Dict[str, int] = {}
+
+    @abstractmethod
+    async def fetch(self) -> Any:
+        """Call the API with ``self.http`` and return the decoded response"""
+        pass
+
+    @abstractmethod
+    def get_output_model(self) -> Type[BaseModel]:
+        """Return the output model CLASS (not instance)"""
+        pass
+
+    @abstractmethod
+    def validate_results(self, result: BaseModel):
+        """Validate the response against the output model"""
+        pass
+
+    def validate_item(self, key: str, item: BaseModel):
+        """Per-element assertions for streamed arrays, run as each element arrives"""
+        pass
+
+    async def stream_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """GET a JSON object, validating ``stream_items`` arrays element by element.
+
+        Returns the remaining members; streamed arrays are returned empty and
+        their sizes are recorded in ``item_counts``.
+        """
+        document: Dict[str, Any] = {}
+        self.item_counts = {key: 0 for key in self.stream_items}
+        async with self.http.get(url, params=params) as response:
+            response.raise_for_status()
+            members = iter_json_members(response.content.iter_chunked(STREAM_CHUNK_SIZE), self.stream_items)
+            async for key, value in members:
+                item_model = self.stream_items.get(key)
+                if item_model is None:
+                    document[key] = value
+                    continue
+                try:
+                    self.validate_item(key, item_model.model_validate(value))
+                except (ValueError, AssertionError) as e:
+                    raise AssertionError(f"{key}[{self.item_counts[key]}]: {e}") from e
+                self.item_counts[key] += 1
+        for key in self.stream_items:
+            document.setdefault(key, [])
+        return document
+
+    async def get_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Any:
+        """GET a URL and decode its JSON body, failing on HTTP errors"""
+        async with self.http.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def run(self):
+        """Fetch, validate and return the parsed response"""
+        owns_session = self.http is None
+        if owns_session:
+            self.http = create_http_session()
+        try:
+            with self.metrics.phase('request'):
+                data = await self.fetch()
+            with self.metrics.phase('validation'):
+                validated = self.get_output_model().model_validate(data)
+                self.validate_results(validated)
+            return validated
+        finally:
+            if owns_session:
+                await self.http.close()
+                self.http = None
+
+    async def cleanup(self):
+        """Nothing to release; the shared session belongs to the runner"""
+        pass
@@ -3,20 +3,51 @@ import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Type, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Type
 from dotenv import load_dotenv
 
-from browser_use.agent.service import Agent
-from browser_use.controller.service import Controller
-from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel
 from core.config import Config
+from core.actions import SHARED_ACTIONS, ControllerAction
+from core.browser_pool import BrowserLease, BrowserPool
+from core.fast_path import FastPathCompileError, load_fast_path, save_fast_path
+from core.history_store import HistoryWriter
+from core.llm_proxy import attach_page_extraction_llm, unwrap
+from core.metrics import TestMetrics
+from core.resource_policy import ResourcePolicy
+from core.screenshots import get_screenshot_pipeline
+from core.session_cache import clear_storage_state, get_session_cache, restore_storage_state
+from core.test_item import ParametrizedTest
+from core.budgets import check_steps, limit_tokens
+from core.timeouts import limit_steps
+from utilities.data_loader import param_id as make_param_id
+
+# browser_use and langchain take seconds to import; they are loaded when an agent-driven test starts
+if TYPE_CHECKING:
+    from browser_use.agent.service import Agent
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-class BaseTest(ABC):
+class BaseTest(ParametrizedTest, ABC):
+    # 'agent' always drives the LLM; 'fast_path' replays the compiled script first
+    execution_mode: str = Config.EXECUTION_MODE
+
+    # Requests blocked in this test's browser context; None uses the suite-wide policy from Config
+    resource_policy: Optional[ResourcePolicy] = None
+
+    # Hard limit on the whole test, enforced by TestRunner
+    timeout: int = Config.TEST_TIMEOUT
+
+    # Deterministic actions registered on the agent's controller; extend with test-specific ones
+    actions: Sequence[ControllerAction] = SHARED_ACTIONS
+
+    # Agent budgets; a test that runs out fails early, naming the budget it exceeded
+    max_actions_per_step: int = Config.MAX_ACTIONS_PER_STEP
+    max_steps: int = Config.MAX_STEPS
+    max_tokens: int = Config.MAX_TOKENS
+
     def __init__(self):
         self.screenshot_dir = Config.get_screenshot_dir()
         self.screenshot_dir.mkdir(exist_ok=True)
@@ -43,17 +74,43 @@ class BaseTest(ABC):
         self._login_url = ''
         self._post_login_url = ''
 
-        output_model_class = self.get_output_model()
-        self.controller = Controller(output_model=output_model_class)
-        self.llm = self._initialize_llm()
+        # Assigned by TestRunner; tests run standalone launch their own browser
+        self.browser_pool: Optional[BrowserPool] = None
+
+        # Phase and per-step timings, read by TestRunner for the report
+        self.metrics = TestMetrics()
+
+        # The data row this instance runs, bound by TestItem for parametrized tests
+        self.params: Dict[str, str] = {}
+        self.param_id: Optional[str] = None
+
+        # Paths of the screenshot taken when the test failed, written in the background
+        self.failure_screenshot: Optional[Dict[str, Optional[str]]] = None
+
+        self._controller = None
+        self._llm = None
+
+    @property
+    def controller(self):
+        """Agent controller, created the first time an agent needs it"""
+        if self._controller is None:
+            from browser_use.controller.service import Controller
+            self._controller = Controller(output_model=self.get_output_model())
+            for action in self.actions:
+                action.register(self._controller, self.metrics)
+        return self._controller
+
+    @property
+    def llm(self):
+        """Agent LLM, created the first time an agent needs it"""
+        if self._llm is None:
+            self._llm = self._initialize_llm()
+        return self._llm
 
     def _initialize_llm(self):
-        """Initialize the Gemini LLM"""
-        os.environ["GEMINI_API_KEY"] = Config.get_gemini_api_key()
-        return ChatGoogleGenerativeAI(
-            model=Config.GEMINI_MODEL,
-            api_key=SecretStr(os.environ["GEMINI_API_KEY"])
-        )
+        """Get the process-wide Gemini client shared by all tests"""
+        from core.llm_registry import LLMRegistry
+        return LLMRegistry.get(Config.GEMINI_MODEL)
 
     @abstractmethod
     def get_task(self) -> str:
@@ -70,25 +127,103 @@ class BaseTest(ABC):
         """Validate the test results against the output model"""
         pass
 
-    async def _take_screenshot(self, agent: Agent, filename: str) -> Optional[str]:
-        """Take screenshot of the current page"""
+    async def _take_screenshot(self, agent: Optional['Agent'], filename: str) -> Optional[Dict[str, Optional[str]]]:
+        """Capture the current page; encoding and writing finish in the background"""
         try:
-            if hasattr(agent, 'page') and agent.page:
-                screenshot_path = self.screenshot_dir / filename
-                await agent.page.screenshot(
-                    path=str(screenshot_path),
-                    full_page=True
-                )
-                return str(screenshot_path)
+            page = await self._get_page(agent)
+            if page:
+                return await get_screenshot_pipeline().capture(page, self.screenshot_dir / filename)
         except Exception as e:
             print(f"Failed to take screenshot: {e}")
         return None
 
+    async def _get_page(self, agent: Optional['Agent']):
+        """Resolve the agent's current Playwright page, if a browser is open"""
+        if hasattr(agent, 'page') and agent.page:
+            return agent.page
+        browser_context = getattr(agent, 'browser_context', None)
+        if browser_context and browser_context.session:
+            return await browser_context.get_current_page()
+        return None
+
+    def _batching_hint(self) -> Optional[str]:
+        """Ask the model to batch actions that do not change the page into one step"""
+        if self.max_actions_per_step <= 1:
+            return None
+        return (f"Each step may carry up to {self.max_actions_per_step} actions. Batch actions that do not "
+                f"navigate, such as filling several fields of a form, into a single step.")
+
+    def _browser_kwargs(self, lease: Optional[BrowserLease]) -> Dict[str, Any]:
+        """Agent arguments that bind it to a pooled browser context"""
+        if lease is None:
+            return {}
+        return {'browser': lease.browser, 'browser_context': lease.context}
+
+    async def _apply_resource_policy(self, page):
+        """Block the requests this test does not need in every page of its context"""
+        policy = self.resource_policy or ResourcePolicy.from_config()
+        await policy.apply(page.context, self.metrics.blocked)
+
+    def _apply_browser_timeouts(self, page):
+        """Bound every Playwright action and navigation that sets no timeout of its own"""
+        if Config.BROWSER_OP_TIMEOUT > 0:
+            page.context.set_default_timeout(Config.BROWSER_OP_TIMEOUT * 1000)
+            page.context.set_default_navigation_timeout(Config.BROWSER_OP_TIMEOUT * 1000)
+
+    async def cleanup(self):
+        """Release per-test resources once the runner is done with the test"""
+        if self._controller is not None and hasattr(self._controller, 'close'):
+            await self._controller.close()
+
     async def _perform_secure_login(self, page):
-        """Execute login completely outside agent system"""
+        """Execute login completely outside agent system, reusing a saved session when it is still valid"""
         if not self.credentials or not self._login_url:
             return
+        if not Config.SESSION_CACHE:
+            await self._login_with_form(page)
+            return
+
+        cache = get_session_cache()
+        key = cache.key(self._login_url, self.credentials)
+        # Tests behind the same login wait here for the first one instead of all logging in
+        async with cache.lock(key):
+            storage_state = cache.load(key)
+            if storage_state:
+                if await self._restore_session(page, storage_state):
+                    print(f"♻️ Reused login session for {self.test_id}")
+                    return
+                print(f"⚠️ Saved login session rejected for {self.test_id}, logging in again")
+                cache.invalidate(key)
+                await clear_storage_state(page, storage_state)
+
+            await self._login_with_form(page)
+            try:
+                cache.save(key, await page.context.storage_state())
+            except OSError as e:
+                print(f"⚠️ Could not save login session: {e}")
 
+    async def _restore_session(self, page, storage_state) -> bool:
+        """Restore saved session state and check it still counts as logged in"""
+        try:
+            await restore_storage_state(page, storage_state)
+        except Exception:
+            return False
+        return await self._probe_session(page)
+
+    async def _probe_session(self, page) -> bool:
+        """Check that restored session state still counts as logged in"""
+        probe_url = self._post_login_url or self._login_url
+        try:
+            await page.goto(probe_url, wait_until="domcontentloaded", timeout=10000)
+            if await page.query_selector(self.login_selectors['username']):
+                return False
+            await page.wait_for_selector(self.login_selectors['success_message'], timeout=3000, state="visible")
+            return True
+        except Exception:
+            return False
+
+    async def _login_with_form(self, page):
+        """Fill and submit the login form with direct Playwright commands"""
         try:
             # Load login page with timeout
             await page.goto(self._login_url, wait_until="networkidle", timeout=10000)
@@ -120,43 +255,148 @@ class BaseTest(ABC):
             raise RuntimeError("Secure login system failed") from e
 
     async def run(self):
+        """Execute the test, trying the compiled fast path first when enabled"""
+        if self.execution_mode == 'fast_path':
+            result = await self._run_fast_path()
+            if result is not None:
+                return result
+        return await self._run_agent()
+
+    async def _run_fast_path(self) -> Optional[BaseModel]:
+        """Replay the compiled Playwright script; None means fall back to the agent"""
+        script = load_fast_path(self.__class__, self.param_id)
+        if script is None:
+            return None
+
+        lease = None
+        browser = None
+        try:
+            with self.metrics.phase('browser_launch'):
+                lease = await self.browser_pool.acquire() if self.browser_pool else None
+                if lease:
+                    page = await lease.get_page()
+                else:
+                    from browser_use.browser.browser import Browser, BrowserConfig
+                    browser = Browser(config=BrowserConfig(headless=Config.HEADLESS))
+                    page = await (await browser.new_context()).get_current_page()
+                self._apply_browser_timeouts(page)
+                await self._apply_resource_policy(page)
+
+            if self.credentials:
+                with self.metrics.phase('secure_login'):
+                    await self._perform_secure_login(page)
+            with self.metrics.phase('fast_path'):
+                result = await script.replay(page, self.credentials)
+            with self.metrics.phase('validation'):
+                validated_result = self.get_output_model().model_validate(result)
+                self.validate_results(validated_result)
+            print(f"⚡ {self.test_id} passed on the fast path")
+            return validated_result
+
+        except Exception as e:
+            print(f"⚠️ Fast path failed for {self.test_id}, falling back to agent: {e}")
+            return None
+
+        finally:
+            with self.metrics.phase('teardown'):
+                if lease:
+                    await self.browser_pool.release(lease)
+                elif browser:
+                    await browser.close()
+
+    def _compile_fast_path(self, history):
+        """Compile a passing agent history into this test's fast-path script"""
+        try:
+            script_path = save_fast_path(self.__class__, history.model_dump(), self.credentials, self.param_id)
+            print(f"⚡ Fast path compiled: {script_path}")
+        except FastPathCompileError as e:
+            print(f"⚠️ Fast path not compiled for {self.test_id}: {e}")
+
+    async def _run_agent(self):
         """Execute the test with secure credential handling"""
+        from browser_use.agent.service import Agent
+
         os.environ["PLAYWRIGHT_HEADLESS"] = "1"
         os.environ["BROWSER_TYPE"] = os.getenv("BROWSER_TYPE", "firefox")
 
+        # Phase 1: Browser Launch (or checkout from the runner's pool)
+        with self.metrics.phase('browser_launch'):
+            lease = await self.browser_pool.acquire() if self.browser_pool else None
+
+        # Steps are streamed to disk as the next one starts; screenshots go to the artifact store
+        history_writer = HistoryWriter(self.test_id)
+
+        async def on_new_step(state, model_output, step_number):
+            self.metrics.note_step(state, model_output, self._input_tokens(agent))
+            history_writer.sync(agent.state.history)
+
         agent = Agent(
             self.get_task(),  # Credential-free task
             self.llm,
             controller=self.controller,
             use_vision=False,
+            register_new_step_callback=on_new_step,
+            max_actions_per_step=self.max_actions_per_step,
+            message_context=self._batching_hint(),
+            # Replaced by the proxy below, see attach_page_extraction_llm
+            page_extraction_llm=unwrap(self.llm),
+            **self._browser_kwargs(lease)
         )
+        attach_page_extraction_llm(agent, self.llm)
+        self.metrics.instrument_agent(agent)
+        limit_steps(agent, Config.STEP_TIMEOUT, self.metrics)
+        limit_tokens(agent, self.max_tokens, self.metrics)
 
         try:
-            # Phase 1: Browser Launch
-            if hasattr(agent, 'start'):
-                await agent.start()
+            with self.metrics.phase('browser_launch'):
+                if hasattr(agent, 'start'):
+                    await agent.start()
+                # Opens a standalone browser here rather than inside the first agent step
+                page = await agent.browser_context.get_current_page()
+                self._apply_browser_timeouts(page)
+                await self._apply_resource_policy(page)
 
             # Phase 2: Secure Login (Bypass Agent Completely)
-            if hasattr(agent, 'page') and self.credentials:
-                await self._perform_secure_login(agent.page)
+            if page and self.credentials:
+                with self.metrics.phase('secure_login'):
+                    await self._perform_secure_login(page)
 
             # Phase 3: Agent Continues Post-Login
-            history = await agent.run()
-            history.save_to_file(f'history_{self.__class__.__name__}.json')
+            with self.metrics.phase('agent_loop'):
+                history = await agent.run(max_steps=self.max_steps)
+            history_writer.sync(history)
+            check_steps(history, self.max_steps, self.metrics)
+
+            with self.metrics.phase('validation'):
+                test_result = history.final_result()
+                validated_result = self.get_output_model().model_validate_json(test_result)
+                self.validate_results(validated_result)
 
-            test_result = history.final_result()
-            validated_result = self.get_output_model().model_validate_json(test_result)
-            self.validate_results(validated_result)
+            if self.execution_mode == 'fast_path':
+                self._compile_fast_path(history)
             return validated_result
 
         except Exception as e:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_file = f"failure_{self.__class__.__name__}_{timestamp}.png"
-            await self._take_screenshot(agent, screenshot_file)
+            screenshot_file = f"failure_{make_param_id(self.test_id)}_{timestamp}.png"
+            self.failure_screenshot = await self._take_screenshot(agent, screenshot_file)
             raise RuntimeError(f"Test failed: {str(e)}") from e
 
         finally:
-            if hasattr(agent, 'close_browser'):
-                await agent.close_browser()
-            elif hasattr(agent, 'close'):
-                await agent.close()
\ No newline at end of file
+            with self.metrics.phase('teardown'):
+                history_writer.sync(agent.state.history)
+                history_writer.close()
+                if lease:
+                    await self.browser_pool.release(lease)
+                elif hasattr(agent, 'close_browser'):
+                    await agent.close_browser()
+                elif hasattr(agent, 'close'):
+                    await agent.close()
+
+    @staticmethod
+    def _input_tokens(agent: 'Agent') -> Optional[int]:
+        """Tokens in the prompt the agent just sent, as counted by its message manager"""
+        try:
+            return agent._message_manager.state.history.total_tokens
+        except AttributeError:
+            return None
\ No newline at end of file
@@ -0,0 +1,187 @@
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, List, Optional, Set
+
+import psutil
+from core.config import Config
+
+if TYPE_CHECKING:
+    from browser_use.browser.browser import Browser
+    from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+# Browsers tried for one context; a failure that survives a fresh browser is not the browser's fault
+CONTEXT_ATTEMPTS = 2
+
+
+class PooledBrowser:
+    """A long-lived browser process shared by consecutive tests"""
+
+    def __init__(self, browser: 'Browser', pids: Set[int]):
+        self.browser = browser
+        self.pids = pids
+        self.uses = 0
+        self.created_at = time.time()
+
+    def is_healthy(self) -> bool:
+        """Check that the underlying Playwright browser is still connected"""
+        playwright_browser = self.browser.playwright_browser
+        return playwright_browser is not None and playwright_browser.is_connected()
+
+    def memory_mb(self) -> float:
+        """Resident memory of the browser process tree (driver, browser and renderers)"""
+        total = 0
+        for pid in self.pids:
+            try:
+                root = psutil.Process(pid)
+                for proc in [root] + root.children(recursive=True):
+                    total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+
+    def kill(self):
+        """Terminate the browser process tree when it no longer responds to close()"""
+        for pid in self.pids:
+            try:
+                root = psutil.Process(pid)
+                for proc in root.children(recursive=True) + [root]:
+                    proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+
+class BrowserLease:
+    """A fresh, isolated browser context checked out from the pool for one test"""
+
+    def __init__(self, pooled: PooledBrowser, context: 'BrowserContext'):
+        self.pooled = pooled
+        self.context = context
+
+    @property
+    def browser(self) -> 'Browser':
+        return self.pooled.browser
+
+    async def get_page(self):
+        return await self.context.get_current_page()
+
+
+class BrowserPool:
+    """Pool of long-lived browsers sized to the runner's worker count.
+
+    Browsers are launched lazily, handed out one test at a time and
+    recycled after ``max_uses`` contexts or once their process tree grows
+    beyond ``max_memory_mb``.
+    """
+
+    def __init__(self, size: int,
+                 max_uses: int = Config.BROWSER_MAX_USES,
+                 max_memory_mb: int = Config.BROWSER_MAX_MEMORY_MB):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[PooledBrowser] = []
+        self._launch_lock = asyncio.Lock()
+        self._browsers: List[PooledBrowser] = []
+
+    async def acquire(self) -> BrowserLease:
+        """Check out a browser and open a new context on it"""
+        await self._slots.acquire()
+        try:
+            for attempt in range(1, CONTEXT_ATTEMPTS + 1):
+                pooled = await self._checkout()
+                try:
+                    context = await pooled.browser.new_context(self._context_config())
+                    await context.get_session()
+                    return BrowserLease(pooled, context)
+                except Exception as e:
+                    print(f"⚠️ Browser failed to open a context, recycling it: {e}")
+                    await self._retire(pooled)
+                    if attempt == CONTEXT_ATTEMPTS:
+                        raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, lease: BrowserLease):
+        """Close the test's context and return its browser to the pool"""
+        pooled = lease.pooled
+        closed = False
+        try:
+            await asyncio.wait_for(lease.context.close(), Config.BROWSER_OP_TIMEOUT or None)
+            closed = True
+        except Exception as e:
+            print(f"⚠️ Failed to close browser context: {e!r}")
+
+        try:
+            pooled.uses += 1
+            # A context that would not close leaves the browser in an unknown state
+            if not closed or self._needs_recycle(pooled):
+                await self._retire(pooled)
+            else:
+                self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    @property
+    def browser_count(self) -> int:
+        return len(self._browsers)
+
+    def memory_mb(self) -> float:
+        """Resident memory of every browser the pool owns; safe to call from a worker thread"""
+        return sum(pooled.memory_mb() for pooled in list(self._browsers))
+
+    async def close(self):
+        """Shut down every browser owned by the pool"""
+        for pooled in list(self._browsers):
+            await self._retire(pooled)
+        self._idle.clear()
+
+    def _context_config(self) -> 'BrowserContextConfig':
+        from browser_use.browser.context import BrowserContextConfig
+        return BrowserContextConfig()
+
+    async def _checkout(self) -> PooledBrowser:
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.is_healthy():
+                return pooled
+            print("⚠️ Pooled browser failed health check, recycling it")
+            await self._retire(pooled)
+        return await self._launch()
+
+    async def _launch(self) -> PooledBrowser:
+        from browser_use.browser.browser import Browser, BrowserConfig
+
+        # Launches are serialized so the new processes can be attributed to this browser
+        async with self._launch_lock:
+            before = self._child_pids()
+            browser = Browser(config=BrowserConfig(headless=Config.HEADLESS))
+            await browser.get_playwright_browser()
+            pooled = PooledBrowser(browser, self._child_pids() - before)
+            self._browsers.append(pooled)
+            return pooled
+
+    async def _retire(self, pooled: PooledBrowser):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        try:
+            await asyncio.wait_for(pooled.browser.close(), Config.BROWSER_OP_TIMEOUT or None)
+        except Exception as e:
+            print(f"⚠️ Failed to close pooled browser, killing it: {e!r}")
+            pooled.kill()
+
+    def _needs_recycle(self, pooled: PooledBrowser) -> bool:
+        if not pooled.is_healthy():
+            return True
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return True
+        if self.max_memory_mb and pooled.memory_mb() > self.max_memory_mb:
+            print(f"♻️ Recycling browser using {pooled.memory_mb():.0f} MB")
+            return True
+        return False
+
+    @staticmethod
+    def _child_pids() -> Set[int]:
+        return {child.pid for child in psutil.Process(os.getpid()).children()}
@@ -0,0 +1,45 @@
+from typing import Any, Dict, Optional
+
+from core.metrics import TestMetrics
+
+
+class BudgetExceededError(RuntimeError):
+    """An agent used up one of its test's budgets (steps or tokens)"""
+
+    def __init__(self, budget: str, limit: int, used: int, step: Optional[int] = None, url: Optional[str] = None):
+        self.budget = budget
+        self.limit = limit
+        self.used = used
+        self.step = step
+        self.url = url
+        where = f" (stopped at step {step}" + (f" on {url})" if url else ")") if step else ""
+        super().__init__(f"Budget exceeded: {budget} used {used} of {limit}{where}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'budget': self.budget, 'limit': self.limit, 'used': self.used, 'step': self.step, 'url': self.url}
+
+
+def total_tokens(metrics: TestMetrics) -> int:
+    return sum(step.get('input_tokens') or 0 for step in metrics.steps)
+
+
+def limit_tokens(agent, max_tokens: int, metrics: TestMetrics):
+    """Stop the agent after the step that takes its prompt tokens past ``max_tokens``"""
+    if not max_tokens or max_tokens <= 0:
+        return
+    original = agent.step
+
+    async def budgeted_step(*args, **kwargs):
+        result = await original(*args, **kwargs)
+        used = total_tokens(metrics)
+        if used > max_tokens:
+            raise BudgetExceededError('max_tokens', max_tokens, used, *metrics.last_position())
+        return result
+
+    agent.step = budgeted_step
+
+
+def check_steps(history, max_steps: int, metrics: TestMetrics):
+    """Fail a run that stopped at ``max_steps`` without the agent finishing its task"""
+    if not history.is_done() and len(history.history) >= max_steps:
+        raise BudgetExceededError('max_steps', max_steps, len(history.history), *metrics.last_position())
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional, Tuple
+
+import psutil
+from core.config import Config
+
+if TYPE_CHECKING:
+    from core.browser_pool import BrowserPool
+
+
+class AdaptiveLimiter:
+    """FIFO semaphore whose limit can be raised or lowered while tests hold it.
+
+    Lowering the limit never interrupts running tests; new ones just wait
+    until enough of them have finished.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the waiter was cancelled
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def set_limit(self, limit: int):
+        self.limit = limit
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.active < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+def llm_call_stats() -> Tuple[int, int]:
+    """(calls, retried calls) across the shared LLM clients; retries follow 429s, 5xx and deadlines"""
+    from core.llm_registry import LLMRegistry
+
+    calls = retries = 0
+    for client in LLMRegistry.clients():
+        calls += getattr(client, 'calls', 0)
+        retries += getattr(client, 'retries', 0)
+    return calls, retries
+
+
+class ConcurrencyController:
+    """Periodically resizes an AdaptiveLimiter from host load and LLM throttling.
+
+    The limit is halved while the LLM provider is throttling, reduced by one
+    under CPU or memory pressure, and raised by one when tests are queued and
+    the host has room for another browser. Every change is passed to
+    ``on_decision`` together with the measurements behind it.
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter, minimum: int, maximum: int,
+                 browser_pool: Optional['BrowserPool'] = None,
+                 on_decision: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 interval: float = Config.CONCURRENCY_INTERVAL):
+        self.limiter = limiter
+        self.minimum = minimum
+        self.maximum = maximum
+        self.browser_pool = browser_pool
+        self.on_decision = on_decision
+        self.interval = interval
+        self._started = time.monotonic()
+        self._llm_seen = (0, 0)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._llm_seen = llm_call_stats()
+        self._started = time.monotonic()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # The first cpu_percent() call only sets the baseline for the next one
+        await asyncio.to_thread(psutil.cpu_percent, None)
+        self._record(self.limiter.limit, 'start', await self.sample())
+        while True:
+            await asyncio.sleep(self.interval)
+            sample = await self.sample()
+            limit, reason = self.decide(sample)
+            if limit != self.limiter.limit:
+                self._record(limit, reason, sample)
+                self.limiter.set_limit(limit)
+
+    async def sample(self) -> Dict[str, Any]:
+        """Current host load, browser memory and LLM retry rate since the previous sample"""
+        # psutil walks /proc for every browser process, so it stays off the event loop
+        sample = await asyncio.to_thread(self._host_load)
+        calls, retries = llm_call_stats()
+        new_calls, new_retries = calls - self._llm_seen[0], retries - self._llm_seen[1]
+        self._llm_seen = (calls, retries)
+        sample.update({
+            'llm_error_rate': round(new_retries / new_calls, 3) if new_calls else 0.0,
+            'active': self.limiter.active,
+            'waiting': self.limiter.waiting,
+        })
+        return sample
+
+    def _host_load(self) -> Dict[str, Any]:
+        """CPU, free memory and browser RSS; runs on a worker thread"""
+        memory = psutil.virtual_memory()
+        browsers = self.browser_pool.browser_count if self.browser_pool else 0
+        return {
+            'cpu_pct': psutil.cpu_percent(interval=None),
+            'free_memory_pct': round(memory.available / memory.total * 100, 1),
+            'free_memory_mb': round(memory.available / (1024 * 1024)),
+            'browsers': browsers,
+            'browser_rss_mb': round(self.browser_pool.memory_mb()) if browsers else 0,
+        }
+
+    def decide(self, sample: Dict[str, Any]) -> Tuple[int, str]:
+        """New limit and the reason for it"""
+        limit = self.limiter.limit
+        if sample['llm_error_rate'] > Config.CONCURRENCY_MAX_LLM_ERROR_RATE:
+            return max(self.minimum, limit // 2), 'llm_throttling'
+        if sample['free_memory_pct'] < Config.CONCURRENCY_MIN_FREE_MEMORY:
+            return max(self.minimum, limit - 1), 'low_memory'
+        if sample['cpu_pct'] > Config.CONCURRENCY_CPU_HIGH:
+            return max(self.minimum, limit - 1), 'high_cpu'
+
+        # Another browser should fit in memory with room to spare
+        browser_mb = sample['browser_rss_mb'] / sample['browsers'] if sample['browsers'] else 0
+        if (sample['waiting'] and limit < self.maximum and sample['cpu_pct'] < Config.CONCURRENCY_CPU_LOW
+                and sample['free_memory_mb'] > 2 * browser_mb):
+            return limit + 1, 'headroom'
+        return limit, 'hold'
+
+    def _record(self, limit: int, reason: str, sample: Dict[str, Any]):
+        decision = {
+            'elapsed': round(time.monotonic() - self._started, 1),
+            'previous': self.limiter.limit,
+            'limit': limit,
+            'reason': reason,
+            **sample,
+        }
+        if reason != 'start':
+            print(f"⚖️ Concurrency {decision['previous']} -> {limit} ({reason}: cpu {sample['cpu_pct']}%, "
+                  f"free memory {sample['free_memory_pct']}%, LLM retries {sample['llm_error_rate']:.0%})")
+        if self.on_decision:
+            self.on_decision(decision)
@@ -9,11 +9,82 @@ class Config:
     # Browser Configuration
     BROWSER_TYPE = os.getenv('BROWSER_TYPE', 'chromium')
     HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
-    TEST_TIMEOUT = int(os.getenv('TEST_TIMEOUT', '60'))  # seconds
+    TEST_TIMEOUT = int(os.getenv('TEST_TIMEOUT', '300'))  # seconds; 0 disables
+    TEST_TIMEOUT_HISTORY_FACTOR = float(os.getenv('TEST_TIMEOUT_HISTORY_FACTOR', '3'))  # x expected duration; raises TEST_TIMEOUT for slow tests
+    STEP_TIMEOUT = int(os.getenv('STEP_TIMEOUT', '30'))  # seconds per agent step; 0 disables
+    BROWSER_OP_TIMEOUT = int(os.getenv('BROWSER_OP_TIMEOUT', '15'))  # seconds per Playwright action, navigation or close
+    DEFAULT_TEST_DURATION = int(os.getenv('DEFAULT_TEST_DURATION', '60'))  # seconds, for tests with no history
+
+    # Adaptive Concurrency: browser tests run at once, adjusted during the run from host load and LLM throttling
+    MIN_WORKERS = int(os.getenv('MIN_WORKERS', '1'))
+    MAX_WORKERS = int(os.getenv('MAX_WORKERS', str(max(2, (os.cpu_count() or 4) // 2))))
+    INITIAL_WORKERS = int(os.getenv('INITIAL_WORKERS', '3'))
+    CONCURRENCY_INTERVAL = float(os.getenv('CONCURRENCY_INTERVAL', '5'))  # seconds between adjustments
+    CONCURRENCY_CPU_HIGH = float(os.getenv('CONCURRENCY_CPU_HIGH', '85'))  # host CPU % that sheds a slot
+    CONCURRENCY_CPU_LOW = float(os.getenv('CONCURRENCY_CPU_LOW', '60'))  # host CPU % below which a slot may be added
+    CONCURRENCY_MIN_FREE_MEMORY = float(os.getenv('CONCURRENCY_MIN_FREE_MEMORY', '15'))  # % of RAM
+    CONCURRENCY_MAX_LLM_ERROR_RATE = float(os.getenv('CONCURRENCY_MAX_LLM_ERROR_RATE', '0.1'))  # share of LLM calls retried
+
+    # Browser Pool Configuration
+    BROWSER_MAX_USES = int(os.getenv('BROWSER_MAX_USES', '20'))  # contexts served before a browser is recycled
+    BROWSER_MAX_MEMORY_MB = int(os.getenv('BROWSER_MAX_MEMORY_MB', '1536'))  # RSS ceiling per browser process tree
+
+    # API Tests: separate concurrency limit and one pooled HTTP session per runner
+    API_MAX_CONCURRENCY = int(os.getenv('API_MAX_CONCURRENCY', '50'))
+    HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '10'))
+    HTTP_KEEPALIVE_TIMEOUT = int(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))  # seconds
+    HTTP_TIMEOUT = int(os.getenv('HTTP_TIMEOUT', '30'))  # seconds per request
+
+    # Retries: transient failures are retried per error class, within a budget shared by the whole run
+    RETRY_BUDGET = int(os.getenv('RETRY_BUDGET', '10'))  # 0 disables retries
+    RETRY_POLICIES = os.getenv('RETRY_POLICIES', 'rate_limit=2,timeout=2,llm_output=2,browser=1,network=1')
+
+    # Screenshots: encoded and written on a thread pool; identical frames are hard-linked; WebP, thumbnails and
+    # opt-in near-duplicate matching need Pillow
+    SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'png').lower()  # png | jpeg | webp
+    SCREENSHOT_QUALITY = int(os.getenv('SCREENSHOT_QUALITY', '80'))  # jpeg and webp only
+    SCREENSHOT_WORKERS = int(os.getenv('SCREENSHOT_WORKERS', '2'))
+    SCREENSHOT_THUMBNAIL_WIDTH = int(os.getenv('SCREENSHOT_THUMBNAIL_WIDTH', '320'))  # pixels
+    SCREENSHOT_DEDUP_DISTANCE = int(os.getenv('SCREENSHOT_DEDUP_DISTANCE', '0'))  # 0 byte-identical only; >0 perceptual hash bits; -1 disables
+
+    # Distributed Runs: a coordinator leases tests to workers; unrenewed leases are requeued
+    LEASE_TIMEOUT = float(os.getenv('LEASE_TIMEOUT', '60'))  # seconds without a worker heartbeat
+    COORDINATOR_TOKEN = os.getenv('COORDINATOR_TOKEN', '')  # shared secret workers present when connecting
+
+    # Agent Budgets: per-test defaults, overridable as BaseTest class attributes
+    MAX_ACTIONS_PER_STEP = int(os.getenv('MAX_ACTIONS_PER_STEP', '5'))
+    MAX_STEPS = int(os.getenv('MAX_STEPS', '30'))
+    MAX_TOKENS = int(os.getenv('MAX_TOKENS', '500000'))  # prompt tokens summed over all steps; 0 disables
+
+    # Execution Mode: 'agent' always drives the LLM, 'fast_path' replays compiled scripts first
+    EXECUTION_MODE = os.getenv('EXECUTION_MODE', 'agent')
+    FAST_PATH_STEP_TIMEOUT = int(os.getenv('FAST_PATH_STEP_TIMEOUT', '10'))  # seconds
+
+    # Network Resource Policy: request types, URL globs and trackers blocked in every test's browser context
+    # No request types are blocked unless listed (e.g. image,media,font); tests opt in via resource_policy
+    RESOURCE_BLOCK_TYPES = [t.strip() for t in os.getenv('RESOURCE_BLOCK_TYPES', '').split(',') if t.strip()]
+    RESOURCE_BLOCK_PATTERNS = [p.strip() for p in os.getenv('RESOURCE_BLOCK_PATTERNS', '').split(',') if p.strip()]
+    BLOCK_TRACKERS = os.getenv('BLOCK_TRACKERS', 'true').lower() == 'true'
+
+    # Login Session Cache: storage state saved after a secure login and reused by later tests
+    SESSION_CACHE = os.getenv('SESSION_CACHE', 'true').lower() == 'true'
+    SESSION_TTL = int(os.getenv('SESSION_TTL', '1800'))  # seconds before a saved session is discarded
 
     # Gemini Configuration
     GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-pro')
 
+    # LLM Rate Limiting (shared by all tests in a process)
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '60'))  # 0 disables the limit
+    LLM_TOKENS_PER_MINUTE = int(os.getenv('LLM_TOKENS_PER_MINUTE', '1000000'))  # 0 disables the limit
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '5'))
+    LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', '2'))  # seconds
+    LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', '60'))  # seconds
+
+    # LLM Record/Replay Configuration
+    LLM_CACHE_MODE = os.getenv('LLM_CACHE_MODE', 'off')  # off | record | replay
+    LLM_CACHE_MISS_POLICY = os.getenv('LLM_CACHE_MISS_POLICY', 'fail')  # fail | live
+
     @staticmethod
     def get_screenshot_dir() -> Path:
         return Path(__file__).parent.parent / 'screenshots'
@@ -26,6 +97,34 @@ class Config:
     def get_template_dir() -> Path:
         return Path(__file__).parent.parent / 'report_templates'
 
+    @staticmethod
+    def get_journal_path() -> Path:
+        return Path(__file__).parent.parent / 'reports' / 'journal.jsonl'
+
+    @staticmethod
+    def get_run_index_path() -> Path:
+        return Path(__file__).parent.parent / 'reports' / 'history.db'
+
+    @staticmethod
+    def get_manifest_path() -> Path:
+        return Path(__file__).parent.parent / '.test_manifest.json'
+
+    @staticmethod
+    def get_history_dir() -> Path:
+        return Path(__file__).parent.parent / 'histories'
+
+    @staticmethod
+    def get_session_dir() -> Path:
+        return Path(__file__).parent.parent / '.sessions'
+
+    @staticmethod
+    def get_artifact_dir() -> Path:
+        return Path(__file__).parent.parent / 'artifacts'
+
+    @staticmethod
+    def get_llm_cache_dir() -> Path:
+        return Path(os.getenv('LLM_CACHE_DIR', Path(__file__).parent.parent / 'llm_cache'))
+
     @staticmethod
     def get_gemini_api_key() -> str:
         return os.getenv("GEMINI_API_KEY")
\ No newline at end of file
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from core.config import Config
+from core.durations import DurationStore
+from core.report_generator import TestReport
+from core.test_item import TestItem, expand_tests
+from core.test_runner import TestRunner, publish_report
+
+# Result lines carry full step metrics, well past asyncio's 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+async def send(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    writer.write(json.dumps(message).encode('utf-8') + b'\n')
+    await writer.drain()
+
+
+async def receive(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    return json.loads(line)
+
+
+def parse_address(address: str) -> Tuple[Optional[str], Any]:
+    """``unix:/path/to.sock`` -> (None, path); ``host:port`` -> (host, port)"""
+    if address.startswith('unix:'):
+        return None, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+async def start_server(address: str, handler) -> asyncio.AbstractServer:
+    host, target = parse_address(address)
+    if host is None:
+        return await asyncio.start_unix_server(handler, path=target, limit=STREAM_LIMIT)
+    return await asyncio.start_server(handler, host, target, limit=STREAM_LIMIT)
+
+
+async def open_connection(address: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    host, target = parse_address(address)
+    if host is None:
+        return await asyncio.open_unix_connection(target, limit=STREAM_LIMIT)
+    return await asyncio.open_connection(host, target, limit=STREAM_LIMIT)
+
+
+class Coordinator:
+    """Hands out test IDs to workers one at a time and collects their results.
+
+    Every test handed out is leased to its worker. Workers renew their
+    leases with heartbeats while they run; a lease that is not renewed
+    within ``lease_timeout`` puts its test back at the front of the queue,
+    so the tests of a worker that died are picked up by the others.
+    """
+
+    def __init__(self, items: Sequence[TestItem], report: TestReport,
+                 lease_timeout: float = Config.LEASE_TIMEOUT, token: str = Config.COORDINATOR_TOKEN):
+        self.report = report
+        self.lease_timeout = lease_timeout
+        self.token = token
+        self.queue: Deque[str] = deque(item.id for item in items)
+        self.leases: Dict[str, Tuple[str, float]] = {}
+        self.finished: Set[str] = set()
+        self._done = asyncio.Event()
+
+    async def serve(self, address: str):
+        """Serve the queue until every test has a result"""
+        server = await start_server(address, self._handle)
+        expiry = asyncio.ensure_future(self._expire_leases())
+        print(f"🛰️ Coordinator serving {len(self.queue)} tests on {address}")
+        try:
+            self._check_done()
+            await self._done.wait()
+        finally:
+            expiry.cancel()
+            server.close()
+            await server.wait_closed()
+            self.report.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        worker = None
+        try:
+            hello = await receive(reader)
+            if hello.get('op') != 'hello' or hello.get('token', '') != self.token:
+                await send(writer, {'error': 'Rejected: bad handshake or token'})
+                return
+            worker = hello.get('worker') or str(writer.get_extra_info('peername'))
+            print(f"🤝 Worker {worker} connected")
+            await send(writer, {'ok': True, 'lease_timeout': self.lease_timeout})
+            while True:
+                await send(writer, self._dispatch(worker, await receive(reader)))
+        except (ConnectionError, json.JSONDecodeError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            if worker and not self._done.is_set():
+                held = [test_id for test_id, (owner, _) in self.leases.items() if owner == worker]
+                print(f"⚠️ Worker {worker} disconnected ({e}); {len(held)} leased tests requeue after the lease timeout")
+        finally:
+            writer.close()
+
+    def _dispatch(self, worker: str, message: Any) -> Dict[str, Any]:
+        error = self._invalid(message)
+        if error:
+            # Answered rather than raised, so the worker keeps its connection and its leases
+            print(f"⚠️ Ignoring message from worker {worker}: {error}")
+            return {'error': error}
+
+        op = message.get('op')
+        if op == 'next':
+            if self.queue:
+                test_id = self.queue.popleft()
+                self.leases[test_id] = (worker, time.monotonic() + self.lease_timeout)
+                return {'test': test_id, 'lease_timeout': self.lease_timeout}
+            if self.leases:
+                # Leased tests may still come back if their worker dies
+                return {'wait': min(5.0, self.lease_timeout / 3)}
+            return {'done': True}
+
+        if op == 'heartbeat':
+            expires = time.monotonic() + self.lease_timeout
+            for test_id, (owner, _) in list(self.leases.items()):
+                if owner == worker:
+                    self.leases[test_id] = (owner, expires)
+            return {'ok': True}
+
+        if op == 'result':
+            test_id = message['test']
+            # A late result for a test that was requeued and already reported elsewhere is dropped
+            if test_id not in self.finished:
+                self.finished.add(test_id)
+                self.leases.pop(test_id, None)
+                if test_id in self.queue:
+                    self.queue.remove(test_id)
+                self.report.add_detail(message['detail'])
+                icon = '✅' if message['detail'].get('status') == 'passed' else '❌'
+                print(f"{icon} {message['detail'].get('test_name')} ({worker})")
+                self._check_done()
+            return {'ok': True}
+
+        if op == 'concurrency':
+            self.report.add_concurrency_decision(dict(message['decision'], worker=worker))
+            return {'ok': True}
+
+        return {'error': f"Unknown op: {op}"}
+
+    @staticmethod
+    def _invalid(message: Any) -> Optional[str]:
+        """Why a message cannot be dispatched, or None when it is well formed"""
+        if not isinstance(message, dict):
+            return f"Malformed message: {message!r:.200}"
+        op = message.get('op')
+        if op == 'result' and not (isinstance(message.get('test'), str) and isinstance(message.get('detail'), dict)):
+            return "Malformed result: needs a test ID and a detail object"
+        if op == 'concurrency' and not isinstance(message.get('decision'), dict):
+            return "Malformed concurrency message: needs a decision object"
+        return None
+
+    async def _expire_leases(self):
+        while True:
+            await asyncio.sleep(min(5.0, self.lease_timeout / 3))
+            now = time.monotonic()
+            for test_id, (worker, expires) in list(self.leases.items()):
+                if expires < now:
+                    del self.leases[test_id]
+                    self.queue.appendleft(test_id)
+                    print(f"⚠️ Lease on {test_id} held by {worker} expired, requeued")
+
+    def _check_done(self):
+        if not self.queue and not self.leases:
+            self._done.set()
+
+
+class RemoteReport(TestReport):
+    """Worker-side report that streams each result to the coordinator instead of a journal"""
+
+    def __init__(self):
+        super().__init__()
+        self.test_ids: Dict[str, str] = {}
+        self.outbox: 'asyncio.Queue[Dict[str, Any]]' = asyncio.Queue()
+
+    def _record(self, detail: Dict[str, Any]):
+        detail = json.loads(json.dumps(detail, default=self._json_serializer))
+        self.outbox.put_nowait({'op': 'result', 'test': self.test_ids[detail['test_name']], 'detail': detail})
+        self._count(detail)
+
+    def add_concurrency_decision(self, decision: Dict[str, Any]):
+        self.outbox.put_nowait({'op': 'concurrency', 'decision': decision})
+
+
+class Worker:
+    """Pulls tests from a coordinator as slots free up and runs them with a TestRunner"""
+
+    def __init__(self, address: str, max_workers: int = Config.MAX_WORKERS, min_workers: int = Config.MIN_WORKERS,
+                 token: str = Config.COORDINATOR_TOKEN, name: Optional[str] = None):
+        self.address = address
+        self.token = token
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.report = RemoteReport()
+        self.runner = TestRunner(max_workers=max_workers, min_workers=min_workers, report=self.report)
+        self._items: Dict[str, TestItem] = {}
+        # Replaced by the coordinator's own lease timeout once connected
+        self.lease_timeout = Config.LEASE_TIMEOUT
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def run(self) -> bool:
+        self._reader, self._writer = await open_connection(self.address)
+        reply = await self._call({'op': 'hello', 'worker': self.name, 'token': self.token})
+        if 'error' in reply:
+            raise ConnectionError(reply['error'])
+        self.lease_timeout = reply.get('lease_timeout', self.lease_timeout)
+        print(f"🛰️ Worker {self.name} connected to {self.address}")
+
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        sender = asyncio.ensure_future(self._send_results())
+        self.runner.start_concurrency()
+        try:
+            await asyncio.gather(*(self._slot() for _ in range(self.runner.max_workers)))
+            await self.runner.wait_for_tasks()
+        finally:
+            await self.runner.shutdown()
+            # Deliver queued results unless the connection is already gone
+            delivered = asyncio.ensure_future(self.report.outbox.join())
+            await asyncio.wait([delivered, sender], return_when=asyncio.FIRST_COMPLETED)
+            for task in (heartbeat, sender, delivered):
+                task.cancel()
+            self._writer.close()
+        summary = self.report.results['summary']
+        print(f"🏁 Worker {self.name} finished: {summary['passed']} passed, {summary['failed']} failed")
+        return summary['failed'] == 0
+
+    async def _slot(self):
+        while True:
+            # Only ask for a test once this worker has room to start it
+            async with self.runner.semaphore:
+                reply = await self._call({'op': 'next'})
+                if reply.get('done'):
+                    return
+                if 'wait' in reply:
+                    await asyncio.sleep(reply['wait'])
+                    continue
+                self.lease_timeout = reply.get('lease_timeout', self.lease_timeout)
+                item = self._resolve(reply['test'])
+                if item is None:
+                    continue
+                attempts: List[dict] = []
+                in_browser_slot = self.runner._limiter(item) is self.runner.semaphore
+                retry = in_browser_slot and await self.runner.run_item(item, attempts)
+            if not in_browser_slot:
+                # API tests hand the browser slot back and run under the runner's API limit
+                await self.runner._execute_test(item, attempts)
+            elif retry:
+                self.runner._spawn(item, attempts)
+
+    def _resolve(self, test_id: str) -> Optional[TestItem]:
+        """The TestItem for an ID from the coordinator, importing its test module on first use"""
+        if test_id not in self._items:
+            from core.test_discover import discover_tests
+            for item in expand_tests(discover_tests(selection=[test_id.split('[')[0]])):
+                self._items[item.id] = item
+        item = self._items.get(test_id)
+        test_name = item.name if item else test_id.partition(':')[2]
+        self.report.test_ids[test_name] = test_id
+        if item is None:
+            # A worker with a different checkout still answers, so the lease is not held forever
+            self.report.add_detail({"test_name": test_name, "status": "failed", "duration": 0, "metrics": None,
+                                    "error": f"Test {test_id} not found on worker {self.name}"})
+        return item
+
+    async def _call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        # One request and one reply at a time over the shared connection
+        async with self._lock:
+            await send(self._writer, message)
+            return await receive(self._reader)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease_timeout / 3)
+            await self._call({'op': 'heartbeat'})
+
+    async def _send_results(self):
+        while True:
+            message = await self.report.outbox.get()
+            try:
+                await self._call(message)
+            finally:
+                self.report.outbox.task_done()
+
+
+async def run_coordinator(address: str, items: Sequence[TestItem], resume: bool = False) -> bool:
+    """Serve ``items`` to workers and publish the combined report once all have results"""
+    report = TestReport(resume=resume)
+    durations = DurationStore()
+    pending = [item for item in items if item.name not in report.completed]
+    if len(pending) < len(items):
+        print(f"⏭️ Skipping {len(items) - len(pending)} tests already in the journal")
+    # Longest-expected tests are handed out first, so the slowest one does not start last
+    ordered = durations.longest_first(pending, name=lambda item: item.name)
+    await Coordinator(ordered, report).serve(address)
+    report_data = publish_report(report, durations)
+    return report_data['summary']['failed'] == 0
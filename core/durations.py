@@ -0,0 +1,92 @@
+import json
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+from core.config import Config
+
+T = TypeVar('T')
+
+
+class DurationStore:
+    """Expected test durations, learned from previous runs.
+
+    Estimates live in ``reports/durations.json`` as an exponentially weighted
+    moving average of passed-test durations. When that file does not exist
+    yet it is bootstrapped from the timestamped ``test_report_*.json`` files.
+    """
+
+    SMOOTHING = 0.3  # weight of the newest observation
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Config.get_report_dir() / 'durations.json'
+        self.estimates: Dict[str, Dict[str, float]] = {}
+        self.load()
+
+    def load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.estimates = json.load(f)
+                return
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Ignoring unreadable duration database {self.path}: {e}")
+        self._bootstrap_from_reports()
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.estimates, f, indent=2, sort_keys=True)
+
+    def record(self, test_name: str, duration: float):
+        """Fold one observed duration into the test's estimate"""
+        entry = self.estimates.get(test_name)
+        if entry is None:
+            entry = {'estimate': duration, 'runs': 0}
+        else:
+            entry['estimate'] = self.SMOOTHING * duration + (1 - self.SMOOTHING) * entry['estimate']
+        entry['estimate'] = round(entry['estimate'], 2)
+        entry['runs'] += 1
+        entry['updated'] = datetime.now().isoformat()
+        self.estimates[test_name] = entry
+
+    def record_report(self, report: dict):
+        """Record the durations of every passed test in a TestReport result dict"""
+        self.record_details(report.get('details', []))
+
+    def record_details(self, details: Iterable[dict]):
+        """Record the durations of every passed test in a stream of report details"""
+        for test in details:
+            if test.get('status') == 'passed' and test.get('duration'):
+                self.record(test['test_name'], test['duration'])
+
+    def estimate(self, test_name: str) -> float:
+        """Expected duration; unknown tests get the median of known ones"""
+        entry = self.estimates.get(test_name)
+        if entry:
+            return entry['estimate']
+        return self.default_estimate()
+
+    def observed(self, test_name: str) -> Optional[float]:
+        """Expected duration from the test's own history, or None if it has never passed"""
+        entry = self.estimates.get(test_name)
+        return entry['estimate'] if entry else None
+
+    def default_estimate(self) -> float:
+        known = [entry['estimate'] for entry in self.estimates.values()]
+        return statistics.median(known) if known else float(Config.DEFAULT_TEST_DURATION)
+
+    def longest_first(self, items: Iterable[T], name: Callable[[T], str]) -> List[T]:
+        """Order items so the longest expected tests are dispatched first"""
+        return sorted(items, key=lambda item: self.estimate(name(item)), reverse=True)
+
+    def _bootstrap_from_reports(self):
+        report_dir = self.path.parent
+        # Timestamped names sort chronologically, so newer runs weigh more
+        for report_path in sorted(report_dir.glob('test_report_*.json')):
+            try:
+                with open(report_path, 'r') as f:
+                    self.record_report(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Skipping unreadable report {report_path.name}: {e}")
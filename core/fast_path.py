@@ -0,0 +1,286 @@
+import importlib.util
+import inspect
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Type
+
+from core.actions import SHARED_ACTIONS_BY_NAME, run_shared_action
+from core.config import Config
+from core.history_store import load_history
+
+# Actions that only fed information back to the model; nothing to replay
+PASSIVE_ACTIONS = {'extract_content', 'get_dropdown_options', 'wait'}
+
+
+class FastPathCompileError(ValueError):
+    """Raised when a history contains steps that cannot be replayed deterministically"""
+
+
+class FastPathStepError(RuntimeError):
+    """Raised when a replayed step does not behave as it did in the recorded run"""
+
+
+def fast_path_file(test_class: Type, param_id: Optional[str] = None) -> Path:
+    """Location of the compiled replay script, next to the test's module (one per data row)"""
+    test_file = Path(inspect.getfile(test_class))
+    suffix = '_' + re.sub(r'\W+', '_', param_id) if param_id is not None else ''
+    return test_file.parent / f"fastpath_{test_file.stem}_{test_class.__name__}{suffix}.py"
+
+
+def load_fast_path(test_class: Type, param_id: Optional[str] = None) -> Optional[ModuleType]:
+    """Import the compiled replay script for a test, if one exists"""
+    script_path = fast_path_file(test_class, param_id)
+    if not script_path.exists():
+        return None
+    spec = importlib.util.spec_from_file_location(script_path.stem, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def save_fast_path(test_class: Type, history: Dict[str, Any], credentials: Optional[Dict[str, str]] = None,
+                   param_id: Optional[str] = None) -> Path:
+    """Compile a passing history and write the replay script next to the test"""
+    script_path = fast_path_file(test_class, param_id)
+    source = FastPathCompiler(credentials).compile(history, test_class.__name__)
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return script_path
+
+
+class FastPathCompiler:
+    """Turns a passing agent history into a deterministic Playwright script"""
+
+    def __init__(self, credentials: Optional[Dict[str, str]] = None):
+        # Typed credentials are emitted as lookups so secrets never land in the script
+        self.secrets = {value: key for key, value in (credentials or {}).items() if value}
+
+    def compile(self, history: Dict[str, Any], test_name: str) -> str:
+        steps = history.get('history', [])
+        if not steps or not self._is_done(steps[-1]):
+            raise FastPathCompileError(f"History for {test_name} did not finish with a done action")
+
+        body: List[str] = []
+        expected: Optional[Dict[str, Any]] = None
+        for step_number, step in enumerate(steps, start=1):
+            model_output = step.get('model_output') or {}
+            actions = model_output.get('action') or []
+            elements = (step.get('state') or {}).get('interacted_element') or []
+            results = step.get('result') or []
+
+            lines = []
+            for i, action in enumerate(actions):
+                # Actions that failed or never ran during recording are not replayed
+                if i >= len(results) or results[i].get('error') or self._was_skipped(results[i]):
+                    continue
+                name, params = next(iter(action.items()))
+                element = elements[i] if i < len(elements) else None
+                if name == 'done':
+                    unverified = _unverifiable_leaves(params)
+                    if unverified:
+                        # The replay returns the recorded result, so every value must be re-checked on the page
+                        raise FastPathCompileError(
+                            f"Result for {test_name} has values that cannot be checked on the page: {unverified!r}")
+                    expected = params
+                    lines.extend(self._emit_done(params))
+                else:
+                    lines.extend(self._emit_action(name, params or {}, element))
+            if lines:
+                body.append(f"    # Step {step_number}: {(step.get('state') or {}).get('url', '')}")
+                body.extend(lines)
+
+        if expected is None:
+            raise FastPathCompileError(f"History for {test_name} has no successful done action")
+
+        header = [
+            f'"""Fast-path replay for {test_name}.',
+            '',
+            f'Compiled from a passing agent run on {datetime.now().isoformat(timespec="seconds")}.',
+            'Generated by core/fast_path.py - recompile instead of editing by hand.',
+            '"""',
+            'from core import fast_path as fp',
+            '',
+            f'EXPECTED_RESULT = {expected!r}',
+            '',
+            '',
+            'async def replay(page, credentials):',
+        ]
+        footer = ['    return EXPECTED_RESULT', '']
+        return '\n'.join(header + body + footer)
+
+    def _emit_action(self, name: str, params: Dict[str, Any], element: Optional[Dict[str, Any]]) -> List[str]:
+        if name in PASSIVE_ACTIONS:
+            return [f"    # {name} skipped: {params!r}"]
+        if name == 'go_to_url':
+            return [f"    await fp.goto(page, {params['url']!r})"]
+        if name == 'search_google':
+            return [f"    await fp.goto(page, {'https://www.google.com/search?q=' + params['query'] + '&udm=14'!r})"]
+        if name == 'open_tab':
+            return [f"    page = await fp.open_tab(page, {params['url']!r})"]
+        if name == 'switch_tab':
+            return [f"    page = await fp.switch_tab(page, {params['page_id']!r})"]
+        if name == 'go_back':
+            return ["    await page.go_back()"]
+        if name == 'send_keys':
+            return [f"    await page.keyboard.press({params['keys']!r})"]
+        if name in ('scroll_down', 'scroll_up'):
+            sign = '' if name == 'scroll_down' else '-'
+            amount = params.get('amount')
+            distance = repr(amount) if amount else 'window.innerHeight'
+            return [f"    await page.evaluate('window.scrollBy(0, {sign}{distance})')"]
+        if name == 'scroll_to_text':
+            return [f"    await page.get_by_text({params['text']!r}).first.scroll_into_view_if_needed()"]
+        if name in SHARED_ACTIONS_BY_NAME:
+            # Shared custom actions are deterministic, so they replay as-is
+            return [f"    await fp.shared_action(page, {name!r}, {self._value_expr(params)})"]
+
+        locator = self._locator_args(name, element)
+        if name == 'click_element':
+            return [f"    await fp.click(page, {locator})"]
+        if name == 'input_text':
+            return [f"    await fp.fill(page, {locator}, text={self._text_expr(params['text'])})"]
+        if name == 'select_dropdown_option':
+            return [f"    await fp.select_option(page, {locator}, label={params['text']!r})"]
+        raise FastPathCompileError(f"Action '{name}' cannot be replayed without the agent")
+
+    def _emit_done(self, params: Dict[str, Any]) -> List[str]:
+        lines = ["    # Recorded result must still be visible on the page"]
+        for text in _string_leaves(params):
+            lines.append(f"    await fp.expect_text(page, {text!r})")
+        return lines
+
+    def _locator_args(self, name: str, element: Optional[Dict[str, Any]]) -> str:
+        if not element:
+            raise FastPathCompileError(f"Action '{name}' has no recorded target element")
+        return f"css={element.get('css_selector')!r}, xpath={element.get('xpath')!r}"
+
+    def _text_expr(self, text: str) -> str:
+        if text in self.secrets:
+            return f"credentials[{self.secrets[text]!r}]"
+        return repr(text)
+
+    def _value_expr(self, value: Any) -> str:
+        """Python expression for action params, with credentials looked up rather than inlined"""
+        if isinstance(value, str):
+            return self._text_expr(value)
+        if isinstance(value, dict):
+            return '{' + ', '.join(f"{key!r}: {self._value_expr(item)}" for key, item in value.items()) + '}'
+        if isinstance(value, list):
+            return '[' + ', '.join(self._value_expr(item) for item in value) + ']'
+        return repr(value)
+
+    @staticmethod
+    def _is_done(step: Dict[str, Any]) -> bool:
+        results = step.get('result') or []
+        return bool(results) and bool(results[-1].get('is_done'))
+
+    @staticmethod
+    def _was_skipped(result: Dict[str, Any]) -> bool:
+        return (result.get('extracted_content') or '').startswith('Something new appeared after action')
+
+
+def _string_leaves(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, dict):
+        return [leaf for v in value.values() for leaf in _string_leaves(v)]
+    if isinstance(value, list):
+        return [leaf for v in value for leaf in _string_leaves(v)]
+    return []
+
+
+def _unverifiable_leaves(value: Any) -> List[Any]:
+    """Numbers, booleans and other non-string values, which expect_text cannot re-check"""
+    if isinstance(value, dict):
+        return [leaf for v in value.values() for leaf in _unverifiable_leaves(v)]
+    if isinstance(value, list):
+        return [leaf for v in value for leaf in _unverifiable_leaves(v)]
+    if value is None or isinstance(value, str):
+        return []
+    return [value]
+
+
+# Runtime helpers used by compiled scripts
+
+def _timeout() -> int:
+    return Config.FAST_PATH_STEP_TIMEOUT * 1000
+
+
+async def goto(page, url: str):
+    await page.goto(url, wait_until='load', timeout=_timeout())
+
+
+async def open_tab(page, url: str):
+    new_page = await page.context.new_page()
+    await goto(new_page, url)
+    return new_page
+
+
+async def switch_tab(page, page_id: int):
+    target = page.context.pages[page_id]
+    await target.bring_to_front()
+    return target
+
+
+async def _locate(page, css: Optional[str], xpath: Optional[str]):
+    for selector in (css, f"xpath=/{xpath}" if xpath else None):
+        if not selector:
+            continue
+        locator = page.locator(selector).first
+        try:
+            await locator.wait_for(state='attached', timeout=_timeout())
+            return locator
+        except Exception:
+            continue
+    raise FastPathStepError(f"Element not found (css={css!r}, xpath={xpath!r}) on {page.url}")
+
+
+async def click(page, css: Optional[str] = None, xpath: Optional[str] = None):
+    locator = await _locate(page, css, xpath)
+    await locator.click(timeout=_timeout())
+    await page.wait_for_load_state('load', timeout=_timeout())
+
+
+async def fill(page, css: Optional[str] = None, xpath: Optional[str] = None, text: str = ''):
+    locator = await _locate(page, css, xpath)
+    await locator.fill(text, timeout=_timeout())
+
+
+async def select_option(page, css: Optional[str] = None, xpath: Optional[str] = None, label: str = ''):
+    locator = await _locate(page, css, xpath)
+    await locator.select_option(label=label, timeout=_timeout())
+
+
+async def expect_text(page, text: str):
+    content = await page.title() + '\n' + await page.inner_text('body', timeout=_timeout())
+    if _squash(text) not in _squash(content):
+        raise FastPathStepError(f"Expected text not found on {page.url}: {text[:80]!r}")
+
+
+async def shared_action(page, name: str, params: Dict[str, Any]):
+    try:
+        await run_shared_action(page, name, params)
+    except Exception as e:
+        raise FastPathStepError(f"{name} failed on {page.url}: {e}") from e
+
+
+def _squash(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+if __name__ == "__main__":
+    # Usage: python -m core.fast_path <module>:<TestClass>[<param_id>] <history.jsonl|history.json>
+    if len(sys.argv) != 3:
+        print("Usage: python -m core.fast_path <module>:<TestClass>[<param_id>] <history.jsonl|history.json>")
+        sys.exit(2)
+    module_name, class_spec = sys.argv[1].split(':')
+    class_name, _, row_id = class_spec.rstrip(']').partition('[')
+    test_class = getattr(importlib.import_module(module_name), class_name)
+    recorded = load_history(Path(sys.argv[2]))
+    env_credentials = {'username': os.getenv('TEST_USERNAME', ''), 'password': os.getenv('TEST_PASSWORD', '')}
+    script_path = save_fast_path(test_class, recorded, env_credentials, row_id or None)
+    print(f"⚡ Fast path written to {script_path}")
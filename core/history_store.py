@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.config import Config
+
+
+class ArtifactStore:
+    """Content-addressed blob directory; each distinct payload is written once"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or Config.get_artifact_dir()
+
+    def put(self, data: bytes, extension: str = 'bin') -> str:
+        """Store bytes and return their reference, relative to the store root"""
+        digest = hashlib.sha256(data).hexdigest()
+        ref = f"blobs/{digest[:2]}/{digest}.{extension}"
+        path = self.root / ref
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        with open(self.root / ref, 'rb') as f:
+            return f.read()
+
+    def path(self, ref: str) -> Path:
+        return self.root / ref
+
+
+class HistoryWriter:
+    """Streams agent history steps to a JSONL file as they finish.
+
+    Screenshots are moved out of each step into the artifact store and the
+    step keeps only a ``screenshot_ref``.
+    """
+
+    def __init__(self, test_name: str, store: Optional[ArtifactStore] = None):
+        self.store = store or ArtifactStore()
+        self.path = history_file(test_name)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._written = 0
+
+    def sync(self, history) -> int:
+        """Append any steps of an AgentHistoryList not yet on disk"""
+        items = history.history
+        for item in items[self._written:]:
+            self.append(item.model_dump())
+            # The agent never reads past screenshots again; drop them from memory
+            item.state.screenshot = None
+        self._written = len(items)
+        return self._written
+
+    def append(self, step: Dict[str, Any]):
+        self._file.write(json.dumps(externalize_step(step, self.store)) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def history_file(test_name: str) -> Path:
+    return Config.get_history_dir() / f"{test_name}.jsonl"
+
+
+def externalize_step(step: Dict[str, Any], store: ArtifactStore) -> Dict[str, Any]:
+    """Replace an inline base64 screenshot with a reference into the store"""
+    state = step.get('state') or {}
+    screenshot = state.get('screenshot')
+    if screenshot:
+        state = dict(state, screenshot=None, screenshot_ref=store.put(base64.b64decode(screenshot), 'png'))
+        step = dict(step, state=state)
+    return step
+
+
+def iter_history(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield steps from a JSONL history, or from a legacy history_<Test>.json file"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f).get('history', [])
+
+
+def load_history(path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Load a history in the ``{'history': [...]}`` shape written by browser-use"""
+    return {'history': list(iter_history(path))}
+
+
+def migrate_legacy_histories(source_dir: Path, store: Optional[ArtifactStore] = None) -> List[Path]:
+    """Convert history_<Test>.json files into JSONL histories with external screenshots"""
+    store = store or ArtifactStore()
+    migrated = []
+    for legacy_path in sorted(Path(source_dir).glob('history_*.json')):
+        target = history_file(legacy_path.stem[len('history_'):])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            for step in iter_history(legacy_path):
+                f.write(json.dumps(externalize_step(step, store)) + '\n')
+        migrated.append(target)
+    return migrated
+
+
+if __name__ == "__main__":
+    # Usage: python -m core.history_store migrate [source_dir]
+    if len(sys.argv) < 2 or sys.argv[1] != 'migrate':
+        print("Usage: python -m core.history_store migrate [source_dir]")
+        sys.exit(2)
+    source = Path(sys.argv[2]) if len(sys.argv) > 2 else Path('.')
+    for migrated_path in migrate_legacy_histories(source):
+        print(f"📦 Migrated {migrated_path}")
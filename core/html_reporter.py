@@ -55,7 +55,8 @@ class HTMLReporter:
         return str(report_file)
 
     def _find_latest_screenshot(self, test_name: str) -> Optional[str]:
-        screenshot_files = list(Config.get_screenshot_dir().glob(f"failure_{test_name}_*.png"))
+        screenshot_files = [path for path in Config.get_screenshot_dir().glob(f"failure_{test_name}_*.*")
+                            if not path.stem.endswith('_thumb')]
         if screenshot_files:
             return str(max(screenshot_files, key=lambda f: f.stat().st_ctime))
         return None
\ No newline at end of file
@@ -0,0 +1,118 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Tuple
+
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789.eE+-'
+
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed body is not a JSON object of the expected shape"""
+
+
+class _StreamBuffer:
+    """Decoded text of a byte stream, read on demand and trimmed as it is consumed"""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk; False once the stream is exhausted"""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.text = self.text[self.pos:] + self._utf8.decode(b'', final=True)
+            self.pos = 0
+            return False
+        # Only the unconsumed tail is kept, so memory is bounded by one value plus one chunk
+        self.text = self.text[self.pos:] + self._utf8.decode(chunk)
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character without consuming it; '' at end of stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ''
+
+    async def expect(self, allowed: str) -> str:
+        char = await self.peek()
+        if not char or char not in allowed:
+            raise JSONStreamError(f"Expected one of {allowed!r}, found {char or 'end of body'!r}")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                # Usually the value continues in the next chunk
+                if await self.fill():
+                    continue
+                raise JSONStreamError(f"Invalid JSON: {e}") from e
+            # A number is only complete once a character that cannot extend it has arrived
+            if self._number_may_continue(value, end) and await self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def _number_may_continue(self, value: Any, end: int) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return end == len(self.text) or self.text[end] in NUMBER_CHARS
+
+
+async def iter_json_members(chunks: AsyncIterable[bytes],
+                            stream_keys: Iterable[str] = ()) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield ``(key, value)`` for each member of a top-level JSON object as it downloads.
+
+    Members named in ``stream_keys`` must be arrays; for those, ``(key, element)``
+    is yielded once per element so only one element is in memory at a time.
+    """
+    stream_keys = set(stream_keys)
+    buffer = _StreamBuffer(chunks)
+
+    await buffer.expect('{')
+    if await buffer.peek() == '}':
+        buffer.pos += 1
+        return
+
+    while True:
+        key = await buffer.value()
+        if not isinstance(key, str):
+            raise JSONStreamError(f"Expected an object key, found {key!r}")
+        await buffer.expect(':')
+
+        if key in stream_keys:
+            await buffer.expect('[')
+            if await buffer.peek() == ']':
+                buffer.pos += 1
+            else:
+                while True:
+                    yield key, await buffer.value()
+                    if await buffer.expect(',]') == ']':
+                        break
+        else:
+            yield key, await buffer.value()
+
+        if await buffer.expect(',}') == '}':
+            break
+
+    if await buffer.peek():
+        raise JSONStreamError("Unexpected data after the JSON object")
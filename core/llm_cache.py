@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.messages import convert_to_messages, message_to_dict, messages_from_dict
+from pydantic import BaseModel
+from core.config import Config
+from core.llm_proxy import LLMProxy
+
+# Prompt fragments that change between otherwise identical runs
+VOLATILE_PATTERNS = [
+    re.compile(r'Current date and time: \d{4}-\d{2}-\d{2} \d{2}:\d{2}'),
+]
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+class RecordReplayLLM(LLMProxy):
+    """Records model responses to disk and answers from them on replay.
+
+    Modes:
+        record: call the live model and store every request/response pair
+        replay: answer from the cache; on a miss either fail or fall through
+                to the live model (and record the answer), per ``miss_policy``
+    """
+
+    MODES = ('record', 'replay')
+    MISS_POLICIES = ('fail', 'live')
+
+    def __init__(self, llm, mode: str = 'replay',
+                 cache_dir: Optional[Path] = None,
+                 miss_policy: str = Config.LLM_CACHE_MISS_POLICY):
+        super().__init__(llm)
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {self.MODES})")
+        if miss_policy not in self.MISS_POLICIES:
+            raise ValueError(f"Unknown LLM cache miss policy: {miss_policy} (expected one of {self.MISS_POLICIES})")
+        self.mode = mode
+        self.miss_policy = miss_policy
+        self.cache_dir = cache_dir or Config.get_llm_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def _invoke(self, runnable, messages, schema, options, **kwargs):
+        key = self.cache_key(messages, schema, options)
+        cached = self._lookup(key, schema, options)
+        if cached is not None:
+            return cached
+        response = runnable.invoke(messages, **kwargs)
+        self._store(key, response, schema, options)
+        return response
+
+    async def _ainvoke(self, runnable, messages, schema, options, **kwargs):
+        key = self.cache_key(messages, schema, options)
+        cached = self._lookup(key, schema, options)
+        if cached is not None:
+            return cached
+        response = await runnable.ainvoke(messages, **kwargs)
+        self._store(key, response, schema, options)
+        return response
+
+    def cache_key(self, messages, schema: Optional[Type], options: Dict[str, Any]) -> str:
+        """Stable hash of the normalized messages, output schema and call options"""
+        payload = {
+            'messages': self._normalize_messages(messages),
+            'schema': self._schema_signature(schema),
+            'options': {k: v for k, v in sorted(options.items()) if isinstance(v, (str, int, float, bool))},
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _lookup(self, key: str, schema: Optional[Type], options: Dict[str, Any]):
+        if self.mode == 'record':
+            return None
+
+        path = self._entry_path(key)
+        if path.exists():
+            self.hits += 1
+            with open(path, 'r', encoding='utf-8') as f:
+                return self._decode(json.load(f), schema, options)
+
+        self.misses += 1
+        if self.miss_policy == 'fail':
+            raise LLMCacheMiss(f"No recorded LLM response for request {key[:12]} in {self.cache_dir}")
+        return None
+
+    def _store(self, key: str, response: Any, schema: Optional[Type], options: Dict[str, Any]):
+        entry = {'key': key, 'recorded_at': time.time(), **self._encode(response, schema, options)}
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _encode(response: Any, schema: Optional[Type], options: Dict[str, Any]) -> Dict[str, Any]:
+        if schema is None:
+            return {'raw': message_to_dict(response)}
+        if not options.get('include_raw'):
+            return {'parsed': RecordReplayLLM._dump_parsed(response)}
+        error = response.get('parsing_error')
+        return {
+            'raw': message_to_dict(response['raw']) if response.get('raw') is not None else None,
+            'parsed': RecordReplayLLM._dump_parsed(response.get('parsed')),
+            'parsing_error': str(error) if error else None,
+        }
+
+    @staticmethod
+    def _decode(entry: Dict[str, Any], schema: Optional[Type], options: Dict[str, Any]) -> Any:
+        raw = messages_from_dict([entry['raw']])[0] if entry.get('raw') else None
+        if schema is None:
+            return raw
+
+        parsed = entry.get('parsed')
+        if parsed is not None and isinstance(schema, type) and issubclass(schema, BaseModel):
+            parsed = schema.model_validate(parsed)
+        if not options.get('include_raw'):
+            return parsed
+        error = entry.get('parsing_error')
+        return {'raw': raw, 'parsed': parsed, 'parsing_error': ValueError(error) if error else None}
+
+    @staticmethod
+    def _dump_parsed(parsed: Any) -> Any:
+        if isinstance(parsed, BaseModel):
+            return parsed.model_dump(mode='json')
+        return parsed
+
+    @staticmethod
+    def _normalize_messages(messages) -> List[Dict[str, Any]]:
+        normalized = []
+        for message in convert_to_messages(messages if isinstance(messages, list) else [messages]):
+            entry = {'type': message.type, 'content': RecordReplayLLM._normalize_content(message.content)}
+            tool_calls = getattr(message, 'tool_calls', None)
+            if tool_calls:
+                entry['tool_calls'] = [{'name': c['name'], 'args': c['args']} for c in tool_calls]
+            normalized.append(entry)
+        return normalized
+
+    @staticmethod
+    def _normalize_content(content: Any) -> Any:
+        if isinstance(content, str):
+            for pattern in VOLATILE_PATTERNS:
+                content = pattern.sub('', content)
+            return content.strip()
+        if isinstance(content, list):
+            parts = []
+            for part in content:
+                if isinstance(part, dict) and part.get('type') == 'image_url':
+                    url = part['image_url']['url'] if isinstance(part['image_url'], dict) else part['image_url']
+                    parts.append({'type': 'image_url', 'sha256': hashlib.sha256(url.encode('utf-8')).hexdigest()})
+                elif isinstance(part, dict) and 'text' in part:
+                    parts.append({'type': part.get('type', 'text'), 'text': RecordReplayLLM._normalize_content(part['text'])})
+                else:
+                    parts.append(RecordReplayLLM._normalize_content(part))
+            return parts
+        return content
+
+    @staticmethod
+    def _schema_signature(schema: Optional[Type]) -> Any:
+        if schema is None:
+            return None
+        if isinstance(schema, type) and issubclass(schema, BaseModel):
+            return schema.model_json_schema()
+        if isinstance(schema, dict):
+            return schema
+        return getattr(schema, '__name__', repr(schema))
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Type
+
+
+class LLMProxy:
+    """Base for wrappers that sit between the agent and a chat model.
+
+    browser-use talks to the model through ``invoke``/``ainvoke`` for plain
+    completions and ``with_structured_output(schema).ainvoke`` for agent
+    steps. Both paths are routed through ``_invoke``/``_ainvoke`` so
+    subclasses can intercept every model call in one place. Every other
+    attribute is forwarded to the wrapped model.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    def __getattr__(self, name: str):
+        if name == 'llm':
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def with_structured_output(self, schema: Type, **options):
+        return StructuredOutputCall(self, schema, options)
+
+    def invoke(self, messages, **kwargs):
+        return self._invoke(self.llm, messages, None, {}, **kwargs)
+
+    async def ainvoke(self, messages, **kwargs):
+        return await self._ainvoke(self.llm, messages, None, {}, **kwargs)
+
+    def _invoke(self, runnable, messages, schema: Optional[Type], options: Dict[str, Any], **kwargs):
+        return runnable.invoke(messages, **kwargs)
+
+    async def _ainvoke(self, runnable, messages, schema: Optional[Type], options: Dict[str, Any], **kwargs):
+        return await runnable.ainvoke(messages, **kwargs)
+
+
+class StructuredOutputCall:
+    """Structured-output runnable bound to an LLMProxy"""
+
+    def __init__(self, proxy: LLMProxy, schema: Type, options: Dict[str, Any]):
+        self.proxy = proxy
+        self.schema = schema
+        self.options = options
+        self.runnable = proxy.llm.with_structured_output(schema, **options)
+
+    def invoke(self, messages, **kwargs):
+        return self.proxy._invoke(self.runnable, messages, self.schema, self.options, **kwargs)
+
+    async def ainvoke(self, messages, **kwargs):
+        return await self.proxy._ainvoke(self.runnable, messages, self.schema, self.options, **kwargs)
+
+
+def unwrap(llm):
+    """The chat model at the bottom of a stack of proxies"""
+    while isinstance(llm, LLMProxy):
+        llm = llm.llm
+    return llm
+
+
+def attach_page_extraction_llm(agent, llm):
+    """Route the agent's page extraction through ``llm``, which may be a proxy.
+
+    Depends on browser-use 0.1.39 internals: ``AgentSettings.page_extraction_llm``
+    is typed as a langchain ``BaseChatModel`` and only validated when the Agent
+    is built, so the Agent is created with ``unwrap(llm)`` and the proxy is
+    swapped in afterwards. Recheck on browser-use upgrades.
+    """
+    settings = getattr(agent, 'settings', None)
+    if settings is None or not hasattr(settings, 'page_extraction_llm'):
+        raise RuntimeError("Unsupported browser-use version: Agent has no settings.page_extraction_llm")
+    settings.page_extraction_llm = llm
@@ -0,0 +1,201 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import SecretStr
+from core.config import Config
+from core.llm_proxy import LLMProxy
+
+# Provider errors worth retrying: rate limits and transient server failures
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'RateLimitError', 'ServiceUnavailable',
+                    'InternalServerError', 'DeadlineExceeded'}
+# Immediate retries for synchronous calls, which cannot back off without blocking the event loop
+SYNC_RETRIES = 2
+
+
+class TokenBucket:
+    """Refilling budget of units per minute (requests or tokens).
+
+    Waiters are served one at a time in arrival order, so concurrent tests
+    take turns instead of racing for the next refill.
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    async def acquire(self, amount: float = 1):
+        if not self.per_minute:
+            return
+        async with self._get_lock():
+            while True:
+                self._refill()
+                # A single request larger than the bucket only waits for a full bucket
+                needed = min(amount, self.capacity)
+                if self.available >= needed:
+                    self.available -= amount
+                    return
+                await asyncio.sleep((needed - self.available) * 60 / self.per_minute)
+
+    def debit(self, amount: float):
+        """Charge usage without waiting; the balance may go negative"""
+        if self.per_minute:
+            self._refill()
+            self.available -= amount
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        # The registry outlives event loops (e.g. benchmarks call asyncio.run repeatedly)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+
+class RateLimitedLLM(LLMProxy):
+    """Shared client that keeps a model under its RPM/TPM quota and retries 429/5xx.
+
+    Async calls back off with jitter between attempts; synchronous calls
+    retry up to ``SYNC_RETRIES`` times without waiting.
+    """
+
+    def __init__(self, llm,
+                 requests_per_minute: int = Config.LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = Config.LLM_TOKENS_PER_MINUTE,
+                 max_retries: int = Config.LLM_MAX_RETRIES):
+        super().__init__(llm)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        # Attempts made and attempts retried, read by the concurrency controller
+        self.calls = 0
+        self.retries = 0
+
+    async def _ainvoke(self, runnable, messages, schema, options, **kwargs):
+        estimate = estimate_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimate)
+            self.calls += 1
+            try:
+                response = await runnable.ainvoke(messages, **kwargs)
+                self._reconcile(response, estimate)
+                return response
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = backoff_delay(attempt)
+                print(f"⏳ LLM call failed ({type(e).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _invoke(self, runnable, messages, schema, options, **kwargs):
+        # Synchronous calls (page extraction) run on the event loop thread, so they must not wait:
+        # they are charged to the buckets and retried straight away instead of sleeping through a backoff
+        estimate = estimate_tokens(messages)
+        retries = min(SYNC_RETRIES, self.max_retries)
+        for attempt in range(retries + 1):
+            self.requests.debit(1)
+            self.tokens.debit(estimate)
+            self.calls += 1
+            try:
+                response = runnable.invoke(messages, **kwargs)
+                self._reconcile(response, estimate)
+                return response
+            except Exception as e:
+                if attempt >= retries or not is_retryable(e):
+                    raise
+                self.retries += 1
+                print(f"⏳ LLM call failed ({type(e).__name__}), retry {attempt + 1}/{retries} without waiting")
+
+    def _reconcile(self, response: Any, estimate: int):
+        """Correct the token bucket once the provider reports actual usage"""
+        actual = usage_tokens(response)
+        if actual:
+            self.tokens.debit(actual - estimate)
+
+
+class LLMRegistry:
+    """Process-wide LLM clients, one per model, shared by every test"""
+
+    _clients: Dict[str, Any] = {}
+
+    @classmethod
+    def get(cls, model: str = Config.GEMINI_MODEL):
+        if model not in cls._clients:
+            cls._clients[model] = cls._create(model)
+        return cls._clients[model]
+
+    @classmethod
+    def clients(cls) -> List[Any]:
+        return list(cls._clients.values())
+
+    @classmethod
+    def clear(cls):
+        cls._clients.clear()
+
+    @staticmethod
+    def _create(model: str):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        os.environ["GEMINI_API_KEY"] = Config.get_gemini_api_key()
+        llm = RateLimitedLLM(ChatGoogleGenerativeAI(
+            model=model,
+            api_key=SecretStr(os.environ["GEMINI_API_KEY"]),
+            max_retries=1  # retries are handled by RateLimitedLLM so they respect the shared quota
+        ))
+        if Config.LLM_CACHE_MODE != 'off':
+            from core.llm_cache import RecordReplayLLM
+            # Replayed answers are served before the rate limiter and cost no quota
+            llm = RecordReplayLLM(llm, mode=Config.LLM_CACHE_MODE)
+        return llm
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a provider error is transient, judged by its type or HTTP status, never its message"""
+    status = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    if isinstance(status, int) and status in RETRYABLE_STATUS:
+        return True
+    for cause in (error, error.__cause__):
+        if cause is not None and type(cause).__name__ in RETRYABLE_ERRORS:
+            return True
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    ceiling = min(Config.LLM_BACKOFF_MAX, Config.LLM_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def estimate_tokens(messages) -> int:
+    """Rough pre-call token estimate (~4 characters per token)"""
+    if isinstance(messages, str):
+        return max(1, len(messages) // 4)
+    chars = 0
+    for message in messages:
+        content = getattr(message, 'content', message)
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') if isinstance(part, dict) else str(part) for part in content)
+        chars += len(str(content))
+    return max(1, chars // 4)
+
+
+def usage_tokens(response: Any) -> int:
+    """Total tokens reported by the provider, or 0 when not available"""
+    if isinstance(response, dict):
+        response = response.get('raw')
+    usage = getattr(response, 'usage_metadata', None) or {}
+    return usage.get('total_tokens', 0)
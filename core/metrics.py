@@ -0,0 +1,171 @@
+import heapq
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.resource_policy import BlockedRequestStats
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TestMetrics:
+    """Phase and per-step timings for a single test run.
+
+    Each agent step is split into time spent capturing browser state,
+    waiting for the model and executing actions; whatever is left over is
+    framework overhead.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.steps: List[Dict[str, Any]] = []
+        self._current_step: Optional[Dict[str, Any]] = None
+        self.blocked = BlockedRequestStats()
+        # Custom controller actions used: {name: {'calls': n, 'steps_saved': n}}
+        self.custom_actions: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - start, 3)
+
+    def instrument_agent(self, agent):
+        """Wrap the agent's step and its model/browser calls with timers"""
+        self._wrap_step(agent)
+        self._wrap(agent, 'get_next_action', 'llm')
+        self._wrap(agent, 'multi_act', 'action_exec')
+        self._wrap(agent.browser_context, 'get_state', 'browser_state')
+
+    def note_step(self, state, model_output, input_tokens: Optional[int]):
+        """Record what the model decided in the current step (called from the new-step callback)"""
+        if self._current_step is None:
+            return
+        self._current_step['url'] = getattr(state, 'url', None)
+        self._current_step['input_tokens'] = input_tokens
+        if model_output is not None:
+            self._current_step['actions'] = [
+                next(iter(action.model_dump(exclude_unset=True)), 'unknown') for action in model_output.action
+            ]
+
+    def note_custom_action(self, name: str, steps_saved: int):
+        """Count a successful custom controller action and the agent steps it stood in for"""
+        usage = self.custom_actions.setdefault(name, {'calls': 0, 'steps_saved': 0})
+        usage['calls'] += 1
+        usage['steps_saved'] += max(0, steps_saved)
+
+    def last_position(self) -> Tuple[Optional[int], Optional[str]]:
+        """Number of the latest agent step and the last URL it reported"""
+        steps = self.steps + ([self._current_step] if self._current_step else [])
+        if not steps:
+            return None, None
+        url = next((step['url'] for step in reversed(steps) if step.get('url')), None)
+        return steps[-1]['step'], url
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = [step['duration'] for step in self.steps]
+        return {
+            'phases': self.phases,
+            'step_count': len(self.steps),
+            'step_latency': {
+                'p50': round(percentile(durations, 50), 3),
+                'p95': round(percentile(durations, 95), 3),
+                'max': round(max(durations, default=0.0), 3),
+            },
+            'total_tokens': sum(step.get('input_tokens') or 0 for step in self.steps),
+            'slowest_steps': sorted(self.steps, key=lambda step: step['duration'], reverse=True)[:3],
+            'steps': self.steps,
+            'network': self.blocked.to_dict(),
+            'custom_actions': self.custom_actions,
+            'steps_saved': sum(usage['steps_saved'] for usage in self.custom_actions.values()),
+        }
+
+    def _wrap_step(self, agent):
+        original = agent.step
+
+        async def timed_step(*args, **kwargs):
+            self._current_step = {'step': len(self.steps) + 1, 'llm': 0.0, 'browser_state': 0.0, 'action_exec': 0.0,
+                                  'input_tokens': None, 'url': None, 'actions': []}
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                step = self._current_step
+                step['duration'] = round(time.perf_counter() - start, 3)
+                accounted = step['llm'] + step['browser_state'] + step['action_exec']
+                step['overhead'] = round(max(0.0, step['duration'] - accounted), 3)
+                for key in ('llm', 'browser_state', 'action_exec'):
+                    step[key] = round(step[key], 3)
+                self.steps.append(step)
+                self._current_step = None
+
+        agent.step = timed_step
+
+    def _wrap(self, target, method_name: str, key: str):
+        original = getattr(target, method_name)
+
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                if self._current_step is not None:
+                    self._current_step[key] += time.perf_counter() - start
+
+        setattr(target, method_name, timed)
+
+
+def summarize_performance(details: Iterable[Dict[str, Any]], slowest_count: int = 5) -> Dict[str, Any]:
+    """Aggregate per-test metrics from report details into run-level numbers in a single pass"""
+    step_durations = []
+    slowest = []  # min-heap holding the slowest steps seen so far
+    total_tokens = 0
+    blocked_requests = 0
+    blocked_bytes = 0
+    phases: Dict[str, float] = {}
+    custom_actions: Dict[str, Dict[str, int]] = {}
+    for test in details:
+        metrics = test.get('metrics')
+        if not metrics:
+            continue
+        total_tokens += metrics.get('total_tokens', 0)
+        network = metrics.get('network') or {}
+        blocked_requests += network.get('blocked_requests', 0)
+        blocked_bytes += network.get('estimated_bytes_saved', 0)
+        for name, seconds in metrics.get('phases', {}).items():
+            phases[name] = round(phases.get(name, 0.0) + seconds, 3)
+        for name, usage in (metrics.get('custom_actions') or {}).items():
+            total = custom_actions.setdefault(name, {'calls': 0, 'steps_saved': 0})
+            total['calls'] += usage['calls']
+            total['steps_saved'] += usage['steps_saved']
+        for step in metrics.get('steps', []):
+            step_durations.append(step['duration'])
+            entry = (step['duration'], len(step_durations), dict(step, test_name=test['test_name']))
+            if len(slowest) < slowest_count:
+                heapq.heappush(slowest, entry)
+            elif entry[0] > slowest[0][0]:
+                heapq.heapreplace(slowest, entry)
+    return {
+        'step_latency': {
+            'p50': round(percentile(step_durations, 50), 3),
+            'p95': round(percentile(step_durations, 95), 3),
+        },
+        'total_steps': len(step_durations),
+        'total_tokens': total_tokens,
+        'phase_totals': phases,
+        'blocked_requests': blocked_requests,
+        'estimated_bytes_saved': blocked_bytes,
+        'custom_actions': custom_actions,
+        'steps_saved': sum(usage['steps_saved'] for usage in custom_actions.values()),
+        'slowest_steps': [step for _, _, step in sorted(slowest, reverse=True)],
+    }
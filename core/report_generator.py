@@ -1,20 +1,39 @@
+import html
 import json
+import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, TextIO
 from core.config import Config
+from core.metrics import summarize_performance
 from pydantic import BaseModel
 
 
 class TestReport:
-    def __init__(self):
+    """Test results, journaled to JSONL as each test finishes.
+
+    Every result is appended and fsynced to ``journal_path`` immediately, so a
+    crash or Ctrl-C loses at most the tests still running. Only summary
+    counters stay in memory; the JSON and HTML reports are written by
+    streaming over the journal. ``resume=True`` reloads an existing journal
+    and keeps appending to it, with ``completed`` naming the tests to skip.
+    """
+
+    def __init__(self, journal_path: Optional[Path] = None, resume: bool = False):
+        self.journal_path = Path(journal_path) if journal_path else Config.get_journal_path()
+        self.sources = [self.journal_path]
         self.results = {
             "timestamp": datetime.now().isoformat(),
-            "summary": {"total": 0, "passed": 0, "failed": 0},
-            "details": []
+            "summary": {"total": 0, "passed": 0, "failed": 0, "flaky": 0, "timeouts": 0, "over_budget": 0}
         }
+        self.completed: Set[str] = set()
         self.test_timers = {}
+        self._journal: Optional[TextIO] = None
+        self._resume = resume and self.journal_path.exists()
+        if self._resume:
+            self._load_sources()
+            print(f"⏭️ Resuming {self.journal_path}: {len(self.completed)} tests already recorded")
 
     def start_timer(self, test_name: str):
         """Start a timer for a test."""
@@ -28,37 +47,141 @@ class TestReport:
             return duration
         return 0.0
 
-    def add_success(self, test_name: str, result: Any):
-        """Record a successful test result."""
+    def add_success(self, test_name: str, result: Any, metrics: Optional[Dict[str, Any]] = None,
+                    attempts: Optional[List[Dict[str, Any]]] = None):
+        """Record a successful test result; earlier failed attempts mark it flaky."""
         duration = self.stop_timer(test_name)
-        self.results["summary"]["total"] += 1
-        self.results["summary"]["passed"] += 1
 
         # Convert Pydantic model to dictionary if applicable
         result_data = result.dict() if isinstance(result, BaseModel) else result
 
-        self.results["details"].append({
+        detail = {
             "test_name": test_name,
             "status": "passed",
             "result": result_data,
-            "duration": round(duration, 2)
-        })
+            "duration": round(duration, 2),
+            "metrics": metrics
+        }
+        if attempts:
+            detail["flaky"] = True
+            detail["attempts"] = self._attempts(attempts, {"status": "passed", "duration": round(duration, 2)})
+        self._record(detail)
 
-    def add_failure(self, test_name: str, error: str):
+    def add_failure(self, test_name: str, error: str, metrics: Optional[Dict[str, Any]] = None,
+                    attempts: Optional[List[Dict[str, Any]]] = None,
+                    screenshot: Optional[Dict[str, Optional[str]]] = None,
+                    timeout: Optional[Dict[str, Any]] = None, budget: Optional[Dict[str, Any]] = None):
         """Record a failed test result."""
         duration = self.stop_timer(test_name)
-        self.results["summary"]["total"] += 1
-        self.results["summary"]["failed"] += 1
 
-        self.results["details"].append({
+        detail = {
             "test_name": test_name,
             "status": "failed",
             "error": error,
-            "duration": round(duration, 2)
-        })
+            "duration": round(duration, 2),
+            "metrics": metrics
+        }
+        if attempts:
+            detail["attempts"] = self._attempts(attempts, {"status": "failed", "error": error,
+                                                           "duration": round(duration, 2)})
+        if screenshot:
+            detail["screenshot"] = screenshot
+        if timeout:
+            detail["timeout"] = timeout
+        if budget:
+            detail["budget"] = budget
+        self._record(detail)
+
+    def add_detail(self, detail: Dict[str, Any]):
+        """Record a result produced elsewhere, e.g. by a distributed worker."""
+        self._record(detail)
+
+    def add_attempt(self, test_name: str, error: str, error_class: Optional[str]) -> Dict[str, Any]:
+        """Close a failed attempt that will be retried; it is reported with the test's final result."""
+        duration = self.stop_timer(test_name)
+        return {"status": "failed", "error": error, "error_class": error_class, "duration": round(duration, 2)}
+
+    @staticmethod
+    def _attempts(previous: List[Dict[str, Any]], final: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [dict(attempt, attempt=number) for number, attempt in enumerate(previous + [final], start=1)]
+
+    def add_concurrency_decision(self, decision: Dict[str, Any]):
+        """Journal a change of the concurrency limit and the measurements behind it."""
+        journal = self._open_journal()
+        journal.write(json.dumps({"type": "concurrency", **decision}) + "\n")
+        journal.flush()
+
+    def iter_details(self) -> Iterator[Dict[str, Any]]:
+        """Stream recorded results from the journal(s), oldest first."""
+        for path in self.sources:
+            for entry in read_journal(path):
+                if "type" not in entry:
+                    yield entry
+
+    def iter_concurrency(self) -> Iterator[Dict[str, Any]]:
+        """Stream concurrency decisions from the journal(s)."""
+        for path in self.sources:
+            for entry in read_journal(path):
+                if entry.get("type") == "concurrency":
+                    yield {key: value for key, value in entry.items() if key != "type"}
+
+    def close(self):
+        """Close the journal; results already recorded stay on disk."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    @classmethod
+    def from_journals(cls, journal_paths: Sequence[Path]) -> "TestReport":
+        """Combine journals written by shards into one report."""
+        report = cls()
+        report.sources = [Path(path) for path in journal_paths]
+        report._load_sources()
+        return report
+
+    def _record(self, detail: Dict[str, Any]):
+        journal = self._open_journal()
+        journal.write(json.dumps(detail, default=self._json_serializer) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+        self._count(detail)
+
+    def _count(self, detail: Dict[str, Any]):
+        self.results["summary"]["total"] += 1
+        self.results["summary"]["passed" if detail["status"] == "passed" else "failed"] += 1
+        if detail.get("flaky"):
+            self.results["summary"]["flaky"] = self.results["summary"].get("flaky", 0) + 1
+        if detail.get("timeout"):
+            self.results["summary"]["timeouts"] = self.results["summary"].get("timeouts", 0) + 1
+        if detail.get("budget"):
+            self.results["summary"]["over_budget"] = self.results["summary"].get("over_budget", 0) + 1
+        self.completed.add(detail["test_name"])
+
+    def _open_journal(self) -> TextIO:
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            if self._resume:
+                _truncate_partial_line(self.journal_path)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            else:
+                self._journal = open(self.journal_path, "w", encoding="utf-8")
+                self._journal.write(json.dumps({"type": "run", "timestamp": self.results["timestamp"]}) + "\n")
+        return self._journal
+
+    def _load_sources(self):
+        timestamps = []
+        for path in self.sources:
+            for entry in read_journal(path):
+                if entry.get("type") == "run":
+                    timestamps.append(entry["timestamp"])
+                elif "type" not in entry:
+                    self._count(entry)
+        if timestamps:
+            self.results["timestamp"] = min(timestamps)
 
     def generate_report(self, format: str = "all") -> dict:
         """Generate reports in JSON and HTML formats with timestamped filenames."""
+        self.close()
         if self.results["summary"]["total"] == 0:
             print("⚠️ No test results to report")
             return self.results
@@ -67,6 +190,7 @@ class TestReport:
         total = self.results["summary"]["total"]
         passed = self.results["summary"]["passed"]
         self.results["summary"]["pass_rate"] = round((passed / total * 100), 2) if total > 0 else 0
+        self.results["summary"]["performance"] = summarize_performance(self.iter_details())
 
         # Generate timestamp for filenames (format: YYYYMMDD_HHMMSS)
         file_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -78,7 +202,7 @@ class TestReport:
             json_path = report_dir / f"test_report_{file_timestamp}.json"
             try:
                 with open(json_path, "w") as f:
-                    json.dump(self.results, f, indent=2, default=self._json_serializer)
+                    self._write_json(f)
                 print(f"📄 JSON report generated: {json_path}")
             except Exception as e:
                 print(f"❌ Failed to generate JSON report: {str(e)}")
@@ -87,20 +211,37 @@ class TestReport:
         if format in ("html", "all"):
             html_path = report_dir / f"test_report_{file_timestamp}.html"
             try:
-                html_content = self._generate_html_content()
                 with open(html_path, "w") as f:
-                    f.write(html_content)
+                    self._write_html(f)
                 print(f"📊 HTML report generated: {html_path}")
             except Exception as e:
                 print(f"❌ Failed to generate HTML report: {str(e)}")
 
         return self.results
 
-    def _generate_html_content(self) -> str:
-        """Generate HTML content for the report."""
+    def _write_json(self, f: TextIO):
+        """Write the JSON report one result at a time (same layout as json.dump with indent=2)."""
+        summary = json.dumps(self.results["summary"], indent=2, default=self._json_serializer)
+        f.write("{\n")
+        f.write(f'  "timestamp": {json.dumps(self.results["timestamp"])},\n')
+        f.write(f'  "summary": {summary.replace(chr(10), chr(10) + "  ")},\n')
+        decisions = list(self.iter_concurrency())
+        if decisions:
+            concurrency = json.dumps(decisions, indent=2)
+            f.write(f'  "concurrency": {concurrency.replace(chr(10), chr(10) + "  ")},\n')
+        f.write('  "details": [')
+        empty = True
+        for detail in self.iter_details():
+            f.write("\n    " if empty else ",\n    ")
+            f.write(json.dumps(detail, indent=2, default=self._json_serializer).replace("\n", "\n    "))
+            empty = False
+        f.write("]\n}" if empty else "\n  ]\n}")
+
+    def _write_html(self, f: TextIO):
+        """Write the HTML report one result at a time."""
         timestamp = datetime.fromisoformat(self.results["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
 
-        html_content = f"""
+        f.write(f"""
         <html>
         <head>
             <title>Test Report</title>
@@ -114,6 +255,8 @@ class TestReport:
                 .passed {{ color: green; }}
                 .failed {{ color: red; }}
                 pre {{ background: #eef; padding: 10px; border-radius: 5px; white-space: pre-wrap; word-wrap: break-word; }}
+                table {{ border-collapse: collapse; margin: 5px 0; font-size: 0.9em; }}
+                th, td {{ border: 1px solid #ccc; padding: 3px 8px; text-align: left; }}
             </style>
         </head>
         <body>
@@ -123,26 +266,135 @@ class TestReport:
                 <p><b>Total Tests:</b> {self.results["summary"]["total"]} | 
                    <b>Passed:</b> {self.results["summary"]["passed"]} | 
                    <b>Failed:</b> {self.results["summary"]["failed"]} | 
+                   <b>Flaky:</b> {self.results["summary"].get("flaky", 0)} | 
+                   <b>Timed out:</b> {self.results["summary"].get("timeouts", 0)} | 
+                   <b>Over budget:</b> {self.results["summary"].get("over_budget", 0)} | 
                    <b>Pass Rate:</b> {self.results["summary"].get("pass_rate", 0)}%</p>
+                {self._performance_html(self.results["summary"].get("performance"))}
+                {self._concurrency_html()}
             </div>
-        """
+        """)
 
-        for test in self.results["details"]:
+        for test in self.iter_details():
             status = test["status"]
             color = "green" if status == "passed" else "red"
+            if test.get("flaky"):
+                status, color = "passed (flaky)", "orange"
             duration = test["duration"]
             result_data = json.dumps(test.get("result", test.get("error", "")), indent=2)
 
-            html_content += f"""
+            f.write(f"""
             <details>
                 <summary>Test: {test["test_name"]} - <span style="color:{color};">{status}</span></summary>
                 <pre>Duration: {duration} seconds</pre>
+                {self._attempts_html(test.get("attempts"))}
+                {self._screenshot_html(test.get("screenshot"))}
+                {self._test_metrics_html(test.get("metrics"))}
                 <pre>{result_data}</pre>
             </details>
-            """
+            """)
+
+        f.write("</body></html>")
+
+    def _concurrency_html(self) -> str:
+        """Table of concurrency limit changes during the run."""
+        rows = "".join(
+            f"<tr><td>{d['elapsed']}s</td><td>{d['previous']} &rarr; {d['limit']}</td><td>{d['reason']}</td>"
+            f"<td>{d['cpu_pct']}%</td><td>{d['free_memory_pct']}%</td><td>{d['browser_rss_mb']} MB</td>"
+            f"<td>{d['llm_error_rate']:.0%}</td><td>{d['active']}/{d['waiting']}</td></tr>"
+            for d in self.iter_concurrency()
+        )
+        if not rows:
+            return ""
+        return f"""
+                <table>
+                    <tr><th>Concurrency</th><th>Limit</th><th>Reason</th><th>CPU</th><th>Free memory</th>
+                        <th>Browser RSS</th><th>LLM retries</th><th>Running/queued</th></tr>
+                    {rows}
+                </table>"""
+
+    def _attempts_html(self, attempts: Optional[List[Dict[str, Any]]]) -> str:
+        """Every attempt of a retried test."""
+        if not attempts:
+            return ""
+        lines = "\n".join(
+            f"Attempt {attempt['attempt']}: {attempt['status']} in {attempt['duration']}s"
+            + (f" [{attempt['error_class']}]" if attempt.get("error_class") else "")
+            + (f" - {attempt['error']}" if attempt["status"] == "failed" else "")
+            for attempt in attempts
+        )
+        return f"<pre>{html.escape(lines)}</pre>"
+
+    def _screenshot_html(self, screenshot: Optional[Dict[str, Optional[str]]]) -> str:
+        """Thumbnail linking to the full failure screenshot."""
+        if not screenshot:
+            return ""
+        report_dir = Config.get_report_dir()
+        full = os.path.relpath(screenshot["path"], start=report_dir)
+        if screenshot.get("thumbnail"):
+            image = f'<img src="{html.escape(os.path.relpath(screenshot["thumbnail"], start=report_dir))}">'
+        else:
+            image = f'<img src="{html.escape(full)}" width="{Config.SCREENSHOT_THUMBNAIL_WIDTH}">'
+        return f'<p><a href="{html.escape(full)}">{image}</a></p>'
 
-        html_content += "</body></html>"
-        return html_content
+    def _performance_html(self, performance: Optional[Dict[str, Any]]) -> str:
+        """Run-wide step latency, token usage and the slowest steps."""
+        if not performance or not performance["total_steps"]:
+            return ""
+        latency = performance["step_latency"]
+        phases = " | ".join(f"{name}: {seconds}s" for name, seconds in performance["phase_totals"].items())
+        rows = "".join(
+            f"<tr><td>{step['test_name']}</td><td>{step['step']}</td><td>{step['duration']}s</td>"
+            f"<td>{step['llm']}s</td><td>{round(step['browser_state'] + step['action_exec'], 3)}s</td><td>{step['overhead']}s</td>"
+            f"<td>{', '.join(step.get('actions') or [])}</td></tr>"
+            for step in performance["slowest_steps"]
+        )
+        return f"""
+                <p><b>Steps:</b> {performance["total_steps"]} |
+                   <b>Step p50:</b> {latency["p50"]}s |
+                   <b>Step p95:</b> {latency["p95"]}s |
+                   <b>Total Tokens:</b> {performance["total_tokens"]}</p>
+                <p><b>Phase Totals:</b> {phases}</p>
+                <p><b>Blocked Requests:</b> {performance.get("blocked_requests", 0)} |
+                   <b>Estimated Bytes Saved:</b> {performance.get("estimated_bytes_saved", 0) / 1_000_000:.1f} MB</p>
+                <p><b>Agent Steps Saved by Custom Actions:</b> {performance.get("steps_saved", 0)}
+                   ({self._custom_actions_text(performance.get("custom_actions"))})</p>
+                <table>
+                    <tr><th>Slowest Steps</th><th>Step</th><th>Duration</th><th>Model</th><th>Page</th><th>Framework</th><th>Actions</th></tr>
+                    {rows}
+                </table>
+        """
+
+    def _test_metrics_html(self, metrics: Optional[Dict[str, Any]]) -> str:
+        """Phase timings and per-step breakdown for one test."""
+        if not metrics:
+            return ""
+        phases = " | ".join(f"{name}: {seconds}s" for name, seconds in metrics["phases"].items())
+        latency = metrics["step_latency"]
+        network = metrics.get("network") or {}
+        rows = "".join(
+            f"<tr><td>{step['step']}</td><td>{step['duration']}s</td><td>{step['llm']}s</td>"
+            f"<td>{round(step['browser_state'] + step['action_exec'], 3)}s</td><td>{step['overhead']}s</td>"
+            f"<td>{step.get('input_tokens') or ''}</td><td>{', '.join(step.get('actions') or [])}</td></tr>"
+            for step in metrics["steps"]
+        )
+        return f"""
+                <pre>Phases: {phases}
+Steps: {metrics["step_count"]} | p50: {latency["p50"]}s | p95: {latency["p95"]}s | max: {latency["max"]}s | Tokens: {metrics["total_tokens"]}
+Blocked requests: {network.get("blocked_requests", 0)} ({network.get("estimated_bytes_saved", 0) / 1000:.0f} KB est.) {network.get("by_type", {})}
+Custom actions: {self._custom_actions_text(metrics.get("custom_actions"))}</pre>
+                <table>
+                    <tr><th>Step</th><th>Duration</th><th>Model</th><th>Page</th><th>Framework</th><th>Input Tokens</th><th>Actions</th></tr>
+                    {rows}
+                </table>
+        """
+
+    @staticmethod
+    def _custom_actions_text(custom_actions: Optional[Dict[str, Dict[str, int]]]) -> str:
+        if not custom_actions:
+            return "none"
+        return ", ".join(f"{name} x{usage['calls']} saved {usage['steps_saved']} steps"
+                         for name, usage in custom_actions.items())
 
     def _json_serializer(self, obj):
         """Custom JSON serializer for datetime and Pydantic models."""
@@ -150,4 +402,39 @@ class TestReport:
             return obj.dict()
         if hasattr(obj, "isoformat"):  # Handle datetime objects
             return obj.isoformat()
-        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
\ No newline at end of file
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def read_journal(path: Path) -> Iterator[Dict[str, Any]]:
+    """Entries of a JSONL journal; a line cut short by a crash is skipped."""
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping unreadable line {line_number} of {path}")
+
+
+def _truncate_partial_line(path: Path):
+    """Drop a trailing line left incomplete by a crash so appends start on a fresh line."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            chunk = f.read(position - start)
+            if position == end and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
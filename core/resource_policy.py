@@ -0,0 +1,116 @@
+from fnmatch import fnmatch
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from core.config import Config
+
+# Analytics, tag managers and ad networks; nothing a test reads comes from these hosts
+DEFAULT_TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'adservice.google.com', 'connect.facebook.net', 'facebook.com/tr',
+    'hotjar.com', 'clarity.ms', 'bat.bing.com', 'segment.com', 'segment.io', 'optimizely.com',
+    'scorecardresearch.com', 'quantserve.com', 'taboola.com', 'outbrain.com', 'criteo.com',
+    'amazon-adsystem.com', 'adsrvr.org', 'demdex.net', 'omtrdc.net', 'nr-data.net',
+    'js-agent.newrelic.com', 'snap.licdn.com', 'px.ads.linkedin.com', 'ads.linkedin.com',
+    'tiktok.com/i18n/pixel', 'analytics.tiktok.com', 'mouseflow.com', 'fullstory.com',
+)
+
+# Blocked requests are never downloaded, so savings are estimated from typical transfer sizes
+TYPICAL_BYTES = {
+    'image': 60_000, 'media': 500_000, 'font': 40_000, 'stylesheet': 30_000,
+    'script': 40_000, 'xhr': 5_000, 'fetch': 5_000, 'other': 5_000,
+}
+
+
+class BlockedRequestStats:
+    """Requests a policy blocked during one test"""
+
+    def __init__(self):
+        self.requests = 0
+        self.estimated_bytes = 0
+        self.by_type: Dict[str, int] = {}
+
+    def record(self, resource_type: str):
+        self.requests += 1
+        self.estimated_bytes += TYPICAL_BYTES.get(resource_type, TYPICAL_BYTES['other'])
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'blocked_requests': self.requests,
+            'estimated_bytes_saved': self.estimated_bytes,
+            'by_type': self.by_type,
+        }
+
+
+class ResourcePolicy:
+    """Declarative rules for which requests a test's browser context may make.
+
+    Requests are blocked by Playwright resource type (``image``, ``font``,
+    ``media`` ...), by URL glob, or because they go to a known tracker.
+    ``allow_patterns`` win over every block rule, and documents are never
+    blocked by type.
+    """
+
+    def __init__(self, block_types: Iterable[str] = (), block_patterns: Iterable[str] = (),
+                 allow_patterns: Iterable[str] = (), block_trackers: bool = True):
+        self.block_types = frozenset(block_types) - {'document'}
+        self.block_patterns = tuple(block_patterns)
+        self.allow_patterns = tuple(allow_patterns)
+        self.tracker_hosts = DEFAULT_TRACKER_HOSTS if block_trackers else ()
+
+    @classmethod
+    def from_config(cls) -> 'ResourcePolicy':
+        """Suite-wide policy from RESOURCE_BLOCK_TYPES, RESOURCE_BLOCK_PATTERNS and BLOCK_TRACKERS"""
+        return cls(
+            block_types=Config.RESOURCE_BLOCK_TYPES,
+            block_patterns=Config.RESOURCE_BLOCK_PATTERNS,
+            block_trackers=Config.BLOCK_TRACKERS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_patterns or self.tracker_hosts)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if any(fnmatch(url, pattern) for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        if any(fnmatch(url, pattern) for pattern in self.block_patterns):
+            return True
+        return self._is_tracker(url)
+
+    async def apply(self, context, stats: Optional[BlockedRequestStats] = None):
+        """Route every request of a Playwright context, including tabs opened later, through the policy"""
+        if not self.enabled:
+            return
+
+        async def handle(route):
+            request = route.request
+            try:
+                if self.should_block(request.resource_type, request.url):
+                    if stats is not None:
+                        stats.record(request.resource_type)
+                    await route.abort('blockedbyclient')
+                else:
+                    await route.continue_()
+            except Exception:
+                # The page or context closed while the request was in flight
+                pass
+
+        await context.route('**/*', handle)
+
+    def _is_tracker(self, url: str) -> bool:
+        if not self.tracker_hosts:
+            return False
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        host_path = host + parts.path
+        for tracker in self.tracker_hosts:
+            if '/' in tracker:
+                if host_path.startswith(tracker) or host_path.startswith('www.' + tracker):
+                    return True
+            elif host == tracker or host.endswith('.' + tracker):
+                return True
+        return False
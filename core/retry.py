@@ -0,0 +1,87 @@
+import asyncio
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.config import Config
+from core.llm_registry import is_retryable
+from core.timeouts import TestTimeoutError
+
+
+def _is_timeout(error: BaseException) -> bool:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    return isinstance(error, (asyncio.TimeoutError, PlaywrightTimeoutError))
+
+
+def _is_browser_error(error: BaseException) -> bool:
+    """Playwright failures (closed targets, lost connections) and browser-use's browser errors"""
+    from browser_use.browser.views import BrowserError, URLNotAllowedError
+    from playwright.async_api import Error as PlaywrightError
+
+    # A disallowed URL is the test's own configuration, not a transient fault
+    return isinstance(error, (PlaywrightError, BrowserError)) and not isinstance(error, URLNotAllowedError)
+
+
+# Transient error classes, checked in order against the exception and its causes;
+# 'timeout' covers agent-step and browser-operation timeouts, never the whole test's
+ERROR_CLASSES: List[Tuple[str, Callable[[BaseException], bool]]] = [
+    ('rate_limit', is_retryable),
+    ('timeout', _is_timeout),
+    ('llm_output', lambda e: type(e).__name__ in {'ValidationError', 'JSONDecodeError', 'OutputParserException'}),
+    ('browser', _is_browser_error),
+    ('network', lambda e: type(e).__name__ in {'ClientConnectorError', 'ServerDisconnectedError', 'ClientOSError'}),
+]
+
+
+def error_chain(error: BaseException) -> Iterator[BaseException]:
+    """The error followed by its causes (tests wrap failures in RuntimeError)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def classify(error: BaseException) -> Optional[str]:
+    """Name of the transient error class, or None for failures that should not be retried"""
+    chain = list(error_chain(error))
+    # A failed assertion is a real result, whatever else went wrong on the way
+    if any(isinstance(cause, AssertionError) for cause in chain):
+        return None
+    # So is running out of the whole test's time; a retry would only spend it again
+    if any(isinstance(cause, TestTimeoutError) and cause.scope == 'test' for cause in chain):
+        return None
+    for name, matches in ERROR_CLASSES:
+        if any(matches(cause) for cause in chain):
+            return name
+    return None
+
+
+def parse_policies(spec: str) -> Dict[str, int]:
+    """Parse ``class=retries,...`` (e.g. ``timeout=2,llm_output=1``)"""
+    policies = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, retries = part.partition('=')
+        policies[name.strip()] = int(retries)
+    return policies
+
+
+class RetryBudget:
+    """Per-error-class retry limits plus a cap on retries across the whole run"""
+
+    def __init__(self, total: int = Config.RETRY_BUDGET, policies: Optional[Dict[str, int]] = None):
+        self.remaining = total
+        self.policies = policies if policies is not None else parse_policies(Config.RETRY_POLICIES)
+        self.used = 0
+
+    def allow(self, error_class: Optional[str], attempt: int) -> bool:
+        """Spend one retry for a test that just failed its ``attempt``-th try, if permitted"""
+        if error_class is None or attempt > self.policies.get(error_class, 0):
+            return False
+        if self.remaining <= 0:
+            print(f"⚠️ Retry budget exhausted, not retrying {error_class} failure")
+            return False
+        self.remaining -= 1
+        self.used += 1
+        return True
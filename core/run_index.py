@@ -0,0 +1,222 @@
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    run_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test_name, run_id);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (timestamp);
+"""
+
+
+class RunIndex:
+    """SQLite index of every ``test_report_*.json`` in the report directory.
+
+    Files are ingested once and re-ingested only when their size or mtime
+    changes, so updating after each run reads just the new report.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Config.get_run_index_path()
+        self.path.parent.mkdir(exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self, report_dir: Optional[Path] = None) -> int:
+        """Ingest new or changed reports; returns how many were indexed"""
+        report_dir = report_dir or Config.get_report_dir()
+        known = {path: (mtime_ns, size) for path, mtime_ns, size
+                 in self.db.execute("SELECT path, mtime_ns, size FROM report_files")}
+        ingested = 0
+        with self.db:
+            for report_path in sorted(report_dir.glob('test_report_*.json')):
+                stat = report_path.stat()
+                key = report_path.name
+                if known.get(key) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                self._forget(key)
+                run_id = self._ingest(report_path)
+                self.db.execute("INSERT INTO report_files VALUES (?, ?, ?, ?)",
+                                (key, stat.st_mtime_ns, stat.st_size, run_id))
+                ingested += 1
+        return ingested
+
+    def recent_runs(self, last: int) -> List[Tuple[int, str, int, int, int]]:
+        """(id, timestamp, total, passed, failed) of the last N runs, oldest first"""
+        rows = self.db.execute(
+            "SELECT id, timestamp, total, passed, failed FROM runs ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (last,)
+        ).fetchall()
+        return rows[::-1]
+
+    def durations(self, test_name: str, last: int) -> List[Tuple[str, str, Optional[float]]]:
+        """(timestamp, status, duration) of a test over the last N runs it appeared in, oldest first"""
+        rows = self.db.execute(
+            "SELECT runs.timestamp, results.status, results.duration FROM results "
+            "JOIN runs ON runs.id = results.run_id WHERE results.test_name = ? "
+            "ORDER BY runs.timestamp DESC, runs.id DESC LIMIT ?",
+            (test_name, last)
+        ).fetchall()
+        return rows[::-1]
+
+    def statuses(self, last: int) -> Dict[str, List[str]]:
+        """Status sequence per test across the last N runs, oldest first"""
+        run_ids = [run[0] for run in self.recent_runs(last)]
+        history: Dict[str, List[str]] = {}
+        for run_id in run_ids:
+            for test_name, status in self.db.execute(
+                    "SELECT test_name, status FROM results WHERE run_id = ?", (run_id,)):
+                history.setdefault(test_name, []).append(status)
+        return history
+
+    def flakiness(self, last: int) -> List[Dict]:
+        """Tests that both passed and failed recently, most flaky first.
+
+        The score is the share of consecutive runs in which the status flipped,
+        so a test alternating pass/fail scores 1.0 and a steady one 0.0.
+        """
+        scores = []
+        for test_name, statuses in self.statuses(last).items():
+            if len(statuses) < 2 or len(set(statuses)) < 2:
+                continue
+            flips = sum(1 for previous, current in zip(statuses, statuses[1:]) if previous != current)
+            scores.append({
+                'test_name': test_name,
+                'score': round(flips / (len(statuses) - 1), 2),
+                'runs': len(statuses),
+                'failures': statuses.count('failed'),
+            })
+        return sorted(scores, key=lambda entry: (-entry['score'], -entry['failures'], entry['test_name']))
+
+    def duration_trends(self, last: int) -> List[Dict]:
+        """Median duration of passed runs in the recent half of the window against the older half"""
+        trends = []
+        test_names = [row[0] for row in self.db.execute("SELECT DISTINCT test_name FROM results")]
+        for test_name in test_names:
+            passed = [duration for _, status, duration in self.durations(test_name, last)
+                      if status == 'passed' and duration]
+            if len(passed) < 2:
+                continue
+            half = len(passed) // 2
+            baseline, recent = statistics.median(passed[:half]), statistics.median(passed[half:])
+            trends.append({
+                'test_name': test_name,
+                'baseline': round(baseline, 2),
+                'recent': round(recent, 2),
+                'change_pct': round((recent - baseline) / baseline * 100, 1),
+                'runs': len(passed),
+            })
+        return sorted(trends, key=lambda entry: -entry['change_pct'])
+
+    def _ingest(self, report_path: Path) -> Optional[int]:
+        try:
+            with open(report_path, 'r') as f:
+                report = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Skipping unreadable report {report_path.name}: {e}")
+            return None
+
+        summary = report.get('summary', {})
+        cursor = self.db.execute(
+            "INSERT INTO runs (timestamp, source, total, passed, failed) VALUES (?, ?, ?, ?, ?)",
+            (report.get('timestamp', ''), report_path.name,
+             summary.get('total', 0), summary.get('passed', 0), summary.get('failed', 0))
+        )
+        self.db.executemany(
+            "INSERT INTO results (run_id, test_name, status, duration, error) VALUES (?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, test['test_name'], test['status'], test.get('duration'), test.get('error'))
+             for test in report.get('details', [])]
+        )
+        return cursor.lastrowid
+
+    def _forget(self, key: str):
+        row = self.db.execute("SELECT run_id FROM report_files WHERE path = ?", (key,)).fetchone()
+        if row:
+            self.db.execute("DELETE FROM runs WHERE id = ?", (row[0],))
+            self.db.execute("DELETE FROM report_files WHERE path = ?", (key,))
+
+
+def index_reports():
+    """Bring the run index up to date after a report is written; failures only warn"""
+    try:
+        index = RunIndex()
+        try:
+            index.update()
+        finally:
+            index.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not update run index: {e}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query the run history indexed from reports/")
+    parser.add_argument('command', choices=['update', 'trend', 'pass-rate', 'flaky'])
+    parser.add_argument('test', nargs='?', help="Test name for 'trend' (default: all tests)")
+    parser.add_argument('--last', type=int, default=20, metavar='N', help="Number of runs to consider (default: 20)")
+    args = parser.parse_args(argv)
+
+    index = RunIndex()
+    try:
+        ingested = index.update()
+        if args.command == 'update':
+            print(f"📊 Indexed {ingested} new reports into {index.path}")
+
+        elif args.command == 'pass-rate':
+            for _, timestamp, total, passed, failed in index.recent_runs(args.last):
+                rate = passed / total * 100 if total else 0
+                print(f"{timestamp[:19]}  {rate:6.1f}%  {passed}/{total} passed, {failed} failed")
+
+        elif args.command == 'trend' and args.test:
+            for timestamp, status, duration in index.durations(args.test, args.last):
+                icon = '✅' if status == 'passed' else '❌'
+                print(f"{timestamp[:19]}  {icon} {duration if duration is not None else '-':>8}s")
+
+        elif args.command == 'trend':
+            for trend in index.duration_trends(args.last):
+                print(f"{trend['change_pct']:+7.1f}%  {trend['baseline']:>8}s -> {trend['recent']:>8}s  "
+                      f"{trend['test_name']} ({trend['runs']} passed runs)")
+
+        elif args.command == 'flaky':
+            flaky = index.flakiness(args.last)
+            if not flaky:
+                print(f"✅ No flaky tests in the last {args.last} runs")
+            for entry in flaky:
+                print(f"{entry['score']:.2f}  {entry['test_name']} "
+                      f"({entry['failures']} failures in {entry['runs']} runs)")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
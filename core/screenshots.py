@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.config import Config
+
+EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+
+# Near-duplicates are compared against this many recent frames
+RECENT_FRAMES = 256
+
+
+def _pillow():
+    """PIL.Image, or None when Pillow is not installed"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def dhash(image) -> int:
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail"""
+    pixels = list(image.convert('L').resize((9, 8)).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class ScreenshotPipeline:
+    """Encodes and writes screenshots on a thread pool.
+
+    Tests hand over the raw capture and carry on; compression, thumbnails
+    and deduplication happen off the event loop. A frame byte-identical to
+    a recent one is hard-linked to it instead of written again. Perceptual
+    matching, within ``SCREENSHOT_DEDUP_DISTANCE`` bits of a 64-bit hash,
+    is opt-in: it is too coarse to tell apart failures on similar-looking
+    pages. Thumbnails and perceptual matching need Pillow.
+    """
+
+    def __init__(self, image_format: str = Config.SCREENSHOT_FORMAT, quality: int = Config.SCREENSHOT_QUALITY,
+                 workers: int = Config.SCREENSHOT_WORKERS):
+        self.image = _pillow()
+        if image_format not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+        if image_format == 'webp' and self.image is None:
+            print("⚠️ WebP screenshots need Pillow, saving PNG instead")
+            image_format = 'png'
+        self.format = image_format
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot')
+        self._pending: Set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+        self._recent: List[Tuple[Any, Path, Optional[Path]]] = []
+
+    @property
+    def capture_type(self) -> str:
+        """Format to request from Playwright; JPEG is encoded by the browser itself"""
+        return 'jpeg' if self.format == 'jpeg' else 'png'
+
+    def capture_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {'full_page': True, 'type': self.capture_type}
+        if self.capture_type == 'jpeg':
+            options['quality'] = self.quality
+        return options
+
+    def paths(self, path: Path) -> Tuple[Path, Optional[Path]]:
+        """Final image path and thumbnail path for a requested file name"""
+        path = path.with_suffix(EXTENSIONS[self.format])
+        if self.image is None:
+            return path, None
+        return path, path.with_name(f"{path.stem}_thumb{path.suffix}")
+
+    async def capture(self, page, path: Path) -> Dict[str, Optional[str]]:
+        """Grab the page and queue it for encoding; returns once the raw capture is done"""
+        raw = await page.screenshot(**self.capture_options())
+        image_path, thumbnail_path = self.paths(path)
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._process, raw, image_path, thumbnail_path
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._done)
+        return {'path': str(image_path), 'thumbnail': str(thumbnail_path) if thumbnail_path else None}
+
+    def _done(self, future: asyncio.Future):
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception():
+            print(f"Failed to save screenshot: {future.exception()}")
+
+    async def drain(self):
+        """Wait until every queued screenshot is on disk"""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def _process(self, raw: bytes, path: Path, thumbnail_path: Optional[Path]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.image is None:
+            self._save(path, raw, self._fingerprint(raw), None)
+            return
+
+        image = self.image.open(io.BytesIO(raw))
+        image.load()
+        if self.format == 'webp':
+            data = self._encode(image, 'WEBP')
+        else:
+            # PNG and JPEG arrive already encoded by the browser
+            data = raw
+        thumbnail = image.copy()
+        thumbnail.thumbnail((Config.SCREENSHOT_THUMBNAIL_WIDTH, Config.SCREENSHOT_THUMBNAIL_WIDTH * 4))
+        thumbnail_data = self._encode(thumbnail, {'png': 'PNG', 'jpeg': 'JPEG', 'webp': 'WEBP'}[self.format])
+        self._save(path, data, self._fingerprint(data, image), (thumbnail_path, thumbnail_data))
+
+    def _fingerprint(self, data: bytes, image=None):
+        """Perceptual hash when near-duplicate matching is enabled, otherwise a content hash"""
+        if image is not None and Config.SCREENSHOT_DEDUP_DISTANCE > 0:
+            return dhash(image)
+        return hashlib.sha256(data).digest()
+
+    def _encode(self, image, image_format: str) -> bytes:
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        options = {} if image_format == 'PNG' else {'quality': self.quality}
+        image.save(buffer, format=image_format, **options)
+        return buffer.getvalue()
+
+    def _save(self, path: Path, data: bytes, fingerprint, thumbnail: Optional[Tuple[Path, bytes]]):
+        with self._lock:
+            original = self._find_duplicate(fingerprint)
+            if original is None:
+                self._recent.append((fingerprint, path, thumbnail[0] if thumbnail else None))
+                del self._recent[:-RECENT_FRAMES]
+
+        if original is not None:
+            original_path, original_thumbnail = original
+            if _link(original_path, path) and (thumbnail is None or _link(original_thumbnail, thumbnail[0])):
+                return
+        _write(path, data)
+        if thumbnail:
+            _write(*thumbnail)
+
+    def _find_duplicate(self, fingerprint) -> Optional[Tuple[Path, Optional[Path]]]:
+        distance = Config.SCREENSHOT_DEDUP_DISTANCE
+        if distance < 0:
+            return None
+        for recent, path, thumbnail_path in reversed(self._recent):
+            same = recent == fingerprint if isinstance(fingerprint, bytes) else hamming(recent, fingerprint) <= distance
+            if same and path.exists():
+                return path, thumbnail_path
+        return None
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def _write(path: Path, data: bytes):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _link(source: Optional[Path], path: Path) -> bool:
+    """Point ``path`` at an existing file's contents; False if links are unavailable"""
+    if source is None:
+        return False
+    if source == path:
+        return True
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        os.link(source, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
+
+
+_pipeline: Optional[ScreenshotPipeline] = None
+
+
+def get_screenshot_pipeline() -> ScreenshotPipeline:
+    """Process-wide pipeline shared by every test"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ScreenshotPipeline()
+    return _pipeline
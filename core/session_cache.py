@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.config import Config
+
+# Writes saved localStorage entries into the origin the page is on
+SET_LOCAL_STORAGE = "items => { for (const {name, value} of items) window.localStorage.setItem(name, value); }"
+
+
+class SessionCache:
+    """Authenticated browser storage state (cookies and localStorage), saved per login.
+
+    Entries are keyed by login URL and credentials, written to ``.sessions/``
+    readable by the owner only, and expire after ``ttl`` seconds. A per-key
+    lock makes concurrent tests wait for the first login instead of all
+    logging in at once.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, ttl: int = Config.SESSION_TTL):
+        self.directory = directory or Config.get_session_dir()
+        self.ttl = ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key(login_url: str, credentials: Dict[str, str]) -> str:
+        material = json.dumps({'url': login_url, 'credentials': credentials}, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+    def lock(self, key: str) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Saved storage state, or None when missing, unreadable or older than the TTL"""
+        try:
+            with open(self.path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get('saved_at', 0) > self.ttl:
+            self.invalidate(key)
+            return None
+        return entry['storage_state']
+
+    def save(self, key: str, storage_state: Dict[str, Any]):
+        self.directory.mkdir(exist_ok=True)
+        path = self.path(key)
+        tmp_path = path.with_suffix('.tmp')
+        # Session cookies are as good as the password, keep them private to the user
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'saved_at': time.time(), 'storage_state': storage_state}, f)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+
+def _local_storage_origins(storage_state: Dict[str, Any]) -> Dict[str, list]:
+    return {origin['origin']: origin['localStorage']
+            for origin in storage_state.get('origins', []) if origin.get('localStorage')}
+
+
+async def restore_storage_state(page, storage_state: Dict[str, Any]):
+    """Inject saved cookies and localStorage into the page's already open context.
+
+    localStorage is written once per origin by visiting it, rather than by an
+    init script, so a fresh login later in the same context keeps its own tokens.
+    """
+    if storage_state.get('cookies'):
+        await page.context.add_cookies(storage_state['cookies'])
+    for origin, items in _local_storage_origins(storage_state).items():
+        await page.goto(origin, wait_until="domcontentloaded", timeout=10000)
+        await page.evaluate(SET_LOCAL_STORAGE, items)
+
+
+async def clear_storage_state(page, storage_state: Dict[str, Any]):
+    """Remove restored cookies and localStorage after the saved session was rejected"""
+    await page.context.clear_cookies()
+    for origin in _local_storage_origins(storage_state):
+        await page.goto(origin, wait_until="domcontentloaded", timeout=10000)
+        await page.evaluate("() => window.localStorage.clear()")
+
+
+_session_cache: Optional[SessionCache] = None
+
+
+def get_session_cache() -> SessionCache:
+    """Process-wide cache, so concurrent tests share its per-login locks"""
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = SessionCache()
+    return _session_cache
@@ -0,0 +1,64 @@
+import heapq
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+from core.config import Config
+from core.durations import DurationStore
+from core.report_generator import TestReport
+from core.run_index import index_reports
+
+T = TypeVar('T')
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a 1-based ``i/n`` shard specification"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected the form i/n (e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}': index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def partition(items: Sequence[T], count: int, name: Callable[[T], str],
+              durations: DurationStore) -> List[List[T]]:
+    """Split items into ``count`` shards with balanced expected duration.
+
+    Greedy longest-processing-time bin packing: the longest remaining test
+    always goes to the least-loaded shard. Ties are broken by name so every
+    machine computes the same partition from the same duration history.
+    """
+    ordered = sorted(items, key=lambda item: (-durations.estimate(name(item)), name(item)))
+    shards: List[List[T]] = [[] for _ in range(count)]
+    loads = [(0.0, i) for i in range(count)]
+    heapq.heapify(loads)
+    for item in ordered:
+        load, shard_index = heapq.heappop(loads)
+        shards[shard_index].append(item)
+        heapq.heappush(loads, (load + durations.estimate(name(item)), shard_index))
+    return shards
+
+
+def select_shard(items: Sequence[T], spec: str, name: Callable[[T], str],
+                 durations: DurationStore) -> List[T]:
+    index, count = parse_shard(spec)
+    return partition(items, count, name, durations)[index - 1]
+
+
+def partial_report_path(spec: str) -> Path:
+    """Result journal a shard writes for a later merge"""
+    index, count = parse_shard(spec)
+    return Config.get_report_dir() / 'partials' / f"partial_{index}_of_{count}.jsonl"
+
+
+def merge_partial_reports(partial_paths: Sequence[Path]) -> dict:
+    """Merge shard journals into one JSON/HTML report and learn from their durations"""
+    report = TestReport.from_journals(partial_paths)
+    report_data = report.generate_report('all')
+
+    durations = DurationStore()
+    durations.record_details(report.iter_details())
+    durations.save()
+    index_reports()
+    return report_data
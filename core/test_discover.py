@@ -1,24 +1,197 @@
+import ast
+import hashlib
 import importlib
+import json
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Type
-from core.base_test import BaseTest
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Type
+from core.config import Config
+from utilities.data_loader import iter_csv_rows
 
-def discover_tests(base_path: str = "tests") -> List[Type[BaseTest]]:
-    """Discover all test classes inheriting from BaseTest"""
-    test_classes = []
-    tests_path = Path(base_path)
+if TYPE_CHECKING:
+    from core.test_item import ParametrizedTest
+
+# Base classes that mark a class as a runnable test
+TEST_BASES = {'BaseTest', 'ApiTest'}
+MANIFEST_VERSION = 2
+
+# Class attributes read statically so --list can show data rows without importing the test
+PARAM_ATTRIBUTES = ('data_file', 'data_id_column')
+
+
+def scan_tests(base_path: str = "tests") -> List[Dict[str, str]]:
+    """Statically find test classes without importing their modules.
+
+    Every module under ``base_path`` is parsed with ``ast``, since suite files
+    are not all named ``test_*.py``; only BaseTest/ApiTest subclasses count.
+    The result is cached in a manifest keyed by file path, invalidated by
+    mtime/size and, failing that, by content hash.
+    """
+    manifest_path = Config.get_manifest_path()
+    manifest = _load_manifest(manifest_path)
+    files: Dict[str, dict] = {}
+    changed = False
+
+    for test_file in sorted(Path(base_path).rglob("*.py")):
+        key = test_file.as_posix()
+        cached = manifest['files'].get(key)
+        stat = test_file.stat()
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            files[key] = cached
+            continue
+
+        source = test_file.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        if cached and cached['sha256'] == digest:
+            entry = dict(cached)
+        else:
+            entry = {'sha256': digest, 'classes': _parse_classes(test_file, source)}
+        entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        files[key] = entry
+        changed = True
+
+    if changed or files.keys() != manifest['files'].keys():
+        _save_manifest(manifest_path, {'version': MANIFEST_VERSION, 'files': files})
 
-    for test_file in tests_path.rglob("test_*.py"):
+    tests = _resolve_tests(files)
+    _warn_on_collisions(tests)
+    return tests
+
+
+def discover_tests(base_path: str = "tests", selection: Optional[Iterable[str]] = None) -> List[Type['ParametrizedTest']]:
+    """Discover test classes, importing only the modules of the selected tests.
+
+    ``selection`` items may be a class name, ``module:ClassName`` or a module path.
+    """
+    from core.api_test import ApiTest
+    from core.base_test import BaseTest
+
+    test_classes = []
+    for entry in select_tests(scan_tests(base_path), selection):
         try:
-            module_path = ".".join(test_file.with_suffix('').parts)
-            module = importlib.import_module(module_path)
-
-            for name, obj in vars(module).items():
-                if (isinstance(obj, type) and
-                        issubclass(obj, BaseTest) and
-                        obj != BaseTest):
-                    test_classes.append(obj)
+            module = importlib.import_module(entry['module'])
         except ImportError as e:
-            print(f"⚠️ Could not import {test_file.name}: {str(e)}")
+            print(f"⚠️ Could not import {entry['file']}: {str(e)}")
+            continue
+
+        obj = getattr(module, entry['class_name'], None)
+        if isinstance(obj, type) and issubclass(obj, (BaseTest, ApiTest)) and obj not in (BaseTest, ApiTest):
+            test_classes.append(obj)
+        else:
+            print(f"⚠️ {entry['id']} is not a BaseTest or ApiTest subclass after import, skipping")
+
+    return test_classes
+
+
+def select_tests(tests: List[Dict[str, str]], selection: Optional[Iterable[str]]) -> List[Dict[str, str]]:
+    if not selection:
+        return tests
+    # Data rows (TestClass[row]) are narrowed after expansion; here only their class matters
+    wanted = {name.split('[')[0] for name in selection}
+    return [t for t in tests if wanted & {t['class_name'], t['id'], t['module']}]
+
+
+def listed_ids(entry: Dict[str, str]) -> List[str]:
+    """The test's ID, or ``ID[row]`` for each data row when its CSV is known statically"""
+    if not entry.get('data_file'):
+        return [entry['id']]
+    try:
+        return [f"{entry['id']}[{row_id}]" for row_id, _ in iter_csv_rows(entry['data_file'], entry.get('data_id_column'))]
+    except (OSError, KeyError, ValueError) as e:
+        print(f"⚠️ Could not load parameters for {entry['id']}: {e}")
+        return [entry['id']]
+
+
+def _parse_classes(test_file: Path, source: bytes) -> List[Dict]:
+    try:
+        tree = ast.parse(source, filename=str(test_file))
+    except SyntaxError as e:
+        print(f"⚠️ Could not parse {test_file.name}: {e}")
+        return []
+
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = [base.id if isinstance(base, ast.Name) else base.attr
+                     for base in node.bases if isinstance(base, (ast.Name, ast.Attribute))]
+            classes.append({'name': node.name, 'bases': bases, 'line': node.lineno, **_param_attributes(node)})
+    return classes
+
+
+def _param_attributes(node: ast.ClassDef) -> Dict[str, str]:
+    attributes = {}
+    for statement in node.body:
+        if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name) and statement.targets[0].id in PARAM_ATTRIBUTES):
+            value = _static_string(statement.value)
+            if value is not None:
+                attributes[statement.targets[0].id] = value
+    return attributes
+
+
+def _static_string(node: ast.expr) -> Optional[str]:
+    """Value of a string literal or an os.path.join of string literals"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Call) and ast.unparse(node.func) in ('os.path.join', 'join') and not node.keywords:
+        parts = [_static_string(arg) for arg in node.args]
+        if parts and all(part is not None for part in parts):
+            return os.path.join(*parts)
+    return None
+
+
+def _resolve_tests(files: Dict[str, dict]) -> List[Dict[str, str]]:
+    """Keep classes that derive from a test base, directly or via another scanned class"""
+    candidates = [(path, cls) for path, entry in files.items() for cls in entry['classes']]
+    test_names = set(TEST_BASES)
+    grew = True
+    while grew:
+        grew = False
+        for _, cls in candidates:
+            if cls['name'] not in test_names and test_names & set(cls['bases']):
+                test_names.add(cls['name'])
+                grew = True
+
+    tests = []
+    for path, cls in candidates:
+        if cls['name'] in test_names and cls['name'] not in TEST_BASES:
+            module = ".".join(Path(path).with_suffix('').parts)
+            tests.append({
+                'id': f"{module}:{cls['name']}",
+                'module': module,
+                'class_name': cls['name'],
+                'file': path,
+                'line': cls['line'],
+                **{name: cls[name] for name in PARAM_ATTRIBUTES if name in cls},
+            })
+    return tests
+
+
+def _warn_on_collisions(tests: List[Dict[str, str]]):
+    by_name = defaultdict(list)
+    for test in tests:
+        by_name[test['class_name']].append(test['id'])
+    for class_name, ids in by_name.items():
+        if len(ids) > 1:
+            print(f"⚠️ Test name collision: {class_name} is defined in {', '.join(ids)}; "
+                  f"results will be ambiguous, select by module:ClassName")
+
+
+def _load_manifest(path: Path) -> dict:
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {'version': MANIFEST_VERSION, 'files': {}}
+
 
-    return test_classes
\ No newline at end of file
+def _save_manifest(path: Path, manifest: dict):
+    try:
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not write test manifest {path}: {e}")
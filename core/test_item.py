@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from utilities.data_loader import iter_csv_rows
+
+
+class ParametrizedTest:
+    """Data-row parametrization shared by every kind of test.
+
+    Data-driven tests point ``data_file`` at a CSV; every row runs as its own
+    test named ``TestClass[row id]``, with the row bound to ``self.params``.
+    """
+
+    data_file: Optional[str] = None
+    data_id_column: Optional[str] = None
+
+    params: Dict[str, str]
+    param_id: Optional[str]
+
+    @classmethod
+    def iter_params(cls) -> Optional[Iterator[Tuple[str, Dict[str, str]]]]:
+        """Stream (param_id, params) pairs, or None when the test is not parametrized"""
+        if cls.data_file is None:
+            return None
+        return iter_csv_rows(cls.data_file, cls.data_id_column)
+
+    def bind_params(self, param_id: str, params: Dict[str, str]):
+        """Bind this instance to one data row"""
+        self.param_id = param_id
+        self.params = params
+
+    @property
+    def test_id(self) -> str:
+        """Name used for reports and artifacts: TestClass or TestClass[param_id]"""
+        if self.param_id is None:
+            return self.__class__.__name__
+        return f"{self.__class__.__name__}[{self.param_id}]"
+
+
+class TestItem:
+    """One schedulable unit of work: a test class, optionally bound to one data row"""
+
+    def __init__(self, test_class: Type[ParametrizedTest], params: Optional[Dict[str, str]] = None,
+                 param_id: Optional[str] = None, error: Optional[str] = None):
+        self.test_class = test_class
+        self.params = params
+        self.param_id = param_id
+        self.error = error
+
+    @property
+    def name(self) -> str:
+        """Report name: ``TestClass`` or ``TestClass[param_id]`` for a data row"""
+        if self.param_id is None:
+            return self.test_class.__name__
+        return f"{self.test_class.__name__}[{self.param_id}]"
+
+    @property
+    def id(self) -> str:
+        return f"{self.test_class.__module__}:{self.name}"
+
+    def create(self) -> ParametrizedTest:
+        """Instantiate the test bound to this item's row"""
+        if self.error:
+            raise RuntimeError(self.error)
+        test = self.test_class()
+        if self.param_id is not None:
+            test.bind_params(self.param_id, self.params)
+        return test
+
+    def __repr__(self) -> str:
+        return f"TestItem({self.id})"
+
+
+def expand_tests(tests: Iterable[Union[Type[ParametrizedTest], TestItem]]) -> List[TestItem]:
+    """Expand parametrized test classes into one item per data row"""
+    items = []
+    for test in tests:
+        if isinstance(test, TestItem):
+            items.append(test)
+            continue
+        try:
+            rows = test.iter_params()
+            if rows is None:
+                items.append(TestItem(test))
+                continue
+            expanded = [TestItem(test, params, row_id) for row_id, params in rows]
+        except (OSError, KeyError, ValueError) as e:
+            # Reported as a failure of the whole test rather than aborting the run
+            print(f"❌ Could not load parameters for {test.__name__}: {e}")
+            items.append(TestItem(test, error=f"Could not load parameters: {e}"))
+            continue
+        if not expanded:
+            print(f"⚠️ {test.__name__} has no data rows, skipping")
+        items.extend(expanded)
+    return items
+
+
+def select_items(items: List[TestItem], selection: Optional[Iterable[str]]) -> List[TestItem]:
+    """Narrow parametrized tests to rows selected as ``TestClass[param_id]``"""
+    wanted_rows = {name for name in selection or () if name.endswith(']')}
+    if not wanted_rows:
+        return items
+    narrowed = {name.split('[')[0].split(':')[-1] for name in wanted_rows}
+    return [item for item in items
+            if item.test_class.__name__ not in narrowed or wanted_rows & {item.name, item.id}]
@@ -1,33 +1,175 @@
 import asyncio
-from typing import List, Type
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Type, Union
+from core.api_test import ApiTest, create_http_session
 from core.base_test import BaseTest
+from core.config import Config
+from core.browser_pool import BrowserPool
+from core.budgets import BudgetExceededError
+from core.concurrency import AdaptiveLimiter, ConcurrencyController
+from core.durations import DurationStore
 from core.report_generator import TestReport
+from core.retry import RetryBudget, classify, error_chain
+from core.screenshots import get_screenshot_pipeline
+from core.run_index import index_reports
+from core.test_item import TestItem, expand_tests
+from core.timeouts import TestTimeoutError, run_with_timeout
 
 
 class TestRunner:
-    def __init__(self, max_workers: int = 3):
+    def __init__(self, max_workers: int = Config.MAX_WORKERS, journal_path: Optional[Path] = None,
+                 resume: bool = False, min_workers: int = Config.MIN_WORKERS, report: Optional[TestReport] = None):
         self.max_workers = max_workers
-        self.report = TestReport()
-        self.semaphore = asyncio.Semaphore(max_workers)
-
-    async def _execute_test(self, test_class: Type[BaseTest]):
-        async with self.semaphore:
-            test_name = test_class.__name__
-            self.report.start_timer(test_name)
-
-            try:
-                test_instance = test_class()
-                result = await test_instance.run()
-                self.report.add_success(test_name, result)
-            except Exception as e:
-                self.report.add_failure(test_name, str(e))
-            finally:
-                if hasattr(test_instance, 'controller'):
-                    await test_instance.controller.close()
-
-    async def run_tests_parallel(self, test_classes: List[Type[BaseTest]]) -> bool:
-        tasks = [self._execute_test(tc) for tc in test_classes]
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        report_data = self.report.generate_report('all')
-        return report_data['summary']['failed'] == 0
\ No newline at end of file
+        self.min_workers = min(min_workers, max_workers)
+        # Results are journaled as tests finish; resume skips tests the journal already holds
+        self.report = report or TestReport(journal_path, resume=resume)
+        self.browser_pool = BrowserPool(size=max_workers)
+        # Browser test slots; the controller moves the limit between min_workers and max_workers
+        self.semaphore = AdaptiveLimiter(max(self.min_workers, min(Config.INITIAL_WORKERS, max_workers)))
+        self.concurrency = ConcurrencyController(
+            self.semaphore, self.min_workers, max_workers,
+            browser_pool=self.browser_pool, on_decision=self.report.add_concurrency_decision
+        )
+        self.durations = DurationStore()
+        # API tests hold no browser, so they get their own, much wider, limit
+        self.api_semaphore = asyncio.Semaphore(Config.API_MAX_CONCURRENCY)
+        self._http = None
+        self.retry_budget = RetryBudget()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _spawn(self, item: TestItem, attempts: Optional[List[dict]] = None):
+        self._tasks.add(asyncio.ensure_future(self._execute_test(item, attempts or [])))
+
+    def _limiter(self, item: TestItem):
+        """API tests share the HTTP concurrency limit; everything else needs a browser slot"""
+        return self.api_semaphore if issubclass(item.test_class, ApiTest) else self.semaphore
+
+    async def _execute_test(self, item: TestItem, attempts: List[dict]):
+        async with self._limiter(item):
+            retry = await self.run_item(item, attempts)
+
+        if retry:
+            # Queued behind every test already waiting for a slot, so fresh tests are not held up
+            self._spawn(item, attempts)
+
+    async def run_item(self, item: TestItem, attempts: List[dict]) -> bool:
+        """Run one attempt of a test in the caller's slot and record it; True if it should be retried"""
+        test_name = item.name
+        self.report.start_timer(test_name)
+        test_instance = None
+
+        try:
+            test_instance = item.create()
+            if issubclass(item.test_class, ApiTest):
+                test_instance.http = self._http_session()
+            else:
+                test_instance.browser_pool = self.browser_pool
+            # Expiry cancels the test, which tears down its browser context before the slot is freed
+            timeout = self._timeout(test_name, getattr(test_instance, 'timeout', Config.TEST_TIMEOUT))
+            result = await run_with_timeout(test_instance.run(), timeout, 'test', test_instance.metrics)
+            self.report.add_success(test_name, result, metrics=self._metrics(test_instance), attempts=attempts)
+        except Exception as e:
+            error_class = classify(e)
+            if self.retry_budget.allow(error_class, len(attempts) + 1):
+                attempts.append(self.report.add_attempt(test_name, str(e), error_class))
+                print(f"🔁 {test_name} hit a {error_class} error, retrying (attempt {len(attempts) + 1})")
+                return True
+            self.report.add_failure(test_name, str(e), metrics=self._metrics(test_instance),
+                                    attempts=attempts,
+                                    screenshot=getattr(test_instance, 'failure_screenshot', None),
+                                    timeout=self._cause(e, TestTimeoutError),
+                                    budget=self._cause(e, BudgetExceededError))
+        finally:
+            if test_instance is not None:
+                await test_instance.cleanup()
+        return False
+
+    def _timeout(self, test_name: str, timeout: float) -> float:
+        """The test's limit, raised for tests whose history shows they normally take longer"""
+        observed = self.durations.observed(test_name)
+        if not timeout or observed is None:
+            return timeout
+        return max(timeout, round(observed * Config.TEST_TIMEOUT_HISTORY_FACTOR))
+
+    def _http_session(self):
+        """The runner's pooled HTTP session, opened by the first API test"""
+        if self._http is None:
+            self._http = create_http_session()
+        return self._http
+
+    @staticmethod
+    def _cause(error: BaseException, kind: Type[Exception]) -> Optional[dict]:
+        """Details of a timeout or exceeded budget anywhere in the failure's causes"""
+        for cause in error_chain(error):
+            if isinstance(cause, kind):
+                return cause.to_dict()
+        return None
+
+    @staticmethod
+    def _metrics(test_instance) -> Optional[dict]:
+        """Phase and step timings collected by the test, if it got far enough to create them"""
+        metrics = getattr(test_instance, 'metrics', None)
+        return metrics.to_dict() if metrics is not None else None
+
+    async def run_tests_parallel(self, tests: Sequence[Union[Type[BaseTest], Type[ApiTest], TestItem]],
+                                 final_report: bool = True) -> bool:
+        """Run tests and report them; shards pass final_report=False and leave their journal for a merge"""
+        # Parametrized classes run one item per data row, each scheduled independently
+        items = expand_tests(tests)
+        pending = [item for item in items if item.name not in self.report.completed]
+        if len(pending) < len(items):
+            print(f"⏭️ Skipping {len(items) - len(pending)} tests already in the journal")
+        items = pending
+        # Semaphore waiters are served in creation order, so longest-expected tests start first
+        for item in self.durations.longest_first(items, name=lambda item: item.name):
+            self._spawn(item)
+        self.start_concurrency()
+        try:
+            await self.wait_for_tasks()
+        finally:
+            await self.shutdown()
+
+        if not final_report:
+            print(f"🧩 Partial results journaled: {self.report.journal_path}")
+            return self.report.results['summary']['failed'] == 0
+
+        report_data = publish_report(self.report, self.durations)
+        return report_data['summary']['failed'] == 0
+
+    def start_concurrency(self):
+        if self.min_workers < self.max_workers:
+            self.concurrency.start()
+
+    async def wait_for_tasks(self):
+        """Wait for every spawned test; retries add tasks while the run is in progress"""
+        while self._tasks:
+            done, _ = await asyncio.wait(self._tasks)
+            self._tasks -= done
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    print(f"❌ Test task crashed: {task.exception()}")
+
+    async def shutdown(self):
+        """Stop unfinished tests and release browsers, HTTP connections and the journal"""
+        await self.concurrency.stop()
+        for task in self._tasks:
+            task.cancel()
+        # Cancelled tests still record their failure and release their browser on the way out
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # Reports link to the screenshots, so they must be on disk first
+        await get_screenshot_pipeline().drain()
+        self.report.close()
+        await self.browser_pool.close()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+
+def publish_report(report: TestReport, durations: DurationStore) -> dict:
+    """Write the final JSON/HTML report and feed the duration history and run index"""
+    report_data = report.generate_report('all')
+    durations.record_details(report.iter_details())
+    durations.save()
+    index_reports()
+    return report_data
\ No newline at end of file
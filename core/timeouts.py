@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+from core.metrics import TestMetrics
+
+
+class TestTimeoutError(asyncio.TimeoutError):
+    """A test, agent step or teardown ran past its limit; carries where the test had got to"""
+
+    def __init__(self, scope: str, seconds: float, step: Optional[int] = None, url: Optional[str] = None):
+        self.scope = scope
+        self.seconds = seconds
+        self.step = step
+        self.url = url
+        where = f" at step {step}" if step else ""
+        where += f" on {url}" if url else ""
+        super().__init__(f"{scope.capitalize()} timed out after {seconds}s{where}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'scope': self.scope, 'seconds': self.seconds, 'step': self.step, 'url': self.url}
+
+
+async def run_with_timeout(awaitable: Awaitable, seconds: float, scope: str,
+                           metrics: Optional[TestMetrics] = None) -> Any:
+    """Await with a hard limit, cancelling the work and raising TestTimeoutError on expiry"""
+    if not seconds or seconds <= 0:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, seconds)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, TestTimeoutError):
+            raise
+        step, url = metrics.last_position() if metrics else (None, None)
+        raise TestTimeoutError(scope, seconds, step, url) from None
+
+
+def limit_steps(agent, seconds: float, metrics: TestMetrics):
+    """Cancel any agent step that runs longer than ``seconds``"""
+    original = agent.step
+
+    async def bounded_step(*args, **kwargs):
+        return await run_with_timeout(original(*args, **kwargs), seconds, 'step', metrics)
+
+    agent.step = bounded_step
@@ -1,25 +1,128 @@
+import argparse
 import asyncio
 import sys
+from pathlib import Path
+from typing import List, Tuple
+from core.config import Config
 from core.test_runner import TestRunner
-from core.test_discover import discover_tests
+from core.test_discover import discover_tests, listed_ids, scan_tests, select_tests
+from core.test_item import expand_tests, select_items
+from core.durations import DurationStore
+from core.sharding import merge_partial_reports, partial_report_path, select_shard
 
 
-async def main():
-    test_classes = discover_tests()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the browser automation test suite")
+    parser.add_argument('tests', nargs='*', metavar='TEST',
+                        help="Run only these tests (ClassName, module:ClassName, module or ClassName[row])")
+    parser.add_argument('--list', action='store_true',
+                        help="List discovered tests and data rows without importing them and exit")
+    parser.add_argument('--workers', type=int,
+                        help="Run exactly N browser tests at once per process instead of adapting to host load")
+    parser.add_argument('--min-workers', type=int, default=Config.MIN_WORKERS,
+                        help=f"Lower bound for adaptive concurrency (default: {Config.MIN_WORKERS})")
+    parser.add_argument('--max-workers', type=int, default=Config.MAX_WORKERS,
+                        help=f"Upper bound for adaptive concurrency (default: {Config.MAX_WORKERS})")
+    parser.add_argument('--shard', metavar='I/N',
+                        help="Run only shard I of N and write a partial report for a later --merge")
+    parser.add_argument('--partial-report', metavar='PATH',
+                        help="Where a shard journals its results (default: reports/partials/)")
+    parser.add_argument('--processes', type=int, default=1, metavar='K',
+                        help="Split the suite across K local worker processes and merge their reports")
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL',
+                        help="Merge shard journals into one JSON/HTML report")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted run, skipping tests already in its result journal")
+    parser.add_argument('--coordinator', metavar='ADDRESS',
+                        help="Serve the selected tests to --worker processes on HOST:PORT or unix:PATH and report them")
+    parser.add_argument('--worker', metavar='ADDRESS',
+                        help="Pull tests from the coordinator at HOST:PORT or unix:PATH until its queue is empty")
+    return parser.parse_args(argv)
 
-    if not test_classes:
+
+def worker_bounds(args) -> Tuple[int, int]:
+    """(min, max) concurrent browser tests; --workers pins both"""
+    if args.workers:
+        return args.workers, args.workers
+    return args.min_workers, args.max_workers
+
+
+async def run_processes(count: int, workers: Tuple[int, int], selection: List[str], resume: bool = False) -> bool:
+    """Run every shard in its own process, then merge the partial reports"""
+    partials = []
+    processes = []
+    for index in range(1, count + 1):
+        spec = f"{index}/{count}"
+        partial = partial_report_path(spec)
+        if not resume:
+            partial.unlink(missing_ok=True)
+        partials.append(partial)
+        processes.append(await asyncio.create_subprocess_exec(
+            sys.executable, '-m', 'run_all', *selection,
+            '--shard', spec, '--partial-report', str(partial),
+            '--min-workers', str(workers[0]), '--max-workers', str(workers[1]),
+            *(['--resume'] if resume else [])
+        ))
+    await asyncio.gather(*(process.wait() for process in processes))
+
+    missing = [str(partial) for partial in partials if not partial.exists()]
+    if missing:
+        print(f"❌ Shards did not produce a report: {', '.join(missing)}")
+    report_data = merge_partial_reports([partial for partial in partials if partial.exists()])
+    return not missing and report_data['summary']['failed'] == 0
+
+
+async def main(args):
+    if args.merge:
+        report_data = merge_partial_reports([Path(path) for path in args.merge])
+        return report_data['summary']['failed'] == 0
+
+    if args.processes > 1:
+        return await run_processes(args.processes, worker_bounds(args), args.tests, args.resume)
+
+    if args.worker:
+        from core.distributed import Worker
+        min_workers, max_workers = worker_bounds(args)
+        return await Worker(args.worker, max_workers=max_workers, min_workers=min_workers).run()
+
+    if args.list:
+        for entry in select_tests(scan_tests(), args.tests):
+            for test_id in listed_ids(entry):
+                print(f"- {test_id}")
+        return True
+
+    # Data rows of parametrized tests are expanded before sharding so they spread across shards
+    test_items = select_items(expand_tests(discover_tests(selection=args.tests)), args.tests)
+
+    if not test_items:
         print("❌ No tests found!")
         return False
 
-    print(f"🚀 Found {len(test_classes)} tests:")
-    for test_class in test_classes:
-        print(f"- {test_class.__name__}")
+    if args.coordinator:
+        from core.distributed import run_coordinator
+        return await run_coordinator(args.coordinator, test_items, resume=args.resume)
+
+    partial_path = None
+    if args.shard:
+        test_items = select_shard(test_items, args.shard, lambda item: item.name, DurationStore())
+        partial_path = Path(args.partial_report) if args.partial_report else partial_report_path(args.shard)
+        print(f"🧩 Shard {args.shard}")
+
+    print(f"🚀 Found {len(test_items)} tests:")
+    for item in test_items:
+        print(f"- {item.name}")
 
-    runner = TestRunner(max_workers=3)
-    success = await runner.run_tests_parallel(test_classes)
+    min_workers, max_workers = worker_bounds(args)
+    runner = TestRunner(max_workers=max_workers, min_workers=min_workers,
+                        journal_path=partial_path, resume=args.resume)
+    success = await runner.run_tests_parallel(test_items, final_report=partial_path is None)
     return success
 
 
 if __name__ == "__main__":
-    exit_code = 0 if asyncio.run(main()) else 1
-    sys.exit(exit_code)
\ No newline at end of file
+    try:
+        exit_code = 0 if asyncio.run(main(parse_args())) else 1
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted; finished tests are kept in the result journal, rerun with --resume to continue")
+        exit_code = 130
+    sys.exit(exit_code)
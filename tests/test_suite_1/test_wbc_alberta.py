@@ -9,14 +9,13 @@ class WcbPremiumResult(BaseModel):
 
 class TestWcbPremium(BaseTest):
     def get_task(self) -> str:
-        return (
-            'Open browser and launch https://rm.wcb.ab.ca/WCB.RateManual.WebServer'
-            'Click Agriculture'
-            'Click Crop Production'
-            'Click Forage/ Peat Moss Processing - 01602'
-            'Review 2025 Premium Rate'
+        return '\n'.join([
+            'Open browser and launch https://rm.wcb.ab.ca/WCB.RateManual.WebServer',
+            'Use navigate_menu_path with path '
+            '["Agriculture", "Crop Production", "Forage/ Peat Moss Processing - 01602"]',
+            'Use assert_text_present to review the 2025 Premium Rate',
             'Close the Browser'
-        )
+        ])
 
     def get_output_model(self) -> BaseModel:
         return WcbPremiumResult
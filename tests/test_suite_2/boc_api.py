@@ -1,7 +1,6 @@
-from core.base_test import BaseTest
+from core.api_test import ApiTest
 from pydantic import BaseModel
-import aiohttp
-from typing import Dict
+from typing import Any, Dict
 
 
 class GroupItem(BaseModel):
@@ -14,12 +13,10 @@ class BankOfCanadaResponse(BaseModel):
     groups: Dict[str, GroupItem]  # Dynamic group IDs
 
 
-class TestBankOfCanadaAPI(BaseTest):
-    def get_task(self) -> str:
-        return (
-            "Fetch JSON from https://www.bankofcanada.ca/valet/lists/groups/json\n"
-            "Validate the response structure and check for specific financial data groups."
-        )
+class TestBankOfCanadaAPI(ApiTest):
+    async def fetch(self) -> Any:
+        # Validate the response structure and check for specific financial data groups
+        return await self.get_json("https://www.bankofcanada.ca/valet/lists/groups/json")
 
     def get_output_model(self) -> BaseModel:
         return BankOfCanadaResponse
@@ -43,12 +40,3 @@ class TestBankOfCanadaAPI(BaseTest):
         print(f"\n✅ Validation passed for {target_field}:")
         print(f"Label: {fsr_item.label}")
         print(f"Description: {fsr_item.description}")
-
-    async def run(self):
-        url = "https://www.bankofcanada.ca/valet/lists/groups/json"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.json()
-                validated = self.get_output_model().model_validate(data)
-                self.validate_results(validated)
-                return validated
\ No newline at end of file
@@ -1,7 +1,6 @@
-from core.base_test import BaseTest
-from pydantic import BaseModel
-import aiohttp
-from typing import Dict, List, Optional, Union
+from core.api_test import ApiTest
+from pydantic import BaseModel, RootModel
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 
 
@@ -16,86 +15,77 @@ class SeriesDetail(BaseModel):
     dimension: SeriesDimension
 
 
+class FXObservation(RootModel[Dict[str, Optional[Union[str, Dict[str, str]]]]]):
+    pass
+
+
 class BankOfCanadaFXResponse(BaseModel):
     terms: Dict[str, str]
     seriesDetail: Dict[str, SeriesDetail]
-    observations: List[Dict[str, Optional[Union[str, Dict[str, str]]]]]
+    # Streamed and checked one observation at a time, see validate_item
+    observations: List[FXObservation] = []
+
 
+class TestBankOfCanadaFXAPI(ApiTest):
+    target_currency = "FXCNYCAD"
+    stream_items = {'observations': FXObservation}
 
-class TestBankOfCanadaFXAPI(BaseTest):
-    def get_task(self) -> str:
-        return (
-            "Fetch FX rates data from Bank of Canada API\n"
-            "Validate response structure and check for CNY/CAD exchange rate data"
-        )
+    def __init__(self):
+        super().__init__()
+        self.valid_observations = 0
+        self.first_valid: Optional[Dict[str, str]] = None
+
+    async def fetch(self) -> Any:
+        # Fetch FX rates data from Bank of Canada API and check for CNY/CAD exchange rate data
+        url = "https://www.bankofcanada.ca/valet/observations/group/FX_RATES_DAILY/json"
+        params = {
+            "start_date": "2023-01-23",
+            "end_date": "2023-07-19",
+            "order_dir": "asc"
+        }
+        return await self.stream_json(url, params=params)
 
     def get_output_model(self) -> BaseModel:
         return BankOfCanadaFXResponse
 
+    def validate_item(self, key: str, item: FXObservation):
+        obs = item.root
+        date = obs.get('d')
+        rate_value = obs.get(self.target_currency)
+
+        # Handle both string and {'v': string} formats
+        rate = None
+        if isinstance(rate_value, dict) and 'v' in rate_value:
+            rate = rate_value['v']
+        elif isinstance(rate_value, str):
+            rate = rate_value
+
+        if date and rate and self.first_valid is None:
+            self.first_valid = {'d': date, self.target_currency: rate}
+
+        try:
+            if date:
+                datetime.strptime(date, "%Y-%m-%d")
+            if rate and float(rate) > 0:
+                self.valid_observations += 1
+        except (ValueError, TypeError):
+            pass
+
     def validate_results(self, result: BankOfCanadaFXResponse):
         # Basic validations
         assert isinstance(result.terms, dict), "Terms should be a dictionary"
         assert "url" in result.terms, "Terms should contain URL"
-        assert len(result.observations) > 0, "No observations found"
+        assert self.item_counts.get('observations', 0) > 0, "No observations found"
 
         # Target currency validation
-        target_currency = "FXCNYCAD"
+        target_currency = self.target_currency
         assert target_currency in result.seriesDetail, f"Currency pair {target_currency} not found"
-
-        # Validate observations
-        date_format = "%Y-%m-%d"
-        valid_observations = 0
-
-        for obs in result.observations:
-            try:
-                date = obs.get('d')
-                if date:
-                    datetime.strptime(date, date_format)
-
-                rate_value = obs.get(target_currency)
-                # Handle both string and {'v': string} formats
-                rate = None
-                if isinstance(rate_value, dict) and 'v' in rate_value:
-                    rate = rate_value['v']
-                elif isinstance(rate_value, str):
-                    rate = rate_value
-
-                if rate and float(rate) > 0:
-                    valid_observations += 1
-            except (ValueError, TypeError):
-                continue
-
-        assert valid_observations > 0, f"No valid {target_currency} observations found"
+        assert self.valid_observations > 0, f"No valid {target_currency} observations found"
 
         print(f"\n✅ Validation passed for {target_currency}:")
         print(f"Series Detail: {result.seriesDetail.get(target_currency)}")
-        print(f"Found {valid_observations} valid observations")
+        print(f"Found {self.valid_observations} valid observations")
 
         # Print first valid observation
-        first_valid = None
-        for obs in result.observations:
-            date = obs.get('d')
-            rate_value = obs.get(target_currency)
-            if date and rate_value:
-                # Handle both string and {'v': string} formats
-                rate = rate_value['v'] if isinstance(rate_value, dict) else rate_value
-                first_valid = {'d': date, target_currency: rate}
-                break
-
-        if first_valid:
-            print(f"First observation: {first_valid['d']} - {first_valid[target_currency]}")
-
-    async def run(self):
-        url = "https://www.bankofcanada.ca/valet/observations/group/FX_RATES_DAILY/json"
-        params = {
-            "start_date": "2023-01-23",
-            "end_date": "2023-07-19",
-            "order_dir": "asc"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
-                validated = self.get_output_model().model_validate(data)
-                self.validate_results(validated)
-                return validated
\ No newline at end of file
+        if self.first_valid:
+            print(f"First observation: {self.first_valid['d']} - {self.first_valid[target_currency]}")
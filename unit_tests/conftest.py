@@ -0,0 +1,20 @@
+import pytest
+
+from core.config import Config
+
+# Config path helpers that tests must not write through to the repository
+OUTPUT_PATHS = {
+    'get_report_dir': 'reports',
+    'get_journal_path': 'reports/journal.jsonl',
+    'get_run_index_path': 'reports/history.db',
+    'get_manifest_path': 'test_manifest.json',
+    'get_screenshot_dir': 'screenshots',
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_output(tmp_path, monkeypatch):
+    """Point reports, journals, the run index and the manifest into the test's temp directory"""
+    for name, relative in OUTPUT_PATHS.items():
+        monkeypatch.setattr(Config, name, staticmethod(lambda path=tmp_path / relative: path))
+    return tmp_path
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from core import concurrency
+from core.concurrency import AdaptiveLimiter, ConcurrencyController
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_limiter_admits_up_to_its_limit_then_queues_in_order():
+    async def scenario():
+        limiter = AdaptiveLimiter(2)
+        order = []
+
+        async def run(name):
+            async with limiter:
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(run(name) for name in 'abcde'))
+        return order, limiter.active, limiter.waiting
+
+    assert asyncio.run(scenario()) == (list('abcde'), 0, 0)
+
+
+def test_lowering_the_limit_lets_running_holders_finish():
+    async def scenario():
+        limiter = AdaptiveLimiter(3)
+        for _ in range(3):
+            await limiter.acquire()
+        limiter.set_limit(1)
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await settle()
+        assert limiter.active == 3 and limiter.waiting == 1
+
+        limiter.release()
+        limiter.release()
+        await settle()
+        assert not waiter.done()
+        limiter.release()
+        await settle()
+        assert waiter.done() and limiter.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_raising_the_limit_wakes_waiters():
+    async def scenario():
+        limiter = AdaptiveLimiter(1)
+        await limiter.acquire()
+        waiters = [asyncio.ensure_future(limiter.acquire()) for _ in range(2)]
+        await settle()
+        limiter.set_limit(3)
+        await settle()
+        assert all(waiter.done() for waiter in waiters) and limiter.active == 3
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        limiter = AdaptiveLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await settle()
+        waiter.cancel()
+        await settle()
+        assert limiter.waiting == 0
+        limiter.release()
+        assert limiter.active == 0
+
+        # Cancelled just as the slot was handed over: the slot goes back
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await settle()
+        limiter.release()
+        waiter.cancel()
+        await settle()
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def sample(**overrides):
+    values = {'cpu_pct': 50, 'free_memory_pct': 50, 'free_memory_mb': 8000, 'browsers': 2,
+              'browser_rss_mb': 1000, 'llm_error_rate': 0.0, 'active': 2, 'waiting': 0}
+    values.update(overrides)
+    return values
+
+
+@pytest.fixture
+def controller():
+    return ConcurrencyController(AdaptiveLimiter(4), minimum=1, maximum=6)
+
+
+@pytest.mark.parametrize('overrides, expected', [
+    ({'llm_error_rate': 1.0}, (2, 'llm_throttling')),
+    ({'free_memory_pct': 0}, (3, 'low_memory')),
+    ({'cpu_pct': 100}, (3, 'high_cpu')),
+    ({'waiting': 3, 'cpu_pct': 0}, (5, 'headroom')),
+    ({'waiting': 3, 'cpu_pct': 0, 'free_memory_mb': 600}, (4, 'hold')),
+    ({}, (4, 'hold')),
+])
+def test_decide(controller, overrides, expected):
+    assert controller.decide(sample(**overrides)) == expected
+
+
+def test_decide_respects_bounds(controller):
+    controller.limiter.limit = 1
+    assert controller.decide(sample(llm_error_rate=1.0)) == (1, 'llm_throttling')
+    controller.limiter.limit = 6
+    assert controller.decide(sample(waiting=3, cpu_pct=0)) == (6, 'hold')
+
+
+def test_controller_samples_off_the_loop_and_records_decisions(monkeypatch):
+    # (calls, retries) at start, at the start sample and at two later samples
+    calls = iter([(0, 0), (0, 0), (10, 0), (20, 10)])
+    monkeypatch.setattr(concurrency, 'llm_call_stats', lambda: next(calls))
+
+    async def scenario():
+        decisions = []
+        controller = ConcurrencyController(AdaptiveLimiter(4), 1, 6, on_decision=decisions.append, interval=3600)
+        controller.start()
+        await asyncio.sleep(0.2)
+        first = dict(decisions[0])
+        # Ten calls with no retries since start, then ten more that all retried
+        assert (await controller.sample())['llm_error_rate'] == 0.0
+        assert (await controller.sample())['llm_error_rate'] == 1.0
+        await controller.stop()
+        return first
+
+    first = asyncio.run(scenario())
+    assert first['reason'] == 'start' and first['limit'] == 4 and 'cpu_pct' in first
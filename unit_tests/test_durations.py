@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from core.config import Config
+from core.durations import DurationStore
+
+
+@pytest.fixture
+def durations(tmp_path):
+    return DurationStore(tmp_path / 'reports' / 'durations.json')
+
+
+def test_first_observation_becomes_the_estimate(durations):
+    durations.record('TestLogin', 40)
+    assert durations.estimate('TestLogin') == 40
+    assert durations.estimates['TestLogin']['runs'] == 1
+
+
+def test_later_observations_are_smoothed(durations):
+    durations.record('TestLogin', 40)
+    durations.record('TestLogin', 100)
+    # 0.3 * 100 + 0.7 * 40
+    assert durations.estimate('TestLogin') == 58
+    assert durations.estimates['TestLogin']['runs'] == 2
+
+
+def test_unknown_tests_get_the_median_or_the_configured_default(durations):
+    assert durations.estimate('TestNew') == Config.DEFAULT_TEST_DURATION
+    assert durations.observed('TestNew') is None
+    for test_name, seconds in {'a': 10, 'b': 30, 'c': 20}.items():
+        durations.record(test_name, seconds)
+    assert durations.estimate('TestNew') == 20
+    assert durations.observed('TestNew') is None
+    assert durations.observed('b') == 30
+
+
+def test_only_passed_tests_are_recorded(durations):
+    durations.record_details([
+        {'test_name': 'a', 'status': 'passed', 'duration': 12},
+        {'test_name': 'b', 'status': 'failed', 'duration': 300},
+        {'test_name': 'c', 'status': 'passed', 'duration': 0},
+    ])
+    assert set(durations.estimates) == {'a'}
+
+
+def test_longest_first(durations):
+    for test_name, seconds in {'a': 10, 'b': 30, 'c': 20}.items():
+        durations.record(test_name, seconds)
+    assert durations.longest_first(['a', 'b', 'c'], name=lambda item: item) == ['b', 'c', 'a']
+
+
+def test_save_and_reload(durations):
+    durations.record('TestLogin', 40)
+    durations.save()
+    assert DurationStore(durations.path).estimate('TestLogin') == 40
+
+
+def test_bootstraps_from_timestamped_reports(tmp_path):
+    report_dir = tmp_path / 'reports'
+    report_dir.mkdir()
+    for stamp, seconds in (('20250101_000000', 40), ('20250102_000000', 100)):
+        report = {'details': [{'test_name': 'TestLogin', 'status': 'passed', 'duration': seconds}]}
+        (report_dir / f"test_report_{stamp}.json").write_text(json.dumps(report))
+    (report_dir / 'test_report_20250103_000000.json').write_text('{not json')
+
+    durations = DurationStore(report_dir / 'durations.json')
+    assert durations.estimate('TestLogin') == 58
+
+
+def test_unreadable_database_falls_back_to_reports(tmp_path):
+    path = tmp_path / 'durations.json'
+    path.write_text('{broken')
+    assert DurationStore(path).estimates == {}
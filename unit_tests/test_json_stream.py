@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from core.json_stream import JSONStreamError, iter_json_members
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def members(document, size=1, stream_keys=()):
+    data = document if isinstance(document, bytes) else json.dumps(document).encode('utf-8')
+
+    async def collect():
+        return [member async for member in iter_json_members(_chunks(data, size), stream_keys)]
+    return asyncio.run(collect())
+
+
+DOCUMENT = {
+    'terms': {'url': 'https://example.com/terms'},
+    'count': 12345,
+    'rate': -1.25e-3,
+    'flag': True,
+    'empty': None,
+    'label': 'CAD/USD é€',
+    'observations': [{'d': '2023-01-23', 'v': 1.3}, {'d': '2023-01-24', 'v': 1.31}],
+}
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 4096])
+def test_members_survive_any_chunk_boundary(size):
+    assert members(DOCUMENT, size) == list(DOCUMENT.items())
+
+
+@pytest.mark.parametrize('size', [1, 5, 4096])
+def test_stream_keys_yield_one_element_at_a_time(size):
+    streamed = members(DOCUMENT, size, stream_keys=['observations'])
+    assert [value for key, value in streamed if key == 'observations'] == DOCUMENT['observations']
+    assert ('terms', DOCUMENT['terms']) in streamed
+
+
+def test_number_split_across_chunks_is_not_truncated():
+    assert members(b'{"n": 1234567890}', size=3) == [('n', 1234567890)]
+
+
+def test_empty_object_and_empty_streamed_array():
+    assert members(b' {} ') == []
+    assert members(b'{"items": [], "a": 1}', stream_keys=['items']) == [('a', 1)]
+
+
+@pytest.mark.parametrize('document', [b'[1, 2]', b'{"a": 1', b'{"a": 1} trailing', b'{1: 2}', b'{"a": 1,}'])
+def test_malformed_bodies_raise(document):
+    with pytest.raises(JSONStreamError):
+        members(document, size=4)
+
+
+def test_streamed_key_must_be_an_array():
+    with pytest.raises(JSONStreamError):
+        members(b'{"items": {"a": 1}}', stream_keys=['items'])
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from core import llm_registry
+from core.llm_registry import RateLimitedLLM, TokenBucket, estimate_tokens, is_retryable, usage_tokens
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_registry.time, 'monotonic', clock)
+    return clock
+
+
+def test_bucket_refills_at_its_per_minute_rate(clock):
+    bucket = TokenBucket(60)
+    bucket.debit(60)
+    assert bucket.available == 0
+    clock.now += 30
+    bucket.debit(0)
+    assert bucket.available == 30
+    clock.now += 600
+    bucket.debit(0)
+    assert bucket.available == bucket.capacity == 60
+
+
+def test_debit_can_overdraw(clock):
+    bucket = TokenBucket(10)
+    bucket.debit(25)
+    assert bucket.available == -15
+
+
+def test_acquire_takes_from_a_full_bucket_without_waiting(clock):
+    bucket = TokenBucket(10)
+    asyncio.run(bucket.acquire(4))
+    assert bucket.available == 6
+
+
+def test_acquire_waits_for_the_refill(clock, monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+    monkeypatch.setattr(llm_registry.asyncio, 'sleep', fake_sleep)
+
+    bucket = TokenBucket(60)
+    bucket.debit(60)
+    asyncio.run(bucket.acquire(6))
+    assert slept == [pytest.approx(6)]
+    assert bucket.available == pytest.approx(0)
+
+
+def test_oversized_request_waits_only_for_a_full_bucket(clock, monkeypatch):
+    async def fake_sleep(seconds):
+        clock.now += seconds
+    monkeypatch.setattr(llm_registry.asyncio, 'sleep', fake_sleep)
+
+    bucket = TokenBucket(10)
+    asyncio.run(bucket.acquire(25))
+    assert bucket.available == -15
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(0)
+    asyncio.run(bucket.acquire(10 ** 9))
+    bucket.debit(10 ** 9)
+    assert bucket.available == 0
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+@pytest.mark.parametrize('error, expected', [
+    (StatusError(429), True),
+    (StatusError(503), True),
+    (StatusError(400), False),
+    (ResourceExhausted(), True),
+    (ValueError('429 in the message only'), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+class FlakyModel:
+    """Fails with the given errors, then answers"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'answer'
+
+    async def ainvoke(self, messages, **kwargs):
+        return self.invoke(messages, **kwargs)
+
+
+def test_sync_calls_retry_transient_errors_without_sleeping(monkeypatch):
+    monkeypatch.setattr(llm_registry.time, 'sleep', lambda seconds: pytest.fail("sync path slept"))
+    model = FlakyModel(StatusError(503), StatusError(429))
+    llm = RateLimitedLLM(model, requests_per_minute=0, tokens_per_minute=0, max_retries=5)
+    assert llm.invoke('prompt') == 'answer'
+    assert (llm.calls, llm.retries) == (3, 2)
+
+
+def test_sync_retries_are_bounded():
+    model = FlakyModel(*(StatusError(503) for _ in range(10)))
+    llm = RateLimitedLLM(model, requests_per_minute=0, tokens_per_minute=0, max_retries=5)
+    with pytest.raises(StatusError):
+        llm.invoke('prompt')
+    assert model.calls == llm_registry.SYNC_RETRIES + 1
+
+
+def test_permanent_errors_are_not_retried():
+    model = FlakyModel(StatusError(400))
+    llm = RateLimitedLLM(model, requests_per_minute=0, tokens_per_minute=0, max_retries=5)
+    with pytest.raises(StatusError):
+        llm.invoke('prompt')
+    assert model.calls == 1
+
+
+def test_async_calls_back_off_between_retries(monkeypatch):
+    delays = []
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+    monkeypatch.setattr(llm_registry.asyncio, 'sleep', fake_sleep)
+    monkeypatch.setattr(llm_registry, 'backoff_delay', lambda attempt: 2 ** attempt)
+
+    model = FlakyModel(StatusError(503), StatusError(503))
+    llm = RateLimitedLLM(model, requests_per_minute=0, tokens_per_minute=0, max_retries=5)
+    assert asyncio.run(llm.ainvoke('prompt')) == 'answer'
+    assert delays == [1, 2]
+
+
+def test_token_estimates_and_reported_usage():
+    assert estimate_tokens('x' * 40) == 10
+    assert estimate_tokens([{'not': 'a message'}]) >= 1
+
+    class Response:
+        usage_metadata = {'total_tokens': 42}
+    assert usage_tokens(Response()) == 42
+    assert usage_tokens({'raw': Response(), 'parsed': None}) == 42
+    assert usage_tokens(object()) == 0
@@ -0,0 +1,122 @@
+import json
+
+from pydantic import BaseModel
+
+from core.config import Config
+# Aliased so pytest does not try to collect it as a test class
+from core.report_generator import TestReport as Report, read_journal
+
+
+class Result(BaseModel):
+    premium_rate: str
+
+
+def entries(path):
+    return list(read_journal(path))
+
+
+def test_results_are_journaled_as_they_are_recorded(tmp_path):
+    report = Report(tmp_path / 'journal.jsonl')
+    report.add_success('TestA', Result(premium_rate='$2.41'))
+    report.add_failure('TestB', 'boom', timeout={'scope': 'test'})
+    report.add_concurrency_decision({'limit': 2, 'reason': 'start'})
+
+    journal = entries(report.journal_path)
+    assert journal[0]['type'] == 'run'
+    assert [entry.get('test_name') for entry in journal[1:3]] == ['TestA', 'TestB']
+    assert journal[1]['result'] == {'premium_rate': '$2.41'}
+    assert [detail['test_name'] for detail in report.iter_details()] == ['TestA', 'TestB']
+    assert list(report.iter_concurrency()) == [{'limit': 2, 'reason': 'start'}]
+    assert report.results['summary'] == {'total': 2, 'passed': 1, 'failed': 1, 'flaky': 0,
+                                         'timeouts': 1, 'over_budget': 0}
+    report.close()
+
+
+def test_retried_pass_is_flaky_with_every_attempt(tmp_path):
+    report = Report(tmp_path / 'journal.jsonl')
+    attempt = report.add_attempt('TestA', 'Target closed', 'browser')
+    report.add_success('TestA', {'ok': True}, attempts=[attempt])
+    detail = next(report.iter_details())
+    assert detail['flaky'] is True
+    assert [(a['attempt'], a['status']) for a in detail['attempts']] == [(1, 'failed'), (2, 'passed')]
+    assert report.results['summary']['flaky'] == 1
+    report.close()
+
+
+def test_resume_counts_recorded_tests_and_appends(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    first = Report(path)
+    first.add_success('TestA', {'ok': True})
+    first.add_failure('TestB', 'boom')
+    first.close()
+
+    resumed = Report(path, resume=True)
+    assert resumed.completed == {'TestA', 'TestB'}
+    assert resumed.results['timestamp'] == first.results['timestamp']
+    resumed.add_success('TestC', {'ok': True})
+    resumed.close()
+    assert [detail['test_name'] for detail in resumed.iter_details()] == ['TestA', 'TestB', 'TestC']
+    assert resumed.results['summary']['total'] == 3
+
+
+def test_resume_drops_a_line_cut_short_by_a_crash(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    report = Report(path)
+    report.add_success('TestA', {'ok': True})
+    report.close()
+    with open(path, 'a') as f:
+        f.write('{"test_name": "TestB", "sta')
+
+    resumed = Report(path, resume=True)
+    assert resumed.completed == {'TestA'}
+    resumed.add_success('TestB', {'ok': True})
+    resumed.close()
+    assert [entry.get('test_name') for entry in entries(path)] == [None, 'TestA', 'TestB']
+
+
+def test_without_resume_the_journal_starts_over(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    report = Report(path)
+    report.add_success('TestA', {'ok': True})
+    report.close()
+
+    fresh = Report(path)
+    assert fresh.completed == set()
+    fresh.add_success('TestB', {'ok': True})
+    fresh.close()
+    assert [detail['test_name'] for detail in fresh.iter_details()] == ['TestB']
+
+
+def test_read_journal_skips_unreadable_lines_and_missing_files(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"test_name": "TestA", "status": "passed"}\nnot json\n\n')
+    assert entries(path) == [{'test_name': 'TestA', 'status': 'passed'}]
+    assert entries(tmp_path / 'missing.jsonl') == []
+
+
+def test_shard_journals_merge_into_one_report(tmp_path):
+    paths = []
+    for shard, tests in enumerate((['TestA', 'TestB'], ['TestC']), start=1):
+        report = Report(tmp_path / f"partial_{shard}.jsonl")
+        for test_name in tests:
+            report.add_success(test_name, {'ok': True})
+        report.close()
+        paths.append(report.journal_path)
+
+    merged = Report.from_journals(paths)
+    assert merged.results['summary']['total'] == 3
+    assert merged.completed == {'TestA', 'TestB', 'TestC'}
+
+
+def test_json_report_streams_the_journal(tmp_path):
+    report = Report(tmp_path / 'journal.jsonl')
+    report.add_success('TestA', {'ok': True})
+    report.add_failure('TestB', 'boom')
+    report.add_concurrency_decision({'limit': 2, 'reason': 'start'})
+    report.generate_report('json')
+
+    [json_path] = Config.get_report_dir().glob('test_report_*.json')
+    written = json.loads(json_path.read_text())
+    assert [detail['test_name'] for detail in written['details']] == ['TestA', 'TestB']
+    assert written['summary']['pass_rate'] == 50.0
+    assert written['concurrency'] == [{'limit': 2, 'reason': 'start'}]
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from core.retry import RetryBudget, classify, parse_policies
+from core import timeouts
+
+
+def wrapped(error: BaseException) -> RuntimeError:
+    """The error as tests report it: re-raised as a RuntimeError with the original as its cause"""
+    try:
+        try:
+            raise error
+        except BaseException as cause:
+            raise RuntimeError(f"Test failed: {cause}") from cause
+    except RuntimeError as outer:
+        return outer
+
+
+class ResourceExhausted(Exception):
+    """Same name as the Gemini client's 429 error"""
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class ClientConnectorError(Exception):
+    """Same name as aiohttp's connection error"""
+
+
+@pytest.mark.parametrize('error, expected', [
+    (ResourceExhausted('quota'), 'rate_limit'),
+    (StatusError(503), 'rate_limit'),
+    (StatusError(404), None),
+    (timeouts.TestTimeoutError('step', 30), 'timeout'),
+    (asyncio.TimeoutError(), 'timeout'),
+    (ClientConnectorError('refused'), 'network'),
+    (ValueError('429 Too Many Requests in an assertion message'), None),
+    (RuntimeError('Target closed'), None),
+])
+def test_classify_by_type_and_status(error, expected):
+    assert classify(wrapped(error)) == expected
+
+
+def test_whole_test_timeout_is_not_retried():
+    assert classify(wrapped(timeouts.TestTimeoutError('test', 300))) is None
+
+
+def test_assertion_wins_over_transient_causes():
+    try:
+        try:
+            raise ResourceExhausted('quota')
+        except ResourceExhausted:
+            raise AssertionError('expected $2.41')
+    except AssertionError as error:
+        assert classify(wrapped(error)) is None
+
+
+def test_playwright_errors_are_browser_failures():
+    errors = pytest.importorskip('playwright._impl._errors')
+    assert classify(wrapped(errors.TargetClosedError())) == 'browser'
+    assert classify(wrapped(errors.TimeoutError('locator'))) == 'timeout'
+
+
+def test_parse_policies():
+    assert parse_policies('timeout=2, llm_output=1,,') == {'timeout': 2, 'llm_output': 1}
+    assert parse_policies('') == {}
+
+
+def test_budget_applies_per_class_limits():
+    budget = RetryBudget(total=10, policies={'timeout': 2})
+    assert budget.allow('timeout', 1)
+    assert budget.allow('timeout', 2)
+    assert not budget.allow('timeout', 3)
+    assert not budget.allow('browser', 1)
+    assert not budget.allow(None, 1)
+    assert budget.used == 2
+
+
+def test_budget_caps_retries_across_the_run():
+    budget = RetryBudget(total=1, policies={'timeout': 5})
+    assert budget.allow('timeout', 1)
+    assert not budget.allow('timeout', 1)
+    assert budget.remaining == 0 and budget.used == 1
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from core.run_index import RunIndex
+
+
+def write_report(report_dir, stamp, results):
+    details = [{'test_name': name, 'status': status, 'duration': duration} for name, status, duration in results]
+    passed = sum(1 for _, status, _ in results if status == 'passed')
+    report = {
+        'timestamp': f"2025-01-{stamp:02d}T00:00:00",
+        'summary': {'total': len(results), 'passed': passed, 'failed': len(results) - passed},
+        'details': details,
+    }
+    path = report_dir / f"test_report_202501{stamp:02d}_000000.json"
+    path.write_text(json.dumps(report))
+    return path
+
+
+@pytest.fixture
+def report_dir(tmp_path):
+    path = tmp_path / 'reports'
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = RunIndex(tmp_path / 'reports' / 'history.db')
+    yield index
+    index.close()
+
+
+def test_reports_are_ingested_once(report_dir, index):
+    write_report(report_dir, 1, [('a', 'passed', 10)])
+    write_report(report_dir, 2, [('a', 'failed', 12)])
+    assert index.update(report_dir) == 2
+    assert index.update(report_dir) == 0
+    assert [run[2:] for run in index.recent_runs(10)] == [(1, 1, 0), (1, 0, 1)]
+
+
+def test_changed_report_replaces_its_run(report_dir, index):
+    path = write_report(report_dir, 1, [('a', 'passed', 10)])
+    index.update(report_dir)
+    write_report(report_dir, 1, [('a', 'passed', 10), ('b', 'failed', 5)])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert index.update(report_dir) == 1
+    assert [run[2:] for run in index.recent_runs(10)] == [(2, 1, 1)]
+
+
+def test_recent_runs_and_durations_are_limited_and_oldest_first(report_dir, index):
+    for day in range(1, 6):
+        write_report(report_dir, day, [('a', 'passed', day)])
+    index.update(report_dir)
+    assert [run[1][:10] for run in index.recent_runs(2)] == ['2025-01-04', '2025-01-05']
+    assert [duration for _, _, duration in index.durations('a', 3)] == [3, 4, 5]
+
+
+def test_flakiness_scores_status_flips(report_dir, index):
+    history = [('passed', 'passed', 'passed'), ('failed', 'passed', 'passed'),
+               ('passed', 'passed', 'failed'), ('failed', 'passed', 'failed')]
+    for day, statuses in enumerate(history, start=1):
+        write_report(report_dir, day, list(zip(('flip', 'steady', 'once'), statuses, (1, 1, 1))))
+    index.update(report_dir)
+
+    flaky = {entry['test_name']: entry for entry in index.flakiness(10)}
+    assert set(flaky) == {'flip', 'once'}
+    assert flaky['flip']['score'] == 1.0 and flaky['flip']['failures'] == 2
+    assert flaky['once']['score'] == round(1 / 3, 2)
+    assert index.flakiness(10)[0]['test_name'] == 'flip'
+
+
+def test_duration_trends_compare_recent_against_older_runs(report_dir, index):
+    for day, seconds in enumerate([10, 10, 20, 20], start=1):
+        write_report(report_dir, day, [('slow', 'passed', seconds), ('same', 'passed', 5)])
+    write_report(report_dir, 5, [('slow', 'failed', 300), ('same', 'passed', 5)])
+    index.update(report_dir)
+
+    trends = {trend['test_name']: trend for trend in index.duration_trends(10)}
+    assert trends['slow']['change_pct'] == 100.0 and trends['slow']['runs'] == 4
+    assert trends['same']['change_pct'] == 0.0
+
+
+def test_unreadable_report_is_skipped(report_dir, index):
+    (report_dir / 'test_report_20250101_000000.json').write_text('{broken')
+    assert index.update(report_dir) == 1
+    assert index.recent_runs(10) == []
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from core.config import Config
+from core.screenshots import ScreenshotPipeline, dhash, hamming
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = ScreenshotPipeline(image_format='png', workers=1)
+    # Content-hash path; perceptual matching is covered separately and needs Pillow
+    pipeline.image = None
+    yield pipeline
+    pipeline.close()
+
+
+def save(pipeline, path, data):
+    pipeline._process(data, path, None)
+    return path
+
+
+def test_identical_frames_are_hard_linked(tmp_path, pipeline):
+    first = save(pipeline, tmp_path / 'a.png', b'frame')
+    second = save(pipeline, tmp_path / 'b.png', b'frame')
+    assert second.read_bytes() == b'frame'
+    assert os.path.samefile(first, second)
+
+
+def test_different_frames_are_written_separately(tmp_path, pipeline):
+    first = save(pipeline, tmp_path / 'a.png', b'frame')
+    second = save(pipeline, tmp_path / 'b.png', b'frame!')
+    assert not os.path.samefile(first, second)
+    assert second.read_bytes() == b'frame!'
+
+
+def test_deleted_original_is_not_linked(tmp_path, pipeline):
+    save(pipeline, tmp_path / 'a.png', b'frame').unlink()
+    second = save(pipeline, tmp_path / 'b.png', b'frame')
+    assert second.read_bytes() == b'frame'
+
+
+def test_negative_distance_disables_deduplication(tmp_path, pipeline, monkeypatch):
+    monkeypatch.setattr(Config, 'SCREENSHOT_DEDUP_DISTANCE', -1)
+    first = save(pipeline, tmp_path / 'a.png', b'frame')
+    second = save(pipeline, tmp_path / 'b.png', b'frame')
+    assert not os.path.samefile(first, second)
+
+
+def test_paths_follow_the_format(tmp_path, pipeline):
+    assert pipeline.paths(tmp_path / 'shot.png') == (tmp_path / 'shot.png', None)
+    assert pipeline.capture_options() == {'full_page': True, 'type': 'png'}
+
+
+def test_hamming():
+    assert hamming(0b1010, 0b1010) == 0
+    assert hamming(0b1010, 0b0101) == 4
+
+
+def test_dhash_is_stable_under_scaling_and_sensitive_to_gradients():
+    image = pytest.importorskip('PIL.Image')
+    gradient = image.new('L', (90, 80))
+    gradient.putdata([x * 2 for _ in range(80) for x in range(90)])
+    reversed_gradient = gradient.transpose(image.FLIP_LEFT_RIGHT)
+
+    assert hamming(dhash(gradient), dhash(gradient.resize((180, 160)))) <= 2
+    assert hamming(dhash(gradient), dhash(reversed_gradient)) > 32
+
+
+def test_perceptual_matching_is_opt_in(tmp_path, monkeypatch):
+    image = pytest.importorskip('PIL.Image')
+    pipeline = ScreenshotPipeline(image_format='png', workers=1)
+    frame = image.new('RGB', (64, 64), 'white')
+    pixel = frame.copy()
+    pixel.putpixel((0, 0), (0, 0, 0))
+    pipeline.close()
+
+    assert pipeline._fingerprint(b'a', frame) != pipeline._fingerprint(b'b', pixel)
+    monkeypatch.setattr(Config, 'SCREENSHOT_DEDUP_DISTANCE', 4)
+    assert pipeline._fingerprint(b'a', frame) == pipeline._fingerprint(b'b', pixel)
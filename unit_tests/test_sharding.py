@@ -0,0 +1,54 @@
+import pytest
+
+from core.durations import DurationStore
+from core.sharding import parse_shard, partition, select_shard
+
+
+def store(tmp_path, estimates):
+    durations = DurationStore(tmp_path / 'durations.json')
+    durations.estimates = {name: {'estimate': seconds, 'runs': 1} for name, seconds in estimates.items()}
+    return durations
+
+
+def name(item):
+    return item
+
+
+@pytest.mark.parametrize('spec, expected', [('1/1', (1, 1)), ('2/4', (2, 4)), ('4/4', (4, 4))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize('spec', ['0/4', '5/4', '1/0', 'a/b', '1', '1/2/3'])
+def test_parse_shard_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_longest_tests_go_to_the_least_loaded_shard(tmp_path):
+    durations = store(tmp_path, {'a': 10, 'b': 8, 'c': 6, 'd': 5, 'e': 4, 'f': 3})
+    shards = partition(list('abcdef'), 2, name, durations)
+    assert shards == [['a', 'd', 'f'], ['b', 'c', 'e']]
+    loads = [sum(durations.estimate(item) for item in shard) for shard in shards]
+    assert loads == [18, 18]
+
+
+def test_partition_ignores_input_order_and_breaks_ties_by_name(tmp_path):
+    durations = store(tmp_path, {name: 5 for name in 'abcd'})
+    assert partition(list('dcba'), 2, name, durations) == partition(list('abcd'), 2, name, durations)
+    assert partition(list('dcba'), 2, name, durations) == [['a', 'c'], ['b', 'd']]
+
+
+def test_unknown_tests_are_estimated_at_the_median(tmp_path):
+    durations = store(tmp_path, {'a': 30, 'b': 10, 'c': 20})
+    shards = partition(['a', 'b', 'c', 'new'], 2, name, durations)
+    # 'new' counts as 20s, so it joins 'c' while 'b' evens out the shard holding 'a'
+    assert shards == [['a', 'b'], ['c', 'new']]
+
+
+def test_shards_cover_every_item_once(tmp_path):
+    durations = store(tmp_path, {f"t{i}": i % 7 + 1 for i in range(23)})
+    items = [f"t{i}" for i in range(23)]
+    selected = [item for index in range(1, 5) for item in select_shard(items, f"{index}/4", name, durations)]
+    assert sorted(selected) == sorted(items)
+    assert partition([], 3, name, durations) == [[], [], []]
@@ -0,0 +1,133 @@
+import json
+import os
+import textwrap
+
+import pytest
+
+from core import test_discover
+from core.config import Config
+from core.test_discover import listed_ids, scan_tests, select_tests
+
+SUITE = {
+    'tests/__init__.py': '',
+    'tests/suite/__init__.py': '',
+    'tests/suite/test_login.py': '''
+        from core.base_test import BaseTest
+
+        class TestLogin(BaseTest):
+            pass
+
+        class Helper:
+            pass
+    ''',
+    # Suite files are not all named test_*.py
+    'tests/suite/rates.py': '''
+        import os
+        from core.api_test import ApiTest
+        from tests.suite.test_login import TestLogin
+
+        class TestRates(ApiTest):
+            pass
+
+        class TestRatesByRow(TestRates):
+            data_file = os.path.join('cases', 'rates.csv')
+            data_id_column = 'Code'
+
+        class TestLoginAgain(TestLogin):
+            pass
+    ''',
+    'cases/rates.csv': 'Code,Rate\n01602,$2.41\n01601,$1.10\n',
+}
+
+
+@pytest.fixture
+def suite(tmp_path, monkeypatch):
+    for relative, source in SUITE.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def ids(tests):
+    return sorted(test['id'] for test in tests)
+
+
+def test_finds_direct_and_indirect_subclasses_in_any_module(suite):
+    assert ids(scan_tests()) == [
+        'tests.suite.rates:TestLoginAgain',
+        'tests.suite.rates:TestRates',
+        'tests.suite.rates:TestRatesByRow',
+        'tests.suite.test_login:TestLogin',
+    ]
+
+
+def test_data_attributes_are_read_statically(suite):
+    by_class = {test['class_name']: test for test in scan_tests()}
+    assert by_class['TestRatesByRow']['data_file'] == os.path.join('cases', 'rates.csv')
+    assert by_class['TestRatesByRow']['data_id_column'] == 'Code'
+    assert listed_ids(by_class['TestRatesByRow']) == [
+        'tests.suite.rates:TestRatesByRow[01602]', 'tests.suite.rates:TestRatesByRow[01601]']
+    assert listed_ids(by_class['TestRates']) == ['tests.suite.rates:TestRates']
+
+
+def test_missing_data_file_lists_the_class_only(suite):
+    entry = {'id': 'm:T', 'data_file': 'cases/missing.csv'}
+    assert listed_ids(entry) == ['m:T']
+
+
+def test_manifest_is_reused_until_a_file_changes(suite, monkeypatch):
+    scan_tests()
+    manifest = json.loads(Config.get_manifest_path().read_text())
+    assert manifest['version'] == test_discover.MANIFEST_VERSION
+    assert set(manifest['files']) == {path for path in SUITE if path.endswith('.py')}
+
+    parsed = []
+    original = test_discover._parse_classes
+    monkeypatch.setattr(test_discover, '_parse_classes', lambda *args: parsed.append(args[0]) or original(*args))
+    scan_tests()
+    assert parsed == []
+
+    login = suite / 'tests/suite/test_login.py'
+    login.write_text(login.read_text() + '\nclass TestLogout(BaseTest):\n    pass\n')
+    assert 'tests.suite.test_login:TestLogout' in ids(scan_tests())
+    assert [path.as_posix() for path in parsed] == ['tests/suite/test_login.py']
+
+
+def test_touched_file_with_same_content_is_not_reparsed(suite, monkeypatch):
+    scan_tests()
+    parsed = []
+    original = test_discover._parse_classes
+    monkeypatch.setattr(test_discover, '_parse_classes', lambda *args: parsed.append(args[0]) or original(*args))
+    rates = suite / 'tests/suite/rates.py'
+    stat = rates.stat()
+    os.utime(rates, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(scan_tests()) == 4
+    assert parsed == []
+
+
+def test_manifest_of_another_version_is_rebuilt(suite):
+    Config.get_manifest_path().write_text(json.dumps({'version': 0, 'files': {'tests/gone.py': {}}}))
+    assert len(scan_tests()) == 4
+    manifest = json.loads(Config.get_manifest_path().read_text())
+    assert manifest['version'] == test_discover.MANIFEST_VERSION and 'tests/gone.py' not in manifest['files']
+
+
+def test_deleted_module_drops_its_tests(suite):
+    scan_tests()
+    (suite / 'tests/suite/rates.py').unlink()
+    assert ids(scan_tests()) == ['tests.suite.test_login:TestLogin']
+
+
+def test_syntax_errors_skip_the_file(suite):
+    (suite / 'tests/suite/broken.py').write_text('class TestBroken(BaseTest:\n')
+    assert len(scan_tests()) == 4
+
+
+def test_select_by_class_module_or_id(suite):
+    tests = scan_tests()
+    assert ids(select_tests(tests, ['TestRates'])) == ['tests.suite.rates:TestRates']
+    assert ids(select_tests(tests, ['TestRatesByRow[01602]'])) == ['tests.suite.rates:TestRatesByRow']
+    assert len(select_tests(tests, ['tests.suite.rates'])) == 3
+    assert select_tests(tests, None) == tests
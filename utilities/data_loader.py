@@ -0,0 +1,34 @@
+import csv
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+def iter_csv_rows(csv_path: str, id_column: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Stream ``(row_id, row)`` pairs from a CSV file with a header row.
+
+    The id comes from ``id_column`` when given, otherwise from the 1-based row
+    number; repeated ids get a ``-2``, ``-3`` ... suffix so every row stays
+    addressable.
+    """
+    path = Path(csv_path)
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found at {path}")
+
+    seen: Dict[str, int] = {}
+    with open(path, newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if id_column and id_column not in (reader.fieldnames or []):
+            raise KeyError(f"Column '{id_column}' not found in {path}")
+
+        for number, row in enumerate(reader, start=1):
+            row_id = param_id(row[id_column]) if id_column else f"row{number}"
+            seen[row_id] = seen.get(row_id, 0) + 1
+            if seen[row_id] > 1:
+                row_id = f"{row_id}-{seen[row_id]}"
+            yield row_id, row
+
+
+def param_id(value: str) -> str:
+    """Make a value safe to use inside a test id such as ``TestClass[id]``"""
+    return re.sub(r'[^\w.-]+', '-', value.strip()).strip('-') or 'empty'